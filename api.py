@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from fleet import FleetCatalogError, load_fleet
+from mission import compute_fleet_missions
+from results_store import model_rows
+from scenario import OFFICER_DISPATCH_SEC, officer_travel_sec
+from spatial import distance_miles, haversine_miles
+
+# --- Mission API ---
+# The mission model and the nearest-officer lookup over HTTP/JSON, for CAD
+# integrations that can't click the map. Runs beside the Streamlit app:
+#
+#   python api.py --port 8601
+#
+#   POST /v1/mission        {"base": [lat, lon], "target": [lat, lon],
+#                            "wind": [mph, from_deg], "squads": [[lat, lon], ...]}
+#   POST /v1/mission/batch  {"base": ..., "targets": [[lat, lon], ...], "wind": ..., "squads": ...}
+#   GET  /health
+#
+# wind and squads are optional. A single call is one kernel call on one
+# column (well under a millisecond) and runs on the event loop; handing it to
+# a thread would cost more than the work. A batch is one kernel call over all
+# its targets and runs, JSON encoding included, in the thread pool so single
+# calls keep flowing while it computes. Officer ETAs are dispatch delay plus travel to the target; the
+# single call uses the region's road graph when one is installed (as the app
+# does), the batch uses straight-line distance x the road factor. Loading the
+# graph and routing over it can take far longer than the kernel, so the single
+# call's officer lookup runs in the thread pool too.
+DEFAULT_PORT = 8601
+MAX_BATCH = 10_000
+OFFICER_CHUNK_CELLS = 1 << 20
+
+class BadRequest(ValueError):
+    pass
+
+def _point(value, name):
+    try:
+        lat, lon = (float(v) for v in value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name} must be [lat, lon]") from None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise BadRequest(f"{name} is out of range")
+    return lat, lon
+
+def _points(value, name, limit=None):
+    try:
+        points = np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name} must be a list of [lat, lon]") from None
+    if points.size == 0:
+        points = points.reshape(0, 2)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise BadRequest(f"{name} must be a list of [lat, lon]")
+    if limit is not None and len(points) > limit:
+        raise BadRequest(f"{name} is limited to {limit:,} points per request")
+    if not np.isfinite(points).all() or (np.abs(points[:, 0]) > 90).any() or (np.abs(points[:, 1]) > 180).any():
+        raise BadRequest(f"{name} has a point out of range")
+    return points
+
+def _wind(value):
+    if not value:
+        return None
+    try:
+        mph, from_deg = (float(v) for v in value)
+    except (TypeError, ValueError):
+        raise BadRequest("wind must be [mph, from_deg]") from None
+    return (mph, from_deg % 360) if mph > 0 else None
+
+def _secs(values, digits=1):
+    # JSON list with null for inf/nan (json can't encode them)
+    values = np.round(values, digits)
+    out = values.tolist()
+    for i in np.flatnonzero(~np.isfinite(values)).tolist():
+        out[i] = None
+    return out
+
+# --- Computations ---
+def mission_one(catalog, base, target, wind=None, squads=None):
+    missions = compute_fleet_missions(catalog.arrays, base, [target], wind)
+    rows, first_model, first_t = model_rows(catalog.models, {k: v[..., 0] for k, v in missions.items()})
+    out = {
+        'distance_mi': round(float(missions['dist'][0]), 3),
+        'first_model': first_model,
+        'first_t_out_sec': first_t,
+        'models': rows,
+        'officer': None,
+    }
+    if squads is not None and len(squads):
+        out['officer'] = officer_one(base, squads, target)
+    return out
+
+def officer_one(base, squads, target):
+    from roads import fastest_unit, find_graph
+    graph = find_graph(base)
+    hit = fastest_unit(graph, squads.tolist(), target) if graph is not None else None
+    if hit is not None:
+        return {'unit': int(hit[0]), 'eta_sec': round(OFFICER_DISPATCH_SEC + hit[1], 1), 'method': 'road'}
+    unit, eta = officer_many(squads, np.asarray([target]))
+    return {'unit': int(unit[0]), 'eta_sec': round(float(eta[0]), 1), 'method': 'straight_line'}
+
+def officer_many(squads, targets):
+    # nearest car per target by geodesic distance, (targets x squads) a chunk
+    # at a time; a CAD unit list is small enough that this beats the grid
+    # index's per-query walk
+    unit = np.empty(len(targets), dtype=np.int64)
+    dist = np.empty(len(targets))
+    chunk = max(1, OFFICER_CHUNK_CELLS // len(squads))
+    for start in range(0, len(targets), chunk):
+        t = targets[start:start + chunk]
+        d = haversine_miles(t[:, 0, None], t[:, 1, None], squads[None, :, 0], squads[None, :, 1])
+        unit[start:start + chunk] = np.argmin(d, axis=1)
+        dist[start:start + chunk] = d[np.arange(len(t)), unit[start:start + chunk]]
+    return unit, OFFICER_DISPATCH_SEC + officer_travel_sec(dist)
+
+def mission_batch(catalog, base, targets, wind=None, squads=None, detail=False):
+    missions = compute_fleet_missions(catalog.arrays, base, targets, wind)
+    t_out = np.where(missions['possible'], missions['t_out'], np.inf)
+    first = np.argmin(t_out, axis=0)
+    first_t = t_out[first, np.arange(len(targets))]
+    first_model = catalog.models[first]
+    first_model[~np.isfinite(first_t)] = None
+    out = {
+        'n': len(targets),
+        'distance_mi': _secs(distance_miles(base, targets), 3),
+        'first_model': first_model.tolist(),
+        'first_t_out_sec': _secs(first_t),
+        'models_able': missions['possible'].sum(axis=0).tolist(),
+    }
+    if detail:
+        out['t_out_sec'] = {str(m): _secs(row) for m, row in zip(catalog.models, t_out)}
+    if squads is not None and len(squads):
+        unit, eta = officer_many(squads, targets)
+        out['officer_unit'] = unit.tolist()
+        out['officer_eta_sec'] = _secs(eta)
+        out['officer_method'] = 'straight_line'
+    return out
+
+# --- Handlers ---
+async def _json_body(request):
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        raise BadRequest("body must be JSON") from None
+    if not isinstance(body, dict):
+        raise BadRequest("body must be a JSON object")
+    return body
+
+def _error(status, message):
+    return JSONResponse({'error': message}, status_code=status)
+
+async def mission(request):
+    try:
+        body = await _json_body(request)
+        base, target = _point(body.get('base'), 'base'), _point(body.get('target'), 'target')
+        squads = _points(body['squads'], 'squads') if body.get('squads') else None
+        out = mission_one(load_fleet(), base, target, _wind(body.get('wind')))
+        if squads is not None and len(squads):
+            out['officer'] = await run_in_threadpool(officer_one, base, squads, target)
+        return JSONResponse(out)
+    except BadRequest as exc:
+        return _error(400, str(exc))
+    except FleetCatalogError as exc:
+        return _error(503, str(exc))
+
+async def mission_batch_endpoint(request):
+    try:
+        body = await _json_body(request)
+        base = _point(body.get('base'), 'base')
+        targets = _points(body.get('targets') or [], 'targets', MAX_BATCH)
+        squads = _points(body['squads'], 'squads') if body.get('squads') else None
+        if not len(targets):
+            raise BadRequest("targets is empty")
+        catalog, wind, detail = load_fleet(), _wind(body.get('wind')), bool(body.get('detail'))
+        # encoding a 10k-target reply takes as long as computing it, so both
+        # stay off the event loop
+        return await run_in_threadpool(lambda: JSONResponse(mission_batch(catalog, base, targets, wind, squads, detail)))
+    except BadRequest as exc:
+        return _error(400, str(exc))
+    except FleetCatalogError as exc:
+        return _error(503, str(exc))
+
+async def health(request):
+    try:
+        catalog = load_fleet()
+    except FleetCatalogError as exc:
+        return _error(503, str(exc))
+    return JSONResponse({'ok': True, 'models': [str(m) for m in catalog.models], 'spec_hash': catalog.spec_hash})
+
+app = Starlette(routes=[
+    Route('/health', health),
+    Route('/v1/mission', mission, methods=['POST']),
+    Route('/v1/mission/batch', mission_batch_endpoint, methods=['POST']),
+])
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the mission model over HTTP/JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=1, help="server processes (one per core for throughput)")
+    parser.add_argument('--access-log', action='store_true')
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run('api:app', host=args.host, port=args.port, workers=args.workers, access_log=args.access_log,
+                log_level='info' if args.access_log else 'warning', app_dir=os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from coverage_map import coverage_grid
+from dispatch import add_targets, best_launch, dispatch, new_board
+from engine import simulate, sim_duration
+from fleet import load_fleet
+from mapview import build_static_map
+from mission import compute_fleet_missions
+from montecarlo import run_monte_carlo
+from playback import _component_template, playback_payload
+from roads import fastest_unit, synthetic_grid_graph
+from scenario import INCIDENT_RADIUS_MI, SQUAD_RADIUS_MI, sample_incidents
+from siting import optimize_sites, synthetic_points
+from spatial import MILES_PER_DEG_LAT, build_unit_index, nearest_units
+
+# --- Benchmark Suite ---
+# Headless timings of the paths a rerun goes through: the fleet mission
+# kernel, building and rendering the static map, the playback payload the
+# browser animates, the nearest-officer lookup, base siting, multi-dock
+# dispatch and the Monte Carlo run. Every case uses fixed seeds and a fixed
+# base so runs are comparable; baseline.json holds the last saved numbers
+# (and the CPU count they were taken on) and each run prints its change
+# against them. Cases tagged CPU_SCALED_TAG spread over every core, so they
+# are not compared against a baseline taken with a different CPU count.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+BASE = [40.7484, -73.9967]
+SEED = 1234
+TIME_BUDGET_SEC = 0.5
+MAX_REPEATS = 50
+REGRESSION_RATIO = 1.25
+CPU_SCALED_TAG = 'workers=all'
+
+FLEET_SIZES = (4, 50, 500)
+SQUAD_SIZES = (5, 500, 5000)
+TARGET_COUNTS = (1, 10_000)
+
+def synthetic_fleet(n, seed=SEED):
+    # The real catalog, tiled and jittered out to n models (n=4 is drones.csv as-is).
+    src = load_fleet().arrays
+    if n == len(src['model']):
+        return src
+    rng = np.random.default_rng(seed)
+    pick = np.arange(n) % len(src['model'])
+    fleet = {'model': np.array([f"{src['model'][i]}-{j:03d}" for j, i in enumerate(pick)], dtype=object)}
+    for col in ('flight_time_min', 'speed_mph', 'range_miles', 'max_wind_mph', 'recharge_min'):
+        fleet[col] = src[col][pick] * rng.uniform(0.8, 1.2, n)
+    fleet['battery_swap'] = src['battery_swap'][pick]
+    return fleet
+
+def targets_around(n, seed=SEED):
+    inc = sample_incidents(np.random.default_rng(seed), BASE, n, INCIDENT_RADIUS_MI)
+    return np.column_stack([inc['lat'], inc['lon']])
+
+# --- Cases ---
+# Each case returns a zero-argument callable; setup cost is excluded.
+def case_mission_kernel(n_models, n_targets):
+    fleet, targets = synthetic_fleet(n_models), targets_around(n_targets)
+    return lambda: compute_fleet_missions(fleet, BASE, targets)
+
+def case_static_map(n_models):
+    fleet = synthetic_fleet(n_models)
+    def run():
+        grid = coverage_grid(fleet, BASE, 80)
+        m = build_static_map(BASE, 13, BASE, (grid, np.ones(len(grid['model']), dtype=bool)))
+        return m.get_root().render()
+    return run
+
+def case_playback(n_models):
+    fleet = synthetic_fleet(n_models)
+    target = [float(v) for v in targets_around(1)[0]]
+    labels = {'call': 'CALL', 'launch': 'LAUNCH', 'drone_on_scene': 'ON SCENE', 'officers_arrive': 'OFFICERS'}
+    t_call = datetime(2026, 1, 1, 12, 0, 0)
+    t_launch = t_call + timedelta(seconds=60)
+    t_officers = t_call + timedelta(seconds=540)
+    def run():
+        mission, frames = simulate(fleet, BASE, target)
+        payload = playback_payload(fleet['model'], mission, frames, labels, t_call, t_launch, t_officers, sim_duration(mission) / 60)
+        return _component_template().replace('__PAYLOAD__', json.dumps(payload, separators=(',', ':')))
+    return run
+
+def case_nearest_officer(n_squads, n_targets):
+    squads = targets_around(n_squads, SEED + 1) if n_squads else np.empty((0, 2))
+    squads = BASE + (squads - BASE) * (SQUAD_RADIUS_MI[1] / INCIDENT_RADIUS_MI)
+    targets = targets_around(n_targets)
+    def run():
+        index = build_unit_index(squads.tolist())
+        for t in targets:
+            nearest_units(index, t, k=1)
+    return run
+
+def case_road_officer(n_squads):
+    # 20 x 20 mile synthetic city, ~40k nodes: one multi-source search per target
+    graph = synthetic_grid_graph(BASE, 10.0, 0.1, seed=SEED)
+    squads = targets_around(n_squads, SEED + 1).tolist()
+    targets = targets_around(20).tolist()
+    def run():
+        for t in targets:
+            fastest_unit(graph, squads, t)
+    return run
+
+def case_siting(n_points, k):
+    fleet, points = synthetic_fleet(4), synthetic_points(BASE, n_points, seed=SEED)
+    return lambda: optimize_sites(points, fleet, k)
+
+def case_dispatch_board(n_bases, n_models, n_targets):
+    fleet, bases, targets = synthetic_fleet(n_models), targets_around(n_bases, SEED + 2), targets_around(n_targets)
+    def run():
+        board = new_board(fleet, bases)
+        add_targets(board, targets)
+        return best_launch(board)
+    return run
+
+def case_dispatch_new_target(n_bases, n_models, n_targets):
+    # one target added to a board that already holds n_targets rows
+    fleet, bases = synthetic_fleet(n_models), targets_around(n_bases, SEED + 2)
+    board = new_board(fleet, bases)
+    add_targets(board, targets_around(n_targets))
+    # a new point every call, however many times measure() calls it
+    rng = np.random.default_rng(SEED + 3)
+    span = INCIDENT_RADIUS_MI / MILES_PER_DEG_LAT
+    return lambda: dispatch(board, BASE + rng.uniform(-span, span, 2))
+
+def case_monte_carlo(samples, workers):
+    # workers=None is every CPU, through the process pool when there is more than one
+    fleet = synthetic_fleet(4)
+    return lambda: run_monte_carlo(fleet, BASE, samples, SEED, workers)
+
+def all_cases():
+    cases = {}
+    for f in FLEET_SIZES:
+        for t in TARGET_COUNTS:
+            cases[f"mission_kernel[models={f},targets={t}]"] = (case_mission_kernel, (f, t))
+    for f in FLEET_SIZES:
+        cases[f"static_map[models={f}]"] = (case_static_map, (f,))
+    for f in FLEET_SIZES:
+        cases[f"playback[models={f}]"] = (case_playback, (f,))
+    for s in SQUAD_SIZES:
+        for t in TARGET_COUNTS:
+            cases[f"nearest_officer[squads={s},targets={t}]"] = (case_nearest_officer, (s, t))
+    for s in SQUAD_SIZES[:2]:
+        cases[f"road_officer[squads={s},targets=20]"] = (case_road_officer, (s,))
+    cases["siting[points=20000,k=2]"] = (case_siting, (20_000, 2))
+    cases["dispatch_board[bases=8,models=50,targets=10000]"] = (case_dispatch_board, (8, 50, 10_000))
+    cases["dispatch_new_target[bases=8,models=50,targets=10000]"] = (case_dispatch_new_target, (8, 50, 10_000))
+    cases["monte_carlo[samples=200000,workers=1]"] = (case_monte_carlo, (200_000, 1))
+    cases[f"monte_carlo[samples=200000,{CPU_SCALED_TAG}]"] = (case_monte_carlo, (200_000, None))
+    return cases
+
+# --- Measurement ---
+def measure(fn):
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+
+    repeats = int(min(MAX_REPEATS, max(1, TIME_BUDGET_SEC // max(first, 1e-9))))
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'min_ms': round(min(samples) * 1000, 4),
+        'median_ms': round(statistics.median(samples) * 1000, 4),
+        'repeats': repeats,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+def load_baseline(path):
+    # -> (machine, results)
+    if not os.path.exists(path):
+        return {}, {}
+    with open(path, encoding='utf-8') as fh:
+        doc = json.load(fh)
+    return doc.get('machine', {}), doc.get('results', {})
+
+def save_baseline(path, results):
+    doc = {
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'saved': datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(doc, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+def _diff(now, before, ratio):
+    if before is None:
+        return "new", False
+    change = now['min_ms'] / before['min_ms'] - 1 if before['min_ms'] else 0.0
+    slower = now['min_ms'] > before['min_ms'] * ratio
+    return f"{change:+.0%}" + ("  SLOWER" if slower else ""), slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the app's hot paths and compare against a saved baseline")
+    parser.add_argument('-k', dest='pattern', help="only run cases whose name contains this text")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="write these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO, help="min-time ratio that counts as a regression")
+    parser.add_argument('--check', action='store_true', help="exit non-zero if any case regressed")
+    args = parser.parse_args(argv)
+
+    machine, baseline = load_baseline(args.baseline)
+    base_cpus = machine.get('cpus')
+    other_cpus = base_cpus is not None and base_cpus != os.cpu_count()
+    if other_cpus:
+        print(f"baseline was taken on {base_cpus} CPUs, this machine has {os.cpu_count()}: "
+              f"{CPU_SCALED_TAG} cases are not compared")
+    results, regressed = {}, []
+    for name, (factory, params) in all_cases().items():
+        if args.pattern and args.pattern not in name:
+            continue
+        res = measure(factory(*params))
+        results[name] = res
+        if other_cpus and CPU_SCALED_TAG in name:
+            diff, slower = f"n/a ({base_cpus} CPUs)", False
+        else:
+            diff, slower = _diff(res, baseline.get(name), args.threshold)
+        if slower:
+            regressed.append(name)
+        print(f"{name:<46} {res['min_ms']:>10.3f} ms  (median {res['median_ms']:.3f}, n={res['repeats']})  "
+              f"peak {res['peak_kb']:>9.1f} KB  {diff}", flush=True)
+
+    if args.save:
+        if args.pattern:
+            # kept cases must still match the CPU count the file will record
+            kept = {k: v for k, v in baseline.items() if not (other_cpus and CPU_SCALED_TAG in k)}
+            results = {**kept, **results}
+        save_baseline(args.baseline, results)
+        print(f"saved baseline to {args.baseline}")
+    if regressed:
+        print(f"{len(regressed)} case(s) slower than {args.threshold:g}x baseline: {', '.join(regressed)}")
+        if args.check:
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
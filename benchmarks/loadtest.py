@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scenario import INCIDENT_RADIUS_MI, SQUAD_RADIUS_MI, sample_incidents
+
+# --- API Load Test ---
+# Keeps --concurrency keep-alive connections busy against api.py for
+# --duration seconds, mixing single-call lookups with an occasional batch, and
+# reports throughput and latency percentiles per endpoint; --rate holds a
+# fixed request rate instead, which is how latency at a given load is read. Speaks plain
+# HTTP/1.1 over asyncio streams so the client adds as little as possible to
+# what it measures; with --spawn it starts the server itself. Client and
+# server share the machine, so on a small box the numbers are a floor.
+BASE = [40.7484, -73.9967]
+SEED = 1234
+
+def _payloads(n, batch_size, squads, seed=SEED):
+    rng = np.random.default_rng(seed)
+    inc = sample_incidents(rng, BASE, n, INCIDENT_RADIUS_MI)
+    cars = sample_incidents(rng, BASE, squads, SQUAD_RADIUS_MI[1])
+    cars = [[round(a, 6), round(b, 6)] for a, b in zip(cars['lat'], cars['lon'])]
+    singles = [json.dumps({'base': BASE, 'target': [round(a, 6), round(b, 6)], 'squads': cars}).encode()
+               for a, b in zip(inc['lat'], inc['lon'])]
+    batch_inc = sample_incidents(rng, BASE, batch_size, INCIDENT_RADIUS_MI)
+    batch = json.dumps({'base': BASE, 'targets': np.column_stack([batch_inc['lat'], batch_inc['lon']]).round(6).tolist(),
+                        'squads': cars}).encode()
+    return singles, batch
+
+def _request(host, path, body):
+    return (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _worker(host, port, singles, batch, batch_every, deadline, offset, lat, errors, interval=None, phase=0.0):
+    # interval (open loop): send on a fixed schedule; how late each send was
+    # is kept apart from its latency, so a stalled server still shows up (as
+    # lag) without the client's own timer slop counting as server time
+    reader, writer = await asyncio.open_connection(host, port)
+    i = offset
+    due = time.perf_counter() + phase
+    try:
+        while time.perf_counter() < deadline:
+            kind = 'batch' if batch_every and i % batch_every == batch_every - 1 else 'single'
+            msg = _request(host, '/v1/mission/batch', batch) if kind == 'batch' else _request(host, '/v1/mission', singles[i % len(singles)])
+            if interval:
+                due += interval
+                now = time.perf_counter()
+                if due > now:
+                    await asyncio.sleep(due - now)
+            start = time.perf_counter()
+            if interval:
+                lat['lag'].append(start - due)
+            writer.write(msg)
+            status = await _read_response(reader)
+            lat[kind].append(time.perf_counter() - start)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+            i += 1
+    finally:
+        writer.close()
+
+async def _phase(host, port, concurrency, seconds, singles, batch, batch_every, rate):
+    lat, errors = {'single': [], 'batch': [], 'lag': []}, {}
+    deadline = time.perf_counter() + seconds
+    interval = concurrency / rate if rate else None
+    start = time.perf_counter()
+    # workers are staggered across the interval so the rate arrives evenly
+    await asyncio.gather(*(_worker(host, port, singles, batch, batch_every, deadline, w * 97, lat, errors, interval,
+                                   interval * w / concurrency if interval else 0.0) for w in range(concurrency)))
+    return lat, errors, time.perf_counter() - start
+
+async def run_load(host, port, concurrency, duration, batch_every, batch_size, squads, rate=None, warmup=1.0):
+    singles, batch = _payloads(2000, batch_size, squads)
+    await _phase(host, port, concurrency, warmup, singles, batch, batch_every, rate)
+    return await _phase(host, port, concurrency, duration, singles, batch, batch_every, rate)
+
+def _pct(samples, q):
+    return float(np.percentile(np.asarray(samples) * 1000, q)) if samples else float('nan')
+
+async def _wait_ready(host, port, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            status = await _read_response(reader)
+            writer.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit(f"api.py did not come up on {host}:{port}")
+
+def _cpu_sec(pid):
+    # user + system CPU of a process, from /proc (Linux only)
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            fields = fh.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except OSError:
+        return float('nan')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the mission API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8601)
+    parser.add_argument('--spawn', action='store_true', help="start api.py for the run and stop it afterwards")
+    parser.add_argument('--workers', type=int, default=1, help="server processes when spawning")
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help="open connections")
+    parser.add_argument('-r', '--rate', type=float, help="open loop at this many req/s in total (default: as fast as replies come)")
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help="measured seconds (after a 1 s warm-up)")
+    parser.add_argument('--batch-every', type=int, default=200, help="every Nth request is a batch (0 = never)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="targets per batch request")
+    parser.add_argument('--squads', type=int, default=12, help="officer units sent with each request")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'api.py'), '--host', args.host, '--port', str(args.port),
+                                   '--workers', str(args.workers)], cwd=ROOT)
+    try:
+        asyncio.run(_wait_ready(args.host, args.port))
+        cpu0 = _cpu_sec(server.pid) if server else float('nan')
+        lat, errors, elapsed = asyncio.run(run_load(args.host, args.port, args.concurrency, args.duration,
+                                                    args.batch_every, args.batch_size, args.squads, args.rate))
+        cpu = _cpu_sec(server.pid) - cpu0 if server else float('nan')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    lag = lat.pop('lag')
+    total = sum(len(v) for v in lat.values())
+    print(f"{total:,} requests in {elapsed:.1f}s over {args.concurrency} connections: {total / elapsed:,.0f} req/s"
+          + (f"  (server CPU {cpu / elapsed:.0%})" if cpu == cpu else ""))
+    for kind, samples in lat.items():
+        if samples:
+            size = f" x{args.batch_size}" if kind == 'batch' else ""
+            print(f"  {kind + size:<12} n={len(samples):<7,} p50 {_pct(samples, 50):7.2f} ms  p90 {_pct(samples, 90):7.2f} ms  "
+                  f"p99 {_pct(samples, 99):7.2f} ms  max {max(samples) * 1000:7.2f} ms  mean {statistics.fmean(samples) * 1000:.2f} ms")
+    if lag:
+        print(f"  send lag     p50 {_pct(lag, 50):7.2f} ms  p99 {_pct(lag, 99):7.2f} ms  (how far sends fell behind the --rate schedule)")
+    if errors:
+        print("  errors: " + ", ".join(f"HTTP {status} x{n}" for status, n in sorted(errors.items())))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import gc
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- Concurrent Session Load Test ---
+# Drives N sessions of the real drone_sim.py through the dispatcher flow
+# (open -> ZIP -> base click -> target click -> sim completion) with
+# Streamlit's AppTest, --concurrency of them at once on threads in this one
+# process, the way the Streamlit server runs one script thread per session.
+# Reports sessions/s, per-step script-run latency percentiles, this process's
+# CPU, and how much resident memory each live session adds.
+#
+# Offline: ZIPs resolve from a fixed table instead of the ZIP index, and the
+# map's tiles come from `tiles.py serve` reading through `tiles.py standin`
+# (both spawned here, on TILE_PORT and STANDIN_PORT with a temporary store), so the
+# prefetch requests the app makes go somewhere real. Completed runs go to a
+# temporary SQLite file. There is no browser: a click is injected as
+# st_folium's return value, and the playback is skipped by back-dating the
+# sim start (--playback wait sits through it instead).
+APP = os.path.join(ROOT, 'drone_sim.py')
+STUB_ZIPS = {
+    '10001': [40.75065, -73.99718],
+    '60601': [41.88530, -87.62210],
+    '94103': [37.77250, -122.40990],
+    '02108': [42.35760, -71.06480],
+    '78701': [30.27150, -97.74260],
+    '98101': [47.61100, -122.33600],
+}
+CLICK_JITTER_DEG = 0.03
+TARGET_OFFSET_DEG = 0.02
+STEPS = ('open', 'zip', 'base', 'target', 'complete')
+STANDIN_PORT = 8712
+TILE_PORT = 8711
+# the release _share_runtime's patches were written against (pinned in requirements.txt)
+TESTED_STREAMLIT = '1.65.0'
+
+def _rss_mb():
+    with open('/proc/self/statm') as fh:
+        return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+def _stub_geocoder(calls):
+    import zipindex
+
+    def lookup_zip(zip_code, index=None):
+        calls.append(zip_code)
+        coords = STUB_ZIPS.get(str(zip_code).strip())
+        return list(coords) if coords else None
+    # drone_sim re-imports lookup_zip from zipindex on every script run
+    zipindex.lookup_zip = lookup_zip
+
+def _stub_map():
+    # st_folium still renders the map; each session's click comes from its own
+    # session state, since every session runs through the same function
+    import streamlit as st
+    import streamlit_folium
+    render = streamlit_folium.st_folium
+
+    def st_folium(*args, **kwargs):
+        render(*args, **kwargs)
+        return {'last_clicked': st.session_state.get('_bench_click')}
+    streamlit_folium.st_folium = st_folium
+
+def _share_runtime():
+    # AppTest is built for one app per process: each run installs a mock
+    # Runtime singleton and patches config.get_option, then clears both when
+    # it ends, which with sessions on threads pulls them out from under runs
+    # still in flight. Pin both for the process instead, so every session
+    # sees one runtime, as they would in a real server. Each run also gets a
+    # new script cache and so parses drone_sim.py again, on its own thread;
+    # besides not being what the server does (one cache per process),
+    # concurrent ast.parse calls trip a CPython 3.11 bug ("AST constructor
+    # recursion depth mismatch") that shows up as a compile error.
+    import streamlit
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import build_mock_config_get_option
+    if streamlit.__version__ != TESTED_STREAMLIT:
+        print(f"warning: streamlit {streamlit.__version__} is installed, these patches were tested on {TESTED_STREAMLIT}; "
+              f"numbers (or the runs themselves) may be off", file=sys.stderr)
+    config.get_option = build_mock_config_get_option({'global.appTest': True})
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+    pinned = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            pinned['runtime'] = cls._instance
+        runtime = cls._instance or pinned.get('runtime')
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or 'runtime' in pinned)
+
+def _start_tiles(cache_dir):
+    standin = subprocess.Popen([sys.executable, os.path.join(ROOT, 'tiles.py'), 'standin', '--port', str(STANDIN_PORT)],
+                               cwd=ROOT, stdout=subprocess.DEVNULL)
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'tiles.py'), 'serve', '--port', str(TILE_PORT), '--no-warm',
+                               '--cache-dir', cache_dir, '--upstream', f"http://127.0.0.1:{STANDIN_PORT}/{{z}}/{{x}}/{{y}}.png"],
+                              cwd=ROOT, stdout=subprocess.DEVNULL)
+    _wait_http(f"http://127.0.0.1:{TILE_PORT}/health")
+    return [standin, server]
+
+def _wait_http(url, timeout=30.0):
+    import urllib.request
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"tile server did not come up at {url}")
+
+def _tile_stats():
+    import json
+    import urllib.request
+    time.sleep(1.0)  # let the last prefetches land
+    with urllib.request.urlopen(f"http://127.0.0.1:{TILE_PORT}/stats", timeout=5) as resp:
+        return json.loads(resp.read())
+
+def run_session(i, seed, playback, timeout):
+    # one dispatcher end to end; returns (AppTest, {step: seconds}, error)
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng([seed, i])
+    zip_code = list(STUB_ZIPS)[i % len(STUB_ZIPS)]
+    lat, lon = np.asarray(STUB_ZIPS[zip_code]) + rng.uniform(-CLICK_JITTER_DEG, CLICK_JITTER_DEG, 2)
+    base = {'lat': float(lat), 'lng': float(lon)}
+    target = {'lat': float(lat + rng.choice([-1, 1]) * TARGET_OFFSET_DEG), 'lng': float(lon + rng.uniform(-1, 1) * TARGET_OFFSET_DEG)}
+    times = {}
+    at = AppTest.from_file(APP, default_timeout=timeout)
+
+    def step(name, action):
+        start = time.perf_counter()
+        action()
+        times[name] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].message}")
+
+    try:
+        step('open', at.run)
+        step('zip', lambda: at.text_input(key='zip_input').input(zip_code).run())
+        at.session_state['_bench_click'] = base
+        step('base', at.run)
+        at.session_state['_bench_click'] = target
+        step('target', at.run)
+        if at.session_state['step'] != 3:
+            raise RuntimeError("target click did not start the sim")
+        if playback == 'wait':
+            anim = next((s.value for s in at.slider if s.label == 'Sim Secs'), 15)
+            time.sleep(max(0.0, at.session_state['sim_started'] + anim + 3.0 - time.time()))
+        else:
+            at.session_state['sim_started'] = 0.0
+        step('complete', at.run)
+        if not at.session_state['sim_completed']:
+            raise RuntimeError(f"sim did not complete (step {at.session_state['step']}, "
+                               f"sim_started {at.session_state['sim_started']})")
+    except Exception as exc:
+        return at, times, f"{type(exc).__name__}: {exc}"
+    return at, times, None
+
+def run_load(sessions, concurrency, seed, playback, timeout):
+    done, lock = [], threading.Lock()
+
+    def one(i):
+        res = run_session(i, seed, playback, timeout)
+        with lock:
+            done.append(res)
+
+    cpu0, start = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(sessions)))
+    return done, time.perf_counter() - start, time.process_time() - cpu0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test drone_sim.py with concurrent headless sessions")
+    parser.add_argument('-n', '--sessions', type=int, default=24, help="sessions driven end to end")
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help="sessions in flight at once")
+    parser.add_argument('--warmup', type=int, default=2, help="sessions run (and dropped) first, to fill shared caches")
+    parser.add_argument('--playback', choices=('skip', 'wait'), default='skip', help="skip the animation or sit through it")
+    parser.add_argument('--tiles', choices=('standin', 'none'), default='standin',
+                        help="run a stand-in tile server for the app's prefetches, or none (prefetch is then a no-op)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=120.0, help="seconds one script run may take")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix='drone_sim_sessions_')
+    from results_store import RESULTS_DB_ENV
+    os.environ[RESULTS_DB_ENV] = os.path.join(tmp, 'runs.sqlite')
+    procs = []
+    if args.tiles == 'standin':
+        from tiles import TILE_SERVER_ENV
+        procs = _start_tiles(os.path.join(tmp, 'tiles'))
+        os.environ[TILE_SERVER_ENV] = f"http://127.0.0.1:{TILE_PORT}"
+    geocodes = []
+    _stub_geocoder(geocodes)
+    _stub_map()
+    _share_runtime()
+    # after streamlit's import, which sets the level from its config; the
+    # deprecation notices and folium's tile warning would print every run
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+    warnings.filterwarnings('ignore', module='folium')
+
+    try:
+        if args.warmup:
+            warm, _, _ = run_load(args.warmup, 1, args.seed + 1, 'skip', args.timeout)
+            errors = [e for _, _, e in warm if e]
+            if errors:
+                raise SystemExit(f"warm-up session failed: {errors[0]}")
+            del warm
+        gc.collect()
+        rss0 = _rss_mb()
+        done, elapsed, cpu = run_load(args.sessions, args.concurrency, args.seed, args.playback, args.timeout)
+        gc.collect()
+        rss1 = _rss_mb()
+        tile_stats = _tile_stats() if procs else None
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    ok = [t for _, t, e in done if not e]
+    errors = [e for _, _, e in done if e]
+    steps = sum(len(t) for _, t, _ in done)
+    print(f"{len(ok)}/{len(done)} sessions in {elapsed:.1f}s at concurrency {args.concurrency}: "
+          f"{len(ok) / elapsed:.2f} sessions/s, {steps / elapsed:.1f} steps/s, CPU {cpu / elapsed:.0%} of a core "
+          f"({cpu / max(len(done), 1) * 1000:.0f} ms/session)")
+    for name in STEPS:
+        samples = np.array([t[name] for t in ok if name in t]) * 1000
+        if len(samples):
+            print(f"  {name:<9} p50 {np.percentile(samples, 50):8.1f} ms  p90 {np.percentile(samples, 90):8.1f} ms  "
+                  f"p99 {np.percentile(samples, 99):8.1f} ms  max {samples.max():8.1f} ms")
+    print(f"  RSS {rss0:.0f} -> {rss1:.0f} MB with {len(done)} sessions alive: "
+          f"{(rss1 - rss0) / max(len(done), 1):.1f} MB/session; {len(geocodes)} stubbed geocodes")
+    if tile_stats:
+        print(f"  tile store {tile_stats['tiles']:,} tiles, {tile_stats['bytes'] / 2 ** 20:.1f} MB prefetched for the sessions' cities")
+    for e in errors[:5]:
+        print(f"  error: {e}")
+
+if __name__ == '__main__':
+    main()
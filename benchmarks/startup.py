@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- Startup / Rerun Timings ---
+# Drives drone_sim.py headlessly with Streamlit's AppTest. "first paint" is a
+# fresh interpreter's time from its first line until the first script run
+# finishes (imports, warm-up, first render), in a new subprocess each time.
+# Rerun times are the steady-state cost of a script run at each step; the map
+# still renders, only its click result is injected since there is no browser.
+APP = os.path.join(ROOT, 'drone_sim.py')
+ZIP = '10001'
+BASE_CLICK = {'lat': 40.7512345, 'lng': -73.9971234}
+TARGET_CLICK = {'lat': 40.7712345, 'lng': -73.9671234}
+
+def _child(mode, reruns, t0):
+    # Runs inside the subprocess; prints one JSON line.
+    import streamlit_folium
+    click = {'v': None}
+    render = streamlit_folium.st_folium
+
+    def st_folium(*args, **kwargs):
+        render(*args, **kwargs)
+        return {'last_clicked': click['v']}
+    streamlit_folium.st_folium = st_folium
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    first_paint = time.perf_counter() - t0
+    if mode == 'cold':
+        print(json.dumps({'first_paint_ms': first_paint * 1000}))
+        return
+
+    def timed_runs():
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    out = {'step1_rerun_ms': timed_runs()}
+    at.text_input[0].input(ZIP).run()
+    click['v'] = BASE_CLICK
+    at.run()
+    out['step2_rerun_ms'] = timed_runs()
+    click['v'] = TARGET_CLICK
+    at.run()
+    out['step3_rerun_ms'] = timed_runs()
+    print(json.dumps(out))
+
+def _spawn(mode, reruns):
+    code = (f"import time; t0 = time.perf_counter(); import sys; sys.path[:0] = [{ROOT!r}, {os.path.dirname(os.path.abspath(__file__))!r}]; "
+            f"import startup; startup._child({mode!r}, {reruns}, t0)")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if proc.returncode:
+        raise SystemExit(proc.stderr[-2000:])
+    res = json.loads(proc.stdout.strip().splitlines()[-1])
+    res['process_ms'] = wall
+    return res
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time drone_sim.py cold start and steady-state reruns")
+    parser.add_argument('--cold', type=int, default=3, help="fresh-process first-paint samples")
+    parser.add_argument('--reruns', type=int, default=20, help="reruns timed at each step")
+    args = parser.parse_args(argv)
+
+    cold = [_spawn('cold', 0) for _ in range(args.cold)]
+    print(f"first paint        {min(c['first_paint_ms'] for c in cold):8.1f} ms  (min of {args.cold}; "
+          f"process incl. interpreter {min(c['process_ms'] for c in cold):.0f} ms)")
+    warm = _spawn('reruns', args.reruns)
+    for step in (1, 2, 3):
+        print(f"step {step} rerun       {warm[f'step{step}_rerun_ms']:8.1f} ms  (median of {args.reruns})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import numpy as np
+
+from fleet import fleet_arrays
+from mission import RESERVE_SEC, compute_fleet_missions
+from spatial import miles_to_degrees
+
+# --- Coverage Grid ---
+MAX_GRID_RADIUS_MI = 25.0
+
+# (stop, r, g, b) for the time-to-target ramp: fast = brand blue, slow = red
+HEAT_STOPS = [
+    (0.0, 0, 210, 255),
+    (0.5, 255, 195, 0),
+    (1.0, 255, 0, 0),
+]
+HEAT_ALPHA = 110
+
+def max_radius_miles(fleet):
+    fleet = fleet_arrays(fleet)
+    endurance_sec = fleet['flight_time_min'] * 60 - RESERVE_SEC
+    endurance_radius = np.maximum(endurance_sec, 0) / 2 * (fleet['speed_mph'] / 3600)
+    return np.minimum(endurance_radius, fleet['range_miles'])
+
+def coverage_grid(fleet, base, resolution, radius_miles=None, wind=None):
+    fleet = fleet_arrays(fleet)
+
+    max_radius = max_radius_miles(fleet)
+    if radius_miles is None:
+        radius_miles = min(float(max_radius.max()) * 1.1, MAX_GRID_RADIUS_MI)
+
+    lat_offsets, lon_offsets = miles_to_degrees(base[0], np.linspace(-radius_miles, radius_miles, resolution))
+    lats = base[0] + lat_offsets[::-1]
+    lons = base[1] + lon_offsets
+    lat_g, lon_g = np.meshgrid(lats, lons, indexing='ij')
+    targets = np.column_stack([lat_g.ravel(), lon_g.ravel()])
+
+    missions = compute_fleet_missions(fleet, base, targets, wind)
+    shape = (len(fleet['model']), resolution, resolution)
+
+    return {
+        'model': fleet['model'],
+        'bounds': [[float(lats[-1]), float(lons[0])], [float(lats[0]), float(lons[-1])]],
+        't_out': missions['t_out'].reshape(shape).astype(np.float32),
+        'possible': missions['possible'].reshape(shape),
+        'max_radius': max_radius,
+    }
+
+# --- Rasterization ---
+def best_time_to_target(grid, model_mask):
+    t_out = np.where(grid['possible'][model_mask], grid['t_out'][model_mask], np.inf)
+    if t_out.shape[0] == 0:
+        return np.full(grid['t_out'].shape[1:], np.inf, dtype=np.float32)
+    return t_out.min(axis=0)
+
+def heatmap_rgba(t_out):
+    feasible = np.isfinite(t_out)
+    rgba = np.zeros(t_out.shape + (4,), dtype=np.uint8)
+    if not feasible.any():
+        return rgba
+
+    t_max = t_out[feasible].max()
+    frac = np.where(feasible, t_out, 0) / (t_max if t_max > 0 else 1)
+
+    stops = [s[0] for s in HEAT_STOPS]
+    for channel in range(3):
+        rgba[..., channel] = np.interp(frac, stops, [s[channel + 1] for s in HEAT_STOPS]).astype(np.uint8)
+    rgba[..., 3] = np.where(feasible, HEAT_ALPHA, 0)
+    return rgba
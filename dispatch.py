@@ -0,0 +1,166 @@
+import argparse
+import time
+
+import numpy as np
+
+from fleet import FLEET_PATH, fleet_arrays, load_fleet
+from mission import compute_fleet_missions
+from scenario import INCIDENT_RADIUS_MI, sample_incidents
+from zipindex import lookup_zip
+
+# --- Multi-Base Dispatch ---
+# Several docks, each stocking some of the fleet's models. For a target the
+# dispatcher launches the fastest feasible (base, model) pair: the model is at
+# that base, can fly there and back on one battery with the reserve intact,
+# and the wind allows it. Launch times come from mission.py's kernel, called
+# once on the whole bases x models x targets block.
+#
+# A board keeps one row of launch times (bases x models) per target it has
+# seen. Rows live in arrays that grow by doubling, so a new target costs one
+# kernel call on a 1-target block and a copy into the next free row, and a
+# target already on the board costs a dict lookup.
+INITIAL_ROWS = 64
+CHUNK_CELLS = 1 << 18
+
+def launch_times(fleet, bases, targets, stock=None, wind=None, max_cells=CHUNK_CELLS):
+    # -> (bases, models, targets) one-way seconds, inf where the model isn't
+    # stocked at the base or can't fly the mission. Targets go through the
+    # kernel max_cells (bases x models x targets) at a time, since it builds a
+    # dozen arrays of that size.
+    fleet = fleet_arrays(fleet)
+    bases = np.asarray(bases, dtype=float).reshape(-1, 2)
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+    out = np.empty((len(bases), len(fleet['model']), len(targets)))
+    chunk = max(1, max_cells // max(out.shape[0] * out.shape[1], 1))
+    for start in range(0, len(targets), chunk):
+        sl = slice(start, start + chunk)
+        # per-target wind is sliced with its targets
+        w = None if wind is None else tuple(v if np.ndim(v) == 0 else np.asarray(v)[sl] for v in wind)
+        m = compute_fleet_missions(fleet, bases, targets[sl], w)
+        out[..., sl] = np.where(m['possible'], m['t_out'], np.inf)
+    if stock is not None:
+        out[~np.asarray(stock, dtype=bool)] = np.inf
+    return out
+
+def stock_mask(models, inventories):
+    # inventories: per base, the model names it stocks (None = every model)
+    models = list(models)
+    stock = np.zeros((len(inventories), len(models)), dtype=bool)
+    for b, names in enumerate(inventories):
+        stock[b] = True if names is None else np.isin(models, list(names))
+    return stock
+
+# --- Board ---
+def new_board(fleet, bases, stock=None, wind=None, rows=INITIAL_ROWS):
+    fleet = fleet_arrays(fleet)
+    bases = np.asarray(bases, dtype=float).reshape(-1, 2)
+    n_models = len(fleet['model'])
+    return {
+        'fleet': fleet,
+        'bases': bases,
+        'stock': np.ones((len(bases), n_models), dtype=bool) if stock is None else np.asarray(stock, dtype=bool),
+        'wind': wind,
+        'targets': np.empty((rows, 2)),
+        't_out': np.empty((rows, len(bases), n_models)),
+        'rows': {},
+        'n': 0,
+    }
+
+def _grow(board, need):
+    cap = len(board['targets'])
+    if need <= cap:
+        return
+    while cap < need:
+        cap *= 2
+    for key in ('targets', 't_out'):
+        old = board[key]
+        board[key] = np.empty((cap,) + old.shape[1:])
+        board[key][:board['n']] = old[:board['n']]
+
+def add_targets(board, targets):
+    # -> board row of each target; only targets not yet on the board are computed
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+    keys = [(float(lat), float(lon)) for lat, lon in targets]
+    fresh = list(dict.fromkeys(k for k in keys if k not in board['rows']))
+    if fresh:
+        block = launch_times(board['fleet'], board['bases'], fresh, board['stock'], board['wind'])
+        n = board['n']
+        _grow(board, n + len(fresh))
+        board['targets'][n:n + len(fresh)] = fresh
+        board['t_out'][n:n + len(fresh)] = block.transpose(2, 0, 1)
+        board['rows'].update((k, n + i) for i, k in enumerate(fresh))
+        board['n'] = n + len(fresh)
+    return np.array([board['rows'][k] for k in keys], dtype=np.int64)
+
+def add_target(board, target):
+    return int(add_targets(board, [target])[0])
+
+def best_launch(board, rows=None):
+    # -> (base, model, t_out_sec) per row; base = model = -1 if nothing can fly it
+    t = board['t_out'][:board['n']] if rows is None else board['t_out'][np.asarray(rows)]
+    flat = t.reshape(len(t), -1)
+    pick = np.argmin(flat, axis=1)
+    sec = flat[np.arange(len(flat)), pick]
+    ok = np.isfinite(sec)
+    n_models = t.shape[2]
+    return np.where(ok, pick // n_models, -1), np.where(ok, pick % n_models, -1), sec
+
+def dispatch(board, target):
+    row = add_target(board, target)
+    base, model, sec = best_launch(board, [row])
+    return int(base[0]), int(model[0]), float(sec[0])
+
+# --- CLI ---
+def _parse_docks(text, models):
+    # "LAT,LON[:MODEL|MODEL];..." -> bases, inventories
+    bases, inventories = [], []
+    for part in filter(None, (p.strip() for p in text.split(';'))):
+        pos, _, names = part.partition(':')
+        lat, lon = (float(v) for v in pos.split(','))
+        names = [n.strip() for n in names.split('|') if n.strip()] or None
+        unknown = sorted(set(names or []) - set(models))
+        if unknown:
+            raise SystemExit(f"Unknown model(s): {', '.join(unknown)}")
+        bases.append((lat, lon))
+        inventories.append(names)
+    return bases, inventories
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dispatch the fastest (dock, model) pair to synthetic incidents")
+    parser.add_argument('docks', help='docks as "LAT,LON[:MODEL|MODEL];..." (no models = the whole fleet)')
+    parser.add_argument('--center', help="ZIP or LAT,LON the incidents are drawn around (default: first dock)")
+    parser.add_argument('-n', type=int, default=10_000, help="incident count")
+    parser.add_argument('--wind', help="SPEED_MPH,FROM_DEG")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fleet', default=FLEET_PATH)
+    args = parser.parse_args(argv)
+
+    fleet = load_fleet(args.fleet)
+    bases, inventories = _parse_docks(args.docks, fleet.models)
+    if not bases:
+        parser.error("give at least one dock")
+    if args.center:
+        center = [float(v) for v in args.center.split(',')] if ',' in args.center else lookup_zip(args.center)
+        if center is None:
+            raise SystemExit(f"Unknown ZIP: {args.center}")
+    else:
+        center = bases[0]
+    wind = tuple(float(v) for v in args.wind.split(',')) if args.wind else None
+
+    inc = sample_incidents(np.random.default_rng(args.seed), center, args.n, INCIDENT_RADIUS_MI)
+    board = new_board(fleet, bases, stock_mask(fleet.models, inventories), wind)
+    start = time.perf_counter()
+    add_targets(board, np.column_stack([inc['lat'], inc['lon']]))
+    base, model, sec = best_launch(board)
+    elapsed = time.perf_counter() - start
+
+    ok = base >= 0
+    print(f"{board['n']:,} targets x {len(bases)} docks x {len(fleet)} models ({elapsed * 1000:.0f} ms)")
+    print(f"  COVERED {ok.mean():.1%}  MEAN LAUNCH LEG {sec[ok].mean() / 60 if ok.any() else float('nan'):.1f} min")
+    for b, (lat, lon) in enumerate(bases):
+        mine = ok & (base == b)
+        picks = ', '.join(f"{fleet.models[m]} {(model[mine] == m).sum() / len(base):.0%}" for m in np.unique(model[mine]))
+        print(f"  DOCK {b + 1} {lat:.5f},{lon:.5f}  {mine.mean():.1%}  {picks}")
+
+if __name__ == '__main__':
+    main()
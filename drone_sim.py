@@ -1,14 +1,26 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import folium
-from folium import plugins
-from folium.features import DivIcon
 from streamlit_folium import st_folium
-import pgeocode
 import time
+import copy
 import random
 import math
+import uuid
 from datetime import datetime, timedelta
+from fleet import load_fleet, FleetCatalogError
+from coverage_map import coverage_grid
+from zipindex import load_zip_index, lookup_zip, search_prefix
+from mapview import build_static_map, build_dynamic_layer
+from tiles import request_prefetch
+from scenario import (INCIDENTS, LAUNCH_DELAY_SEC, SQUAD_COUNT, SQUAD_RADIUS_MI, OFFICER_DISPATCH_SEC,
+                      officer_travel_sec)
+from spatial import haversine_miles, build_unit_index, nearest_units
+from profiling import start_run, phase, count, finish_run, profiling_enabled
+from scenario_cache import SCENARIO_CACHE, quantize_point, points_hash
+from wind import WIND_SPEEDS_MPH, COMPASS, WIND_FROM_DEG, wind_sweep, sweep_mission, sweep_table
+# engine, playback and roads (step 3), siting, dispatch and results_store are
+# imported where they are first used, so the ZIP screen paints without them.
 
 # --- Page Configuration ---
 st.set_page_config(layout="wide", page_title="Tactical Drone Command", initial_sidebar_state="collapsed")
@@ -21,221 +33,170 @@ if 'base' not in st.session_state: st.session_state.base = None
 if 'target' not in st.session_state: st.session_state.target = None
 if 'inc_type' not in st.session_state: st.session_state.inc_type = None
 if 'squad_cars' not in st.session_state: st.session_state.squad_cars = []
+if 'squad_index' not in st.session_state: st.session_state.squad_index = None
 if 'sim_completed' not in st.session_state: st.session_state.sim_completed = False
+if 'sim_started' not in st.session_state: st.session_state.sim_started = None
 if 'has_run_once' not in st.session_state: st.session_state.has_run_once = False
 if 'best_officer_sq' not in st.session_state: st.session_state.best_officer_sq = None
 if 't_officers' not in st.session_state: st.session_state.t_officers = None
 if 'last_processed_click' not in st.session_state: st.session_state.last_processed_click = None
+if 'proposed_sites' not in st.session_state: st.session_state.proposed_sites = None
+if 'current_sites' not in st.session_state: st.session_state.current_sites = None
+if 'session_id' not in st.session_state: st.session_state.session_id = uuid.uuid4().hex[:8]
+if 'docks' not in st.session_state: st.session_state.docks = []
+if 'placing_dock' not in st.session_state: st.session_state.placing_dock = False
+
+# --- Rerun Profiling (DRONE_SIM_PROFILE=1, or =debug plus ?debug=1) ---
+prof = None
+if profiling_enabled(debug_requested=st.query_params.get('debug') == '1'):
+    if 'profile_session' not in st.session_state: st.session_state.profile_session = uuid.uuid4().hex[:8]
+    st.session_state.profile_runs = st.session_state.get('profile_runs', 0) + 1
+    prof = start_run(st.session_state.profile_session, st.session_state.profile_runs, enabled=True)
+debug_slot = None
+
+# st.rerun() and st.stop() end the script on the spot, so runs cut short that
+# way write their profile first (the click and ZIP runs are the slow ones).
+def rerun():
+    finish_run(prof, end='rerun')
+    st.rerun()
 
 # --- CUSTOM CSS: CLEAN COCKPIT THEME ---
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=IBM+Plex+Mono:wght@400;700&family=Manrope:wght@400;600;700&display=swap');
+# The stylesheet and logo are served from static/ (enableStaticServing in
+# .streamlit/config.toml), so a rerun only sends a short tag and the browser
+# keeps its cached copy instead of re-parsing the whole theme every time.
+with phase(prof, 'css'):
+    st.markdown('<link rel="stylesheet" href="app/static/drone_sim.css">', unsafe_allow_html=True)
 
-    header[data-testid="stHeader"] { display: none; }
-    
-    /* Global Typography & Colors */
-    .stApp { 
-        background-color: #050505 !important; 
-        color: #797979; 
-        font-family: 'Manrope', sans-serif;
-    }
-    
-    h1, h2, h3, h4, h5, h6 { 
-        color: #ffffff !important; 
-        font-family: 'Manrope', sans-serif;
-        margin-bottom: 0px !important; 
-        padding-bottom: 0px !important; 
-    }
-    
-    h3 { font-size: 1.2rem !important; }
-    
-    .block-container { padding-top: 3rem !important; padding-bottom: 1rem !important; }
-    div.stVerticalBlock > div { gap: 0.2rem !important; } 
-    
-    /* Metrics */
-    div[data-testid="stMetricValue"] {
-        font-size: 1.1rem !important;
-        color: #00D2FF; 
-        font-family: 'IBM Plex Mono', monospace;
-    }
-    div[data-testid="stMetricLabel"] { 
-        font-size: 0.6rem !important; 
-        color: #797979; 
-        margin-bottom: -5px; 
-    }
-
-    .stProgress > div > div { height: 6px !important; }
-    .stProgress > div > div > div > div { background-color: #00D2FF; }
-
-    /* Button and Popover Styling */
-    div.stButton > button, div[data-testid="stPopover"] > button {
-        background-color: #111 !important;
-        color: #ffffff !important;
-        border: 1px solid #444 !important;
-        font-size: 0.8rem;
-        font-family: 'Manrope', sans-serif;
-    }
-    
-    div.stButton > button:hover, div[data-testid="stPopover"] > button:hover {
-        border-color: #00D2FF !important;
-        color: #00D2FF !important;
-    }
-    
-    div.stButton > button:focus, div.stButton > button:active,
-    div[data-testid="stPopover"] > button:focus, div[data-testid="stPopover"] > button:active,
-    div[data-testid="stPopover"] > button[aria-expanded="true"] {
-        background-color: #111 !important;
-        color: #00D2FF !important;
-        border-color: #00D2FF !important;
-    }
-
-    div[data-testid="stPopoverBody"], div[role="dialog"] {
-        background-color: #050505 !important;
-        border: 1px solid #333 !important;
-    }
-    
-    /* Stealthy Expander */
-    div[data-testid="stExpander"] {
-        background-color: #111 !important;
-        border: 1px solid #333 !important;
-        border-radius: 5px;
-    }
-    div[data-testid="stExpander"] summary p {
-        color: #797979 !important;
-        font-family: 'IBM Plex Mono', monospace;
-    }
-    
-    .stTextInput input { 
-        background-color: #111 !important; 
-        color: #ffffff !important; 
-        border: 1px solid #444 !important; 
-        font-family: 'IBM Plex Mono', monospace;
-        height: 38px !important;
-        font-size: 0.85rem !important;
-    }
-
-    hr { margin: 0.5em 0 !important; border-color: #333 !important; }
-
-    /* --- DRONE NAME PULSE (BRINC BLUE) --- */
-    @keyframes dronePulse {
-        0%, 49% { color: #797979; text-shadow: none; }
-        50%, 100% { color: #00D2FF; text-shadow: 0 0 8px #00D2FF; }
-    }
-    .drone-active { animation: dronePulse 0.8s infinite; font-weight: bold; font-family: 'IBM Plex Mono', monospace; font-size: 0.9rem; display: block; margin-bottom: -10px; }
-    .drone-static { color: #ffffff; font-weight: bold; text-shadow: none; font-family: 'IBM Plex Mono', monospace; font-size: 0.9rem; display: block; margin-bottom: -10px; }
-
-    /* --- INCIDENT LOG CSS --- */
-    .incident-log {
-        background-color: #111;
-        border: 1px solid #333;
-        border-radius: 5px;
-        padding: 8px; 
-        margin-bottom: 8px;
-        font-family: 'IBM Plex Mono', monospace;
-        font-size: 0.8rem;
-        min-height: 80px;  
-    }
-    .log-header { color: #ffffff; font-size: 0.85rem; border-bottom: 1px solid #333; margin-bottom: 6px; padding-bottom: 4px; font-weight: bold; }
-    .log-entry { margin-bottom: 2px; color: #797979; }
-    .log-time { color: #797979; margin-right: 12px; }
-    
-    .log-critical { color: #ffffff; font-weight: bold; }
-    .log-action { color: #00D2FF; font-weight: bold; }
-    .log-success { color: #00D2FF; font-weight: bold; }
-    .log-info { color: #797979; font-weight: normal; }
-
-    /* --- DRONE METRICS CARD --- */
-    .drone-card {
-        padding: 4px 0px 0px 0px; 
-        margin-top: 4px;
-    }
-    .metric-grid {
-        display: grid;
-        grid-template-columns: repeat(3, 1fr);
-        gap: 6px; 
-    }
-    .m-box { display: flex; flex-direction: column; }
-    .m-label {
-        color: #797979;
-        font-size: 0.55rem; 
-        font-family: 'Manrope', sans-serif;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        margin-bottom: 0px; 
-    }
-    .m-val {
-        color: #00D2FF;
-        font-size: 0.95rem; 
-        font-family: 'IBM Plex Mono', monospace;
-        font-weight: bold;
-    }
-    .m-val-dim {
-        color: #444444;
-        font-size: 0.95rem; 
-        font-family: 'IBM Plex Mono', monospace;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+LOGO_HTML = '<img src="app/static/logo.png" style="width: 100%;">'
 
 # --- Helper Functions ---
 def load_data():
     try:
-        df = pd.read_csv('drones.csv')
-        df = df.dropna(subset=['model'])
-        df['model'] = df['model'].astype(str)
-        df.columns = df.columns.str.strip()
-        return df
-    except:
-        data = {
-            'model': ['RESPONDER', 'GUARDIAN', 'SKYDIO X-10', 'MATRICE 4TD'],
-            'flight_time_min': [42, 60, 40, 54],
-            'speed_mph': [22, 30, 36, 34],
-            'range_miles': [5.0, 12.0, 7.5, 6.2]
-        }
-        return pd.DataFrame(data)
-
-def get_full_recharge_time(model_name):
-    mapping = {
-        'RESPONDER': 25,
-        'GUARDIAN': 1, 
-        'SKYDIO': 35,
-        'MATRICE': 55
-    }
-    for key, val in mapping.items():
-        if key in model_name.upper():
-            return val
-    return 60
-
-@st.cache_data(show_spinner=False)
-def get_lat_lon_from_zip(zip_code):
-    zip_code = str(zip_code).strip()
-
-    if not zip_code.isdigit() or len(zip_code) != 5:
-        return None
-
-    nomi = pgeocode.Nominatim("us")
-    row = nomi.query_postal_code(zip_code)
+        with phase(prof, 'load_data'):
+            return load_fleet()
+    except FleetCatalogError as exc:
+        st.error(str(exc))
+        finish_run(prof, end='stop')
+        st.stop()
+
+# Once per server process: the fleet catalog is parsed and validated and the
+# ZIP index mapped before the first session needs them.
+@st.cache_resource(show_spinner=False)
+def warm_shared_resources():
+    load_zip_index()
+    try:
+        load_fleet()
+    except FleetCatalogError:
+        pass  # load_data() reports it in the page
 
-    if pd.isna(row.latitude) or pd.isna(row.longitude):
-        return None
+warm_shared_resources()
 
-    return [float(row.latitude), float(row.longitude)]
+def get_lat_lon_from_zip(zip_code):
+    with phase(prof, 'zip_lookup'):
+        return lookup_zip(zip_code)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_coverage_grid(base, spec_hash, resolution, wind, _fleet):
+    return coverage_grid(_fleet, base, resolution, wind=wind)
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def get_static_map_template(base, coverage_key, _center, _zoom, _coverage):
+    return build_static_map(_center, _zoom, base, _coverage)
+
+# Shared by every session through SCENARIO_CACHE; base and target are snapped
+# to its grid when clicked, so the cached result is the exact result.
+def get_mission_frames(base, target, spec_hash, fleet, wind=None):
+    from engine import simulate, build_frames
+
+    def compute():
+        if wind is None:
+            return simulate(fleet, base, target)
+        mission = sweep_mission(get_wind_sweep(base, target, spec_hash, fleet), *wind)
+        return mission, build_frames(mission, fleet['battery_swap'])
+    
+    return SCENARIO_CACHE.get_or_compute(('mission', quantize_point(base), quantize_point(target), spec_hash, wind), compute)
+
+# The whole speed x direction grid for a scenario is one kernel call; moving
+# the wind controls afterwards only picks a column out of it.
+def get_wind_sweep(base, target, spec_hash, fleet):
+    return SCENARIO_CACHE.get_or_compute(('wind_sweep', quantize_point(base), quantize_point(target), spec_hash),
+                                         lambda: wind_sweep(fleet, base, target))
+
+# Keyed on the incident set itself, so re-proposing for the same points and
+# fleet (from any session) is free.
+SITING_SYNTHETIC_POINTS = 20_000
+
+def get_proposed_sites(points, k, objective, spec_hash, fleet):
+    from siting import optimize_sites
+    return SCENARIO_CACHE.get_or_compute(('siting', points_hash(points), spec_hash, k, objective),
+                                         lambda: optimize_sites(points, fleet, k, objective=objective))
+
+# The docks already placed, each with the models it stocks, scored on the same
+# incidents, so a proposal can be compared with what the session has now.
+def get_site_score(points, docks, catalog):
+    from dispatch import stock_mask
+    from siting import evaluate_sites
+    sites = [d['pos'] for d in docks]
+    stock = stock_mask(catalog.models, [d['models'] for d in docks])
+    return SCENARIO_CACHE.get_or_compute(('site_score', points_hash(points), points_hash(sites), stock.tobytes(), catalog.spec_hash),
+                                         lambda: evaluate_sites(sites, points, catalog.arrays, stock=stock))
+
+# One background writer per server process: completed runs go to SQLite and,
+# when the secrets are filled in, to the Google Sheet.
+@st.cache_resource(show_spinner=False)
+def get_results_writer():
+    from results_store import ResultsWriter, default_sinks
+    try:
+        secrets = st.secrets.to_dict()
+    except Exception:
+        secrets = {}
+    return ResultsWriter(default_sinks(secrets))
+
+def record_run(models, mission, launch, dist_miles):
+    from results_store import run_record
+    officer_eta = (st.session_state.t_officers - st.session_state.t_call).total_seconds() if st.session_state.t_officers else float('nan')
+    get_results_writer().submit(run_record(models, mission, launch, st.session_state.target,
+                                           st.session_state.inc_type, st.session_state.inc_severity, officer_eta,
+                                           dist_miles, wind, st.session_state.session_id))
+
+# --- Docks ---
+# st.session_state.docks holds every dock as {'pos', 'models'}; docks[0] is the
+# base (home) and 'models' is None when a dock stocks the whole fleet. The
+# session's dispatch board keeps one launch-time row per target, so reruns
+# and revisited targets are a lookup; it is rebuilt only when the docks, their
+# stock, the fleet or the wind change.
+def get_dispatch_board(catalog):
+    from dispatch import new_board, stock_mask
+    docks = st.session_state.docks
+    key = (catalog.spec_hash, wind, tuple((tuple(d['pos']), None if d['models'] is None else tuple(d['models'])) for d in docks))
+    if st.session_state.get('dispatch_key') != key:
+        st.session_state.dispatch_board = new_board(catalog.arrays, [d['pos'] for d in docks],
+                                                    stock_mask(catalog.models, [d['models'] for d in docks]), wind)
+        st.session_state.dispatch_key = key
+    return st.session_state.dispatch_board
+
+def launch_plan(catalog):
+    # -> (dock index, model name or None); dock 0 when nothing can fly the target
+    if len(st.session_state.docks) < 2:
+        return 0, None
+    from dispatch import dispatch
+    with phase(prof, 'dispatch'):
+        dock, model, _ = dispatch(get_dispatch_board(catalog), st.session_state.target)
+    return (dock, catalog.models[model]) if dock >= 0 else (0, None)
+
+def dock_fleet(catalog, dock):
+    # the models stocked at a dock, as (names, arrays, cache key)
+    stocked = st.session_state.docks[dock]['models'] if st.session_state.docks else None
+    if stocked is None:
+        return catalog.models, catalog.arrays, catalog.spec_hash
+    keep = np.isin(catalog.models, stocked)
+    return catalog.models[keep], {k: v[keep] for k, v in catalog.arrays.items()}, (catalog.spec_hash, tuple(stocked))
 
 def get_distance_miles(p1, p2):
-    return ((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)**0.5 * 69
+    return float(haversine_miles(p1[0], p1[1], p2[0], p2[1]))
 
 def generate_incident():
-    incidents = [
-        ("SHOTS FIRED", "critical"),
-        ("ARMED ROBBERY", "critical"),
-        ("OFFICER IN DISTRESS", "critical"),
-        ("BURGLARY IN PROGRESS", "action"),
-        ("VEHICLE PURSUIT", "action"),
-        ("MISSING PERSON", "info"),
-        ("SUSPICIOUS ACTIVITY", "info")
-    ]
-    inc, severity = random.choice(incidents)
+    inc, severity = random.choice(INCIDENTS)
     st.session_state.inc_type = inc
     st.session_state.inc_severity = severity
     
@@ -245,43 +206,73 @@ def generate_incident():
     
     base_time = datetime.now().replace(hour=hr, minute=mn, second=sc)
     st.session_state.t_call = base_time
-    st.session_state.t_launch = base_time + timedelta(seconds=random.randint(45, 120))
+    st.session_state.t_launch = base_time + timedelta(seconds=random.randint(*LAUNCH_DELAY_SEC))
 
 def randomize_squads():
     if st.session_state.base:
         st.session_state.squad_cars = []
-        num_cars = random.randint(3, 5) 
+        num_cars = random.randint(*SQUAD_COUNT) 
         for _ in range(num_cars):
-            r_mi = random.uniform(0.5, 9.0) 
+            r_mi = random.uniform(*SQUAD_RADIUS_MI) 
             angle = random.uniform(0, 2 * math.pi)
             d_lat = (r_mi * math.sin(angle)) / 69.172
             d_lon = (r_mi * math.cos(angle)) / (69.172 * math.cos(math.radians(st.session_state.base[0])))
             st.session_state.squad_cars.append([st.session_state.base[0] + d_lat, st.session_state.base[1] + d_lon])
+        st.session_state.squad_index = build_unit_index(st.session_state.squad_cars)
+
+def get_squad_index():
+    index = st.session_state.squad_index
+    if index is None or len(index['positions']) != len(st.session_state.squad_cars):
+        index = build_unit_index(st.session_state.squad_cars)
+        st.session_state.squad_index = index
+    return index
 
 def calculate_responding_officer():
-    best_dist = float('inf')
+    best_sec = float('inf')
     best_sq = None
     if st.session_state.base and st.session_state.target and st.session_state.squad_cars:
-        for sq in st.session_state.squad_cars:
-            d = get_distance_miles(sq, st.session_state.target)
-            if d < best_dist:
-                best_dist = d
-                best_sq = sq
+        # Road travel over the region's graph when one is installed (one
+        # multi-source search from every car), else nearest car x1.4 straight-line.
+        from roads import fastest_unit, graph_version, load_graph
+        graph = graph_version(st.session_state.base)
+
+        def responding_officer():
+            if graph is not None:
+                hit = fastest_unit(load_graph(graph[0]), st.session_state.squad_cars, st.session_state.target)
+                if hit is not None:
+                    return hit
+            nearest, dists = nearest_units(get_squad_index(), st.session_state.target, k=1)
+            return (int(nearest[0]), float(officer_travel_sec(dists[0]))) if len(nearest) else (-1, float('inf'))
+        
+        # the graph file and its mtime, like the fleet catalog's, so a replaced
+        # data/roads/*.npz doesn't keep serving ETAs routed over the old one
+        key = ('officer', quantize_point(st.session_state.base), quantize_point(st.session_state.target),
+               points_hash(st.session_state.squad_cars), graph)
+        idx, sec = SCENARIO_CACHE.get_or_compute(key, responding_officer)
+        if idx >= 0:
+            best_sec = sec
+            best_sq = st.session_state.squad_cars[idx]
         
-        if best_dist == float('inf'): 
-            best_dist = get_distance_miles(st.session_state.base, st.session_state.target)
+        if best_sec == float('inf'): 
+            best_sec = float(officer_travel_sec(get_distance_miles(st.session_state.base, st.session_state.target)))
             best_sq = st.session_state.base
 
         st.session_state.best_officer_sq = best_sq
         
         if 't_call' in st.session_state:
-            t_officer_dispatch = st.session_state.t_call + timedelta(seconds=60)
-            officer_travel_sec = (best_dist * 1.4) / (35.0 / 3600.0)
-            st.session_state.t_officers = t_officer_dispatch + timedelta(seconds=officer_travel_sec)
+            t_officer_dispatch = st.session_state.t_call + timedelta(seconds=OFFICER_DISPATCH_SEC)
+            st.session_state.t_officers = t_officer_dispatch + timedelta(seconds=best_sec)
+
+SIM_HOLD_SEC = 3.0
 
 # --- Layout: Dynamic Columns ---
 left_col, mid_col = st.columns([7, 3])
 
+show_coverage = False
+coverage_models = []
+coverage_res = 200
+wind = None
+
 # ==========================================
 # COLUMN 2: OPS CENTER & ASSET COST
 # ==========================================
@@ -292,7 +283,7 @@ with mid_col:
         with zip_col:
             zip_in = st.text_input("ZIP", placeholder="ZIP + ENTER", label_visibility="collapsed", max_chars=5, key="zip_input")
         with logo_col:
-            st.image("logo.png", use_container_width=True)
+            st.markdown(LOGO_HTML, unsafe_allow_html=True)
             
         if zip_in and zip_in.isdigit() and len(zip_in) == 5:
             with st.spinner("📡 Locating Target Zone..."):
@@ -300,21 +291,101 @@ with mid_col:
             
             if coords:
                 st.session_state.map_center = coords
+                request_prefetch(coords)
                 st.session_state.map_zoom = 13 
                 st.session_state.step = 2
-                st.rerun()
+                rerun()
             else:
                 st.error("Invalid ZIP code. (Try again)")
+        elif zip_in and zip_in.isdigit():
+            for sug in search_prefix(zip_in, limit=6):
+                if st.button(f"{sug['zip']}  {sug['place']}, {sug['state']}", key=f"zip_sug_{sug['zip']}", use_container_width=True):
+                    st.session_state.map_center = [sug['lat'], sug['lon']]
+                    request_prefetch(st.session_state.map_center)
+                    st.session_state.map_zoom = 13 
+                    st.session_state.step = 2
+                    rerun()
 
     elif st.session_state.step >= 2:
         gear_col, asset_col, space_col, logo_col = st.columns([0.6, 1.5, 0.4, 2])
         
         with logo_col:
-            st.image("logo.png", use_container_width=True)
+            st.markdown(LOGO_HTML, unsafe_allow_html=True)
             
         with gear_col:
             with st.popover("⚙️", use_container_width=True):
                 anim_duration = st.slider("Sim Secs", min_value=5, max_value=120, value=15)
+                show_coverage = st.checkbox("Coverage Heatmap", value=False, disabled=not st.session_state.base)
+                if show_coverage:
+                    fleet_models = list(load_data().models)
+                    coverage_models = st.multiselect("Models", fleet_models, default=fleet_models)
+                    coverage_res = st.select_slider("Grid", options=[100, 200, 400], value=200)
+                wind_mph = st.select_slider("Wind MPH", options=[int(s) for s in WIND_SPEEDS_MPH], value=0)
+                if wind_mph:
+                    wind_dir = st.select_slider("Wind From", options=COMPASS, value="N")
+                    wind = (float(wind_mph), float(WIND_FROM_DEG[COMPASS.index(wind_dir)]))
+                if st.session_state.base and st.session_state.target:
+                    with st.expander("Wind Sweep"):
+                        catalog = load_data()
+                        table = sweep_table(get_wind_sweep(tuple(st.session_state.base), tuple(st.session_state.target), catalog.spec_hash, catalog.arrays), catalog.models)
+                        st.caption(f"MODELS ABLE TO FLY (OF {len(catalog)}) BY WIND MPH × DIRECTION")
+                        st.dataframe(pd.DataFrame(table['flyable'], index=[f"{int(v)} MPH" for v in WIND_SPEEDS_MPH], columns=COMPASS), use_container_width=True)
+                if st.session_state.base:
+                    with st.expander(f"Docks ({len(st.session_state.docks)})"):
+                        fleet_models = list(load_data().models)
+                        for i, dock in enumerate(st.session_state.docks):
+                            picked = st.multiselect(f"DOCK {i + 1}" + (" (HOME)" if i == 0 else ""), fleet_models,
+                                                    default=fleet_models if dock['models'] is None else dock['models'], key=f"dock_models_{i}")
+                            dock['models'] = None if len(picked) == len(fleet_models) else picked
+                        if st.session_state.placing_dock:
+                            st.caption("CLICK THE MAP TO PLACE A DOCK")
+                            if st.button("Cancel", use_container_width=True):
+                                st.session_state.placing_dock = False
+                                rerun()
+                        elif st.button("Add Dock", use_container_width=True):
+                            st.session_state.placing_dock = True
+                            rerun()
+                        if len(st.session_state.docks) > 1 and st.button("Remove Last Dock", use_container_width=True):
+                            st.session_state.docks.pop()
+                            st.session_state.pop(f"dock_models_{len(st.session_state.docks)}", None)
+                            rerun()
+                        if st.session_state.proposed_sites is not None and st.button("Dock At Proposed Sites", use_container_width=True):
+                            st.session_state.docks = st.session_state.docks[:1] + [
+                                {'pos': list(quantize_point(site)), 'models': None} for site in st.session_state.proposed_sites['sites']]
+                            for i in range(1, len(st.session_state.docks)):
+                                st.session_state.pop(f"dock_models_{i}", None)
+                            rerun()
+                with st.expander("Propose Bases"):
+                    siting_k = st.select_slider("Docks", options=[1, 2, 3, 4], value=2)
+                    siting_objective = st.radio("Minimize", ["mean", "p90"], horizontal=True, format_func=lambda o: o.upper() + " ARRIVAL")
+                    siting_csv = st.file_uploader("Incidents CSV (lat, lon)", type="csv")
+                    if st.button("Propose", use_container_width=True):
+                        from siting import load_points, synthetic_points
+                        catalog = load_data()
+                        center = st.session_state.base or st.session_state.map_center
+                        points = load_points(siting_csv) if siting_csv else synthetic_points(center, SITING_SYNTHETIC_POINTS)
+                        if len(points):
+                            with st.spinner("Siting..."), phase(prof, 'siting'):
+                                st.session_state.proposed_sites = get_proposed_sites(points, siting_k, siting_objective, catalog.spec_hash, catalog.arrays)
+                                docks = copy.deepcopy(st.session_state.docks)
+                                st.session_state.current_sites = (docks, get_site_score(points, docks, catalog)) if docks else None
+                        else:
+                            st.warning("NO INCIDENTS WITH LAT/LON")
+                    proposed = st.session_state.proposed_sites
+                    if proposed is not None:
+                        st.caption(f"MEAN {proposed['mean'] / 60:.1f} MIN · P90 {proposed['p90'] / 60:.1f} MIN · COVERED {proposed['coverage']:.0%}")
+                        # only while the docks and their stock are still the ones that were scored
+                        scored = st.session_state.current_sites
+                        if scored is not None and scored[0] == st.session_state.docks:
+                            current = scored[1]
+                            st.caption(f"CURRENT DOCKS: MEAN {current['mean'] / 60:.1f} MIN · P90 {current['p90'] / 60:.1f} MIN · COVERED {current['coverage']:.0%}")
+                        if st.button("Clear", use_container_width=True):
+                            st.session_state.proposed_sites = None
+                            st.session_state.current_sites = None
+                            rerun()
+                if prof is not None:
+                    with st.expander("Debug"):
+                        debug_slot = st.empty()
                 
         with asset_col:
             if st.session_state.target and st.session_state.base:
@@ -353,305 +424,149 @@ with mid_col:
         else:
             incident_placeholder = st.empty()
 
-        if st.session_state.step == 3:
-            df = load_data()
-            drone_ui_elements = [] 
-            for index, row in df.iterrows():
-                # ADDED border=True right here to create the neat bounding boxes
-                with st.container(border=True):
-                    head_c1, head_c2 = st.columns([1.8, 1])
-                    name_placeholder = head_c1.empty()
-                    status_placeholder = head_c2.empty()
-                    
-                    flight_bar = st.progress(0)
-                    metrics_placeholder = st.empty() 
-                    
-                    ui_obj = {
-                        'specs': row,
-                        'name_text': name_placeholder,
-                        'status_text': status_placeholder,
-                        'flight_bar': flight_bar,
-                        'metrics_html': metrics_placeholder,
-                        'cache': {}
-                    }
-                    drone_ui_elements.append(ui_obj)
+
+# --- Launch Dock ---
+# With more than one dock the drone flies from whichever dock has the fastest
+# stocked model that can make the trip; with one it is always the base.
+launch_dock, launch_model, launch_pos = 0, None, st.session_state.base
+if st.session_state.step == 3 and st.session_state.base and st.session_state.target:
+    launch_dock, launch_model = launch_plan(load_data())
+    if st.session_state.docks:
+        launch_pos = st.session_state.docks[launch_dock]['pos']
 
 # ==========================================
 # COLUMN 1: MAP
 # ==========================================
-def generate_base_map():
-    m = folium.Map(location=st.session_state.map_center, zoom_start=st.session_state.map_zoom, tiles="CartoDB dark_matter")
-    
-    m.get_root().header.add_child(folium.Element("""
-        <style>
-        .leaflet-tile-pane {
-            filter: brightness(1.6) contrast(1.2);
-        }
-        </style>
-    """))
+def get_static_map():
+    base = tuple(st.session_state.base) if st.session_state.base else None
+    coverage = None
+    coverage_key = None
+    if base and show_coverage and coverage_models:
+        catalog = load_data()
+        grid = get_coverage_grid(base, catalog.spec_hash, coverage_res, wind, catalog.arrays)
+        coverage = (grid, np.isin(grid['model'], coverage_models))
+        coverage_key = (catalog.spec_hash, coverage_res, tuple(coverage_models), wind)
     
-    if st.session_state.base:
-        base_html = """<div style="color: #00D2FF; font-size: 24px; text-shadow: 0 0 5px #000;"><i class="fa fa-home"></i></div>"""
-        folium.Marker(st.session_state.base, icon=DivIcon(html=base_html, icon_anchor=(10,10))).add_to(m)
-        
-        rings = [2, 4, 6, 8]
-        for r in rings:
-            folium.Circle(location=st.session_state.base, radius=r * 1609.34, color='#00D2FF', weight=1, fill=False, opacity=0.5, dash_array='4, 8').add_to(m)
-            lat_offset = (r / 69.0)
-            folium.map.Marker([st.session_state.base[0] + lat_offset, st.session_state.base[1]], icon=DivIcon(icon_size=(100,20), icon_anchor=(50,10), html=f'<div style="font-family: \'Manrope\', sans-serif; font-size:10px; font-weight:600; color:#00D2FF; text-shadow: 0 0 5px #000;">{r} MI</div>')).add_to(m)
-
-        is_responding = st.session_state.step == 3 and not st.session_state.sim_completed
-
-        for sq in st.session_state.squad_cars:
-            if is_responding:
-                car_color = "#FF0000" if sq == st.session_state.best_officer_sq else "#00D2FF"
-            else:
-                car_color = "#00D2FF"
-            car_html = f"""<div style="color: {car_color}; font-size: 18px; text-shadow: 0 0 5px #000;"><i class="fa fa-car"></i></div>"""
-            folium.Marker(sq, icon=DivIcon(html=car_html)).add_to(m)
+    # st_folium renders (and mutates) the map it is given, so every run gets a
+    # fresh copy of the cached template. The copy keeps the template's element
+    # ids, so the Leaflet script is byte-identical and the browser keeps the
+    # loaded map; only the dynamic layer is pushed.
+    return copy.deepcopy(get_static_map_template(base, coverage_key, st.session_state.map_center, st.session_state.map_zoom, coverage))
 
+def generate_dynamic_layer():
     is_responding = st.session_state.step == 3 and not st.session_state.sim_completed
-    if st.session_state.target and is_responding:
-        target_html = """<div style="color: #FF0000; font-size: 24px; text-shadow: 0 0 5px #000;"><i class="fa fa-crosshairs"></i></div>"""
-        folium.Marker(st.session_state.target, icon=DivIcon(html=target_html, icon_anchor=(10,10))).add_to(m)
-        
-        plugins.AntPath(locations=[st.session_state.base, st.session_state.target], color="#00D2FF", pulse_color="#ffffff", weight=3, delay=800, dash_array=[10, 20]).add_to(m)
-        
-        if st.session_state.best_officer_sq:
-            plugins.AntPath(locations=[st.session_state.best_officer_sq, st.session_state.target], color="#FF0000", pulse_color="#ffffff", weight=3, delay=400, dash_array=[15, 30]).add_to(m)
-
-    return m
+    drone_track = None
+    if st.session_state.base and st.session_state.target and is_responding:
+        from engine import sim_duration
+        from playback import DroneTrack
+        _, arrays, spec_key = dock_fleet(load_data(), launch_dock)
+        mission, _ = get_mission_frames(tuple(launch_pos), tuple(st.session_state.target), spec_key, arrays, wind)
+        if mission['possible'].any():
+            drone_track = DroneTrack(launch_pos, st.session_state.target, mission, sim_duration(mission), anim_duration)
+    
+    return build_dynamic_layer(st.session_state.base, st.session_state.squad_cars, st.session_state.target,
+                               st.session_state.best_officer_sq, is_responding, drone_track, st.session_state.proposed_sites,
+                               docks=st.session_state.docks, launch=launch_pos)
 
 with left_col:
-    m_static = generate_base_map()
+    with phase(prof, 'static_map'):
+        m_static = get_static_map()
+    with phase(prof, 'dynamic_layer'):
+        dynamic_layer = generate_dynamic_layer()
     
-    map_data = st_folium(m_static, height=850, use_container_width=True, key="static_map", returned_objects=["last_clicked"])
+    with phase(prof, 'st_folium'):
+        map_data = st_folium(m_static, height=850, use_container_width=True, key="static_map", returned_objects=["last_clicked"],
+                             center=st.session_state.map_center, zoom=st.session_state.map_zoom, feature_group_to_add=dynamic_layer)
     
     if map_data.get('last_clicked'):
-        coords = [map_data['last_clicked']['lat'], map_data['last_clicked']['lng']]
+        coords = list(quantize_point([map_data['last_clicked']['lat'], map_data['last_clicked']['lng']]))
         
         if coords != st.session_state.last_processed_click:
             st.session_state.last_processed_click = coords
             
             if not st.session_state.base:
                 st.session_state.base = coords
+                st.session_state.docks = [{'pos': coords, 'models': None}]
+                request_prefetch(coords)
                 st.session_state.map_zoom = 12 
                 randomize_squads() 
                 st.session_state.sim_completed = False
-                st.rerun()
+                st.session_state.sim_started = None
+                rerun()
+            elif st.session_state.placing_dock:
+                st.session_state.docks.append({'pos': coords, 'models': None})
+                request_prefetch(coords)
+                st.session_state.placing_dock = False
+                rerun()
             elif st.session_state.target != coords:
                 st.session_state.target = coords
                 generate_incident() 
                 calculate_responding_officer() 
                 st.session_state.step = 3
                 st.session_state.sim_completed = False
-                st.rerun()
+                st.session_state.sim_started = None
+                rerun()
 
 # ==========================================
 # SIMULATION LOOP
 # ==========================================
 if st.session_state.step == 3 and st.session_state.base and st.session_state.target:
-    dist_one_way = get_distance_miles(st.session_state.base, st.session_state.target)
+    from playback import playback_payload, render_playback
+    models, arrays, spec_key = dock_fleet(load_data(), launch_dock)
+    with phase(prof, 'mission'):
+        mission, frames = get_mission_frames(tuple(launch_pos), tuple(st.session_state.target), spec_key, arrays, wind)
+    dist_one_way = get_distance_miles(launch_pos, st.session_state.target)
+    launch_label = f'{launch_model} LAUNCHED FROM DOCK {launch_dock + 1}' if launch_model else 'DRONE LAUNCHED'
     
-    fleet_sim_data = []
-    for drone in drone_ui_elements:
-        specs = drone['specs']
-        max_v = float(specs['speed_mph'])
-        
-        t_out = dist_one_way / (max_v / 3600)
-        batt_sec = float(specs['flight_time_min']) * 60
-        
-        reserve_sec = 5 * 60
-        hover_sec = (batt_sec - reserve_sec) - (t_out * 2)
-        
-        possible = hover_sec >= 0 and dist_one_way <= float(specs['range_miles'])
-        
-        used_batt_sec = (t_out * 2) + (hover_sec if possible else 0)
-        batt_used_pct = used_batt_sec / batt_sec
-        full_recharge_min = get_full_recharge_time(specs['model'])
-        
-        if specs['model'].upper() == 'GUARDIAN':
-            turnaround_min = 1.0 
-        else:
-            turnaround_min = full_recharge_min * batt_used_pct
-
-        fleet_sim_data.append({
-            'ui': drone, 't_out': t_out, 't_hov': hover_sec if possible else 0,
-            't_total': (t_out * 2) + (hover_sec if possible else 0),
-            'batt_cap': batt_sec, 'possible': possible,
-            'turnaround_min': turnaround_min,
-            'fail_msg': "FUEL" if hover_sec < 0 else "RANGE"
-        })
-
-    valid = [d for d in fleet_sim_data if d['possible']]
-    valid.sort(key=lambda x: x['t_total'], reverse=True) 
-    
-    fastest_t_out = min([d['t_out'] for d in valid]) if valid else 0
-    t_drone_arrival = st.session_state.t_launch + timedelta(seconds=fastest_t_out)
-    sim_dur = max([d['t_total'] for d in valid]) if valid else 5
-    
-    log_cache = [""] 
+    log_labels = {
+        'call': f'<span class="log-{st.session_state.inc_severity}">{st.session_state.inc_type} - TARGET: {dist_one_way:.2f} MI</span>',
+        'launch': f'<span class="log-action">{launch_label}</span>',
+        'drone_on_scene': '<span class="log-success">DRONE ON SCENE</span>',
+        'officers_arrive': '<span class="log-info">OFFICERS ARRIVE</span>'
+    }
     
-    def render_ui_state(curr_time, log_html_override=None):
-        log_events = [
-            (st.session_state.t_call, f'<span class="log-{st.session_state.inc_severity}">{st.session_state.inc_type} - TARGET: {dist_one_way:.2f} MI</span>'),
-            (st.session_state.t_launch, '<span class="log-action">DRONE LAUNCHED</span>')
-        ]
-        
-        if curr_time >= fastest_t_out and valid:
-            log_events.append((t_drone_arrival, '<span class="log-success">DRONE ON SCENE</span>'))
-
-        officer_sec_since_launch = (st.session_state.t_officers - st.session_state.t_launch).total_seconds()
-        if curr_time >= officer_sec_since_launch:
-            log_events.append((st.session_state.t_officers, '<span class="log-info">OFFICERS ARRIVE</span>'))
-
-        log_events.sort(key=lambda x: x[0])
+    # --- Client-Side Playback ---
+    # The whole timeline ships to the browser once and animates there, so the
+    # script run ends as soon as the payload is sent. Reruns during playback
+    # send the identical payload, which leaves the running animation alone.
+    with phase(prof, 'playback_payload'):
+        payload = playback_payload(
+            models, mission, frames, log_labels,
+            st.session_state.t_call, st.session_state.t_launch, st.session_state.t_officers,
+            anim_duration, start_at_end=st.session_state.sim_completed
+        )
+    with phase(prof, 'render_playback'), incident_placeholder:
+        count(prof, 'placeholder_updates', nbytes=render_playback(payload))
 
-        if log_html_override is None:
-            log_html = f"""<div class="incident-log"><div class="log-header">INCIDENT LOG</div>"""
-            for dt, html_str in log_events:
-                log_html += f'<div class="log-entry"><span class="log-time">{dt.strftime("%H:%M:%S")}</span>{html_str}</div>'
-            log_html += "</div>"
-        else:
-            log_html = log_html_override
-            
-        if log_cache[0] != log_html:
-            incident_placeholder.markdown(log_html, unsafe_allow_html=True)
-            log_cache[0] = log_html
-
-        for d in fleet_sim_data:
-            ui = d['ui']
-            cache = ui['cache']
-            
-            if not d['possible']:
-                status_html = f"<div style='text-align:right; margin-bottom:-10px;'><span style='color:#797979; font-size:0.8rem; font-weight:bold; font-family: \"IBM Plex Mono\", monospace;'>{d['fail_msg']}</span></div>"
-                name_html = f"<span class='drone-static'>{ui['specs']['model']}</span>"
-                prog_val = 0.0
-                card_html = f"""
-                <div class="drone-card">
-                    <div class="metric-grid">
-                        <div class="m-box"><div class="m-label">TIME TO TGT</div><div class="m-val-dim">N/A</div></div>
-                        <div class="m-box"><div class="m-label">ON SCENE</div><div class="m-val-dim">N/A</div></div>
-                        <div class="m-box"><div class="m-label">BATTERY</div><div class="m-val-dim">N/A</div></div>
-                    </div>
-                </div>
-                """
-                
-                if cache.get('status') != status_html:
-                    ui['status_text'].markdown(status_html, unsafe_allow_html=True)
-                    cache['status'] = status_html
-                if cache.get('name') != name_html:
-                    ui['name_text'].markdown(name_html, unsafe_allow_html=True)
-                    cache['name'] = name_html
-                if cache.get('prog') != prog_val:
-                    ui['flight_bar'].progress(prog_val)
-                    cache['prog'] = prog_val
-                if cache.get('card') != card_html:
-                    ui['metrics_html'].markdown(card_html, unsafe_allow_html=True)
-                    cache['card'] = card_html
-                continue
-            
-            phase_txt, phase_col, site_time = "", "#00D2FF", 0
-            is_active = False
-            is_rtb_complete = False
-            
-            if curr_time < d['t_out']:
-                phase_txt = "OUTBOUND"
-                flight_prog = curr_time / d['t_out']
-                is_active = True
-            elif curr_time < (d['t_out'] + d['t_hov']):
-                phase_txt, site_time = "ON SCENE", curr_time - d['t_out']
-                flight_prog = 1.0
-                is_active = True
-            elif curr_time < d['t_total']:
-                phase_txt = "RTB"
-                site_time = d['t_hov']
-                flight_prog = 1.0 - ((curr_time - d['t_out'] - d['t_hov']) / d['t_out'])
-                is_active = True
-            else:
-                if ui['specs']['model'].upper() == 'GUARDIAN':
-                    phase_txt = "SWAPPING BATT"
-                    phase_col = "#39FF14" 
-                else:
-                    phase_txt = "RECHARGING"
-                    phase_col = "#FFC300" 
-                
-                site_time = d['t_hov']
-                flight_prog = 0.0
-                is_active = False
-                is_rtb_complete = True
-
-            name_class = "drone-active" if is_active else "drone-static"
-            
-            name_html = f"<span class='{name_class}'>{ui['specs']['model']}</span>"
-            status_html = f"<div style='text-align:right; margin-bottom:-10px;'><span style='color:{phase_col}; font-size:0.8rem; font-weight:bold; font-family: \"IBM Plex Mono\", monospace;'>{phase_txt}</span></div>"
-            prog_val = max(0.0, min(flight_prog, 1.0))
-            
-            used = min(curr_time, d['t_out']) + max(0, min(curr_time - d['t_out'], d['t_hov'])) + max(0, min(curr_time - (d['t_out'] + d['t_hov']), d['t_out']))
-            
-            eta_label = "TIME TO TGT"
-            display_time = min(curr_time, d['t_out'])
-            eta_val = f"{int(display_time/60):02d}:{int(display_time%60):02d}"
-            
-            hov_val = f"{int(site_time/60):02d}:{int(site_time%60):02d}"
-            
-            pct = max(0, 100 - (used / d['batt_cap'] * 100))
-            if is_rtb_complete:
-                mission_progress = used / d['t_total'] if d['t_total'] > 0 else 0
-                current_recharge_min = d['turnaround_min'] * mission_progress
-                t_min = int(current_recharge_min)
-                t_sec = int((current_recharge_min * 60) % 60)
-                
-                if ui['specs']['model'].upper() == 'GUARDIAN':
-                    bat_label = "<span style='color: #ffffff;'>BATTERY SWAP</span>"
-                else:
-                    bat_label = "<span style='color: #ffffff;'>RECHARGE</span>"
-                    
-                bat_val = f"{t_min:02d}m {t_sec:02d}s"
-            else:
-                bat_label = "BATTERY"
-                bat_val = f"{int(pct)}%"
-
-            card_html = f"""
-            <div class="drone-card">
-                <div class="metric-grid">
-                    <div class="m-box"><div class="m-label">{eta_label}</div><div class="m-val">{eta_val}</div></div>
-                    <div class="m-box"><div class="m-label">ON SCENE</div><div class="m-val">{hov_val}</div></div>
-                    <div class="m-box"><div class="m-label">{bat_label}</div><div class="m-val">{bat_val}</div></div>
-                </div>
-            </div>
-            """
-            
-            if cache.get('name') != name_html:
-                ui['name_text'].markdown(name_html, unsafe_allow_html=True)
-                cache['name'] = name_html
-                
-            if cache.get('status') != status_html:
-                ui['status_text'].markdown(status_html, unsafe_allow_html=True)
-                cache['status'] = status_html
-                
-            if cache.get('prog') != prog_val:
-                ui['flight_bar'].progress(prog_val)
-                cache['prog'] = prog_val
-                
-            if cache.get('card') != card_html:
-                ui['metrics_html'].markdown(card_html, unsafe_allow_html=True)
-                cache['card'] = card_html
-
-    # --- Live Simulation Loop ---
     if not st.session_state.sim_completed:
-        sleep_per_tick = anim_duration / 101.0
+        if st.session_state.sim_started is None:
+            st.session_state.sim_started = time.time()
         
-        for tick in range(101):
-            curr_time = (tick / 100) * sim_dur
-            render_ui_state(curr_time)
-            time.sleep(sleep_per_tick)
-
-        time.sleep(3.0) 
-        randomize_squads()
-        st.session_state.sim_completed = True
-        st.session_state.has_run_once = True 
-        st.rerun()
+        def finish_sim():
+            if time.time() - st.session_state.sim_started >= anim_duration + SIM_HOLD_SEC:
+                record_run(models, mission, launch_pos, dist_one_way)
+                randomize_squads()
+                st.session_state.sim_completed = True
+                st.session_state.has_run_once = True 
+                st.rerun()
         
-    else:
-        render_ui_state(sim_dur)
+        # The browser re-triggers this fragment once playback has finished; no
+        # script thread is held while the animation runs.
+        st.fragment(finish_sim, run_every=anim_duration + SIM_HOLD_SEC)()
+
+# --- Profiling Output ---
+if prof is not None:
+    rec = finish_run(prof)
+    if debug_slot is not None:
+        with debug_slot.container():
+            st.caption(f"RUN {rec['run']} · {rec['total_ms']:.1f} MS")
+            st.dataframe([{'phase': p['name'], 'ms': p['ms']} for p in rec['phases']], hide_index=True, use_container_width=True)
+            for name, c in rec['counters'].items():
+                st.caption(f"{name.upper()}: {c['n']} · {c['bytes'] / 1024:.1f} KB")
+            cs = SCENARIO_CACHE.stats()
+            st.caption(f"SCENARIO CACHE: {cs['entries']} ENTRIES · {cs['bytes'] / 1e6:.2f} MB · "
+                       f"HIT RATE {cs['hit_rate']:.0%} ({cs['hits']}/{cs['hits'] + cs['misses']}) · "
+                       f"{cs['evictions']} EVICTED · {cs['expired']} EXPIRED")
+            ws = get_results_writer().stats()
+            st.caption(f"RESULTS: {', '.join(f'{k.upper()} {n}' for k, n in ws['written'].items())} WRITTEN · "
+                       f"{ws['queued']} QUEUED · {ws['dropped']} DROPPED · {sum(ws['errors'].values())} ERRORS")
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import numpy as np
+
+from fleet import fleet_arrays
+from mission import compute_fleet_missions
+
+# --- Phase Codes ---
+PHASE_NO_FLY = 0
+PHASE_OUTBOUND = 1
+PHASE_ON_SCENE = 2
+PHASE_RTB = 3
+PHASE_RECHARGING = 4
+PHASE_SWAPPING = 5
+
+PHASE_LABELS = {
+    PHASE_OUTBOUND: "OUTBOUND",
+    PHASE_ON_SCENE: "ON SCENE",
+    PHASE_RTB: "RTB",
+    PHASE_RECHARGING: "RECHARGING",
+    PHASE_SWAPPING: "SWAPPING BATT",
+}
+ACTIVE_PHASES = (PHASE_OUTBOUND, PHASE_ON_SCENE, PHASE_RTB)
+
+DEFAULT_TICKS = 101
+
+# --- Mission Timeline ---
+def mission_column(missions, col=0):
+    return {
+        't_out': missions['t_out'][:, col],
+        't_back': missions['t_back'][:, col],
+        't_hov': missions['t_hov'][:, col],
+        't_total': missions['t_total'][:, col],
+        'batt_cap': missions['batt_cap'][:, col],
+        'possible': missions['possible'][:, col],
+        'turnaround_min': missions['turnaround_min'][:, col],
+        'fail_fuel': missions['fail_fuel'][:, col],
+        'fail_wind': missions['fail_wind'][:, col],
+    }
+
+def sim_duration(mission):
+    t_total = mission['t_total'][mission['possible']]
+    return float(t_total.max()) if len(t_total) else 5.0
+
+def build_frames(mission, battery_swap, sim_dur=None, n_ticks=DEFAULT_TICKS):
+    if sim_dur is None:
+        sim_dur = sim_duration(mission)
+
+    curr = (np.arange(n_ticks) / (n_ticks - 1) * sim_dur)[:, None]
+    t_out = mission['t_out'][None, :]
+    t_back = mission['t_back'][None, :]
+    t_hov = mission['t_hov'][None, :]
+    t_total = mission['t_total'][None, :]
+    possible = mission['possible'][None, :]
+
+    outbound = curr < t_out
+    on_scene = ~outbound & (curr < t_out + t_hov)
+    rtb = ~outbound & ~on_scene & (curr < t_total)
+    done = ~(outbound | on_scene | rtb)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        progress = np.select(
+            [outbound, on_scene, rtb],
+            [curr / t_out, 1.0, 1.0 - ((curr - t_out - t_hov) / t_back)],
+            0.0
+        )
+    progress = np.where(possible, np.clip(np.nan_to_num(progress), 0.0, 1.0), 0.0)
+
+    site_time = np.select([outbound, on_scene], [0.0, curr - t_out], t_hov)
+
+    used = (np.minimum(curr, t_out)
+            + np.maximum(0, np.minimum(curr - t_out, t_hov))
+            + np.maximum(0, np.minimum(curr - (t_out + t_hov), t_back)))
+    battery_pct = np.maximum(0, 100 - (used / mission['batt_cap'][None, :] * 100))
+
+    # Legs the wind makes unflyable carry infinite times; they are never done.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mission_progress = np.where(t_total > 0, used / t_total, 0.0)
+        recharge_min = np.where(done, mission['turnaround_min'][None, :] * mission_progress, 0.0)
+
+    recharge_phase = np.where(np.asarray(battery_swap)[None, :], PHASE_SWAPPING, PHASE_RECHARGING)
+    phase = np.select([outbound, on_scene, rtb], [PHASE_OUTBOUND, PHASE_ON_SCENE, PHASE_RTB], recharge_phase)
+    phase = np.where(possible, phase, PHASE_NO_FLY).astype(np.uint8)
+
+    return {
+        'curr_time': curr[:, 0],
+        'phase': phase,
+        'progress': progress.astype(np.float32),
+        'eta': np.minimum(curr, t_out),
+        'site_time': site_time,
+        'battery_pct': battery_pct,
+        'recharge_min': recharge_min,
+    }
+
+# --- Incident Log ---
+def fastest_t_out(mission):
+    t_out = mission['t_out'][mission['possible']]
+    return float(t_out.min()) if len(t_out) else 0.0
+
+def log_events(curr_time, mission, t_call, t_launch, t_officers):
+    events = [(t_call, 'call'), (t_launch, 'launch')]
+
+    fastest = fastest_t_out(mission)
+    if curr_time >= fastest and mission['possible'].any():
+        events.append((t_launch + timedelta(seconds=fastest), 'drone_on_scene'))
+
+    if curr_time >= (t_officers - t_launch).total_seconds():
+        events.append((t_officers, 'officers_arrive'))
+
+    events.sort(key=lambda x: x[0])
+    return events
+
+# --- Batch Entry Point ---
+def simulate(fleet, base, target, n_ticks=DEFAULT_TICKS):
+    fleet = fleet_arrays(fleet)
+    mission = mission_column(compute_fleet_missions(fleet, base, [target]))
+    return mission, build_frames(mission, fleet['battery_swap'], n_ticks=n_ticks)
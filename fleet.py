@@ -0,0 +1,118 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# --- Fleet Catalog ---
+# drones.csv is the single source of truth for every airframe number used by
+# the app: performance, recharge time and whether the dock swaps batteries
+# instead of recharging. It is parsed and validated once per file version
+# (keyed on mtime), so edits on disk are picked up on the next rerun.
+FLEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'drones.csv')
+
+NUMERIC_COLUMNS = ('flight_time_min', 'speed_mph', 'range_miles', 'max_wind_mph', 'recharge_min')
+POSITIVE_COLUMNS = ('flight_time_min', 'speed_mph', 'range_miles')
+REQUIRED_COLUMNS = ('model',) + NUMERIC_COLUMNS + ('battery_swap',)
+
+TRUE_VALUES = {'true', 'yes', 'y', '1'}
+FALSE_VALUES = {'false', 'no', 'n', '0', ''}
+
+class FleetCatalogError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class FleetCatalog:
+    path: str
+    mtime_ns: int
+    df: pd.DataFrame
+    arrays: dict
+    spec_hash: str
+
+    @property
+    def models(self):
+        return self.arrays['model']
+
+    def __len__(self):
+        return len(self.arrays['model'])
+
+def _parse_bool(series, errors):
+    values = series.fillna('').astype(str).str.strip().str.lower()
+    bad = ~values.isin(TRUE_VALUES | FALSE_VALUES)
+    if bad.any():
+        errors.append(f"battery_swap must be true/false (rows {_rows(bad)})")
+    return values.isin(TRUE_VALUES).to_numpy()
+
+def _rows(mask):
+    # +2: one for the header line, one because CSV rows are 1-based
+    idx = [str(i + 2) for i in np.flatnonzero(np.asarray(mask))[:5]]
+    return ", ".join(idx) + (" ..." if np.asarray(mask).sum() > 5 else "")
+
+def validate_fleet(df):
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    df = df.dropna(how='all').reset_index(drop=True)
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise FleetCatalogError(f"drones.csv is missing column(s): {', '.join(missing)}")
+
+    errors = []
+    models = df['model'].astype(str).str.strip()
+    blank = df['model'].isna() | (models == '')
+    if blank.any():
+        errors.append(f"model is blank (rows {_rows(blank)})")
+    dupes = models.duplicated() & ~blank
+    if dupes.any():
+        errors.append(f"duplicate model names: {', '.join(sorted(set(models[dupes])))}")
+
+    arrays = {'model': models.to_numpy(dtype=object)}
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors='coerce')
+        if values.isna().any():
+            errors.append(f"{col} must be numeric (rows {_rows(values.isna())})")
+        elif col in POSITIVE_COLUMNS and (values <= 0).any():
+            errors.append(f"{col} must be > 0 (rows {_rows(values <= 0)})")
+        elif (values < 0).any():
+            errors.append(f"{col} must be >= 0 (rows {_rows(values < 0)})")
+        arrays[col] = values.to_numpy(dtype=float)
+    arrays['battery_swap'] = _parse_bool(df['battery_swap'], errors)
+
+    if errors:
+        raise FleetCatalogError("drones.csv: " + "; ".join(errors))
+
+    clean = pd.DataFrame({key: arrays[key] for key in REQUIRED_COLUMNS})
+    return clean, arrays
+
+def fleet_spec_hash(fleet):
+    h = hashlib.sha1()
+    for key in sorted(fleet):
+        arr = np.asarray(fleet[key])
+        h.update(key.encode())
+        h.update(arr.astype(str).tobytes() if arr.dtype.kind in 'OUS' else np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:16]
+
+def fleet_arrays(fleet):
+    if isinstance(fleet, FleetCatalog):
+        return fleet.arrays
+    if isinstance(fleet, dict):
+        return fleet
+    return validate_fleet(fleet)[1]
+
+@lru_cache(maxsize=8)
+def _load_fleet(path, mtime_ns):
+    try:
+        raw = pd.read_csv(path)
+    except (OSError, pd.errors.ParserError, pd.errors.EmptyDataError) as exc:
+        raise FleetCatalogError(f"could not read {os.path.basename(path)}: {exc}") from exc
+    df, arrays = validate_fleet(raw)
+    return FleetCatalog(path, mtime_ns, df, arrays, fleet_spec_hash(arrays))
+
+def load_fleet(path=FLEET_PATH):
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError as exc:
+        raise FleetCatalogError(f"could not read {os.path.basename(path)}: {exc}") from exc
+    return _load_fleet(os.path.abspath(path), mtime_ns)
@@ -0,0 +1,105 @@
+import folium
+from folium import plugins
+from folium.features import DivIcon
+
+from spatial import miles_to_degrees
+from coverage_map import best_time_to_target, heatmap_rgba
+from tiles import tile_layer
+
+# --- Map Layers ---
+# The map is split in two: a static layer (tiles, base, rings, coverage) that
+# only changes when the base or coverage selection changes, and a dynamic
+# FeatureGroup (squad cars, target, paths, drone marker) that st_folium pushes
+# into the already-loaded Leaflet map without reloading it. Tiles come from
+# a local tiles.py server instead of CartoDB when DRONE_SIM_TILE_SERVER is set.
+TILES = "CartoDB dark_matter"
+RINGS = [2, 4, 6, 8]
+METERS_PER_MILE = 1609.34
+
+def build_static_map(center, zoom, base=None, coverage=None):
+    tiles, attr = tile_layer(TILES)
+    m = folium.Map(location=center, zoom_start=zoom, tiles=tiles, attr=attr)
+
+    m.get_root().header.add_child(folium.Element("""
+        <style>
+        .leaflet-tile-pane {
+            filter: brightness(1.6) contrast(1.2);
+        }
+        </style>
+    """))
+
+    if base:
+        base_html = """<div style="color: #00D2FF; font-size: 24px; text-shadow: 0 0 5px #000;"><i class="fa fa-home"></i></div>"""
+        folium.Marker(base, icon=DivIcon(html=base_html, icon_anchor=(10,10))).add_to(m)
+
+        if coverage is not None:
+            add_coverage_layer(m, base, *coverage)
+
+        for r in RINGS:
+            folium.Circle(location=base, radius=r * METERS_PER_MILE, color='#00D2FF', weight=1, fill=False, opacity=0.5, dash_array='4, 8').add_to(m)
+            lat_offset = (r / 69.0)
+            folium.map.Marker([base[0] + lat_offset, base[1]], icon=DivIcon(icon_size=(100,20), icon_anchor=(50,10), html=f'<div style="font-family: \'Manrope\', sans-serif; font-size:10px; font-weight:600; color:#00D2FF; text-shadow: 0 0 5px #000;">{r} MI</div>')).add_to(m)
+
+    return m
+
+def add_coverage_layer(m, base, grid, model_mask):
+    folium.raster_layers.ImageOverlay(heatmap_rgba(best_time_to_target(grid, model_mask)), bounds=grid['bounds'], pixelated=False).add_to(m)
+
+    for model, r in zip(grid['model'][model_mask], grid['max_radius'][model_mask]):
+        folium.Circle(location=base, radius=float(r) * METERS_PER_MILE, color='#FFC300', weight=1, fill=False, opacity=0.7).add_to(m)
+        folium.map.Marker([base[0] - float(miles_to_degrees(base[0], r)[0]), base[1]], icon=DivIcon(icon_size=(160,20), icon_anchor=(80,10), html=f'<div style="font-family: \'Manrope\', sans-serif; font-size:10px; font-weight:600; color:#FFC300; text-shadow: 0 0 5px #000; text-align:center;">{model} {r:.1f} MI</div>')).add_to(m)
+
+def build_dynamic_layer(base, squad_cars, target=None, best_officer_sq=None, is_responding=False, drone_track=None, proposed_sites=None,
+                        docks=None, launch=None):
+    fg = folium.FeatureGroup(name="dynamic")
+    launch = launch or base
+
+    if proposed_sites is not None:
+        add_proposed_sites(fg, proposed_sites)
+
+    if docks and len(docks) > 1:
+        add_docks(fg, docks, launch if is_responding else None)
+
+    if base:
+        for sq in squad_cars:
+            if is_responding:
+                car_color = "#FF0000" if sq == best_officer_sq else "#00D2FF"
+            else:
+                car_color = "#00D2FF"
+            car_html = f"""<div style="color: {car_color}; font-size: 18px; text-shadow: 0 0 5px #000;"><i class="fa fa-car"></i></div>"""
+            folium.Marker(sq, icon=DivIcon(html=car_html)).add_to(fg)
+
+    if target and is_responding:
+        target_html = """<div style="color: #FF0000; font-size: 24px; text-shadow: 0 0 5px #000;"><i class="fa fa-crosshairs"></i></div>"""
+        folium.Marker(target, icon=DivIcon(html=target_html, icon_anchor=(10,10))).add_to(fg)
+
+        plugins.AntPath(locations=[launch, target], color="#00D2FF", pulse_color="#ffffff", weight=3, delay=800, dash_array=[10, 20]).add_to(fg)
+
+        if best_officer_sq:
+            plugins.AntPath(locations=[best_officer_sq, target], color="#FF0000", pulse_color="#ffffff", weight=3, delay=400, dash_array=[15, 30]).add_to(fg)
+
+        if drone_track is not None:
+            drone_track.add_to(fg)
+
+    return fg
+
+def add_proposed_sites(fg, proposed):
+    # siting.optimize_sites output: dock markers with the fleet's longest reach
+    for i, (site, share) in enumerate(zip(proposed['sites'], proposed['share'])):
+        site = [float(site[0]), float(site[1])]
+        folium.Circle(location=site, radius=proposed['max_radius'] * METERS_PER_MILE, color='#39FF14', weight=1, fill=True, fill_opacity=0.05, opacity=0.6).add_to(fg)
+        dock_html = f"""<div style="color: #39FF14; font-size: 20px; text-shadow: 0 0 5px #000;"><i class="fa fa-home"></i></div>"""
+        folium.Marker(site, icon=DivIcon(html=dock_html, icon_anchor=(9,9)), tooltip=f"DOCK {i + 1}: first on scene for {share:.0%}").add_to(fg)
+        folium.map.Marker([site[0] - float(miles_to_degrees(site[0], 0.4)[0]), site[1]], icon=DivIcon(icon_size=(100,20), icon_anchor=(50,10), html=f'<div style="font-family: \'Manrope\', sans-serif; font-size:10px; font-weight:600; color:#39FF14; text-shadow: 0 0 5px #000; text-align:center;">DOCK {i + 1}</div>')).add_to(fg)
+
+def add_docks(fg, docks, launch=None):
+    # docks[0] is the base, already drawn on the static map; the dock the
+    # drone launched from is drawn white.
+    for i, dock in enumerate(docks):
+        pos = [float(dock['pos'][0]), float(dock['pos'][1])]
+        color = '#ffffff' if launch is not None and list(launch) == list(dock['pos']) else '#00D2FF'
+        stock = 'ALL MODELS' if dock['models'] is None else ', '.join(dock['models']) or 'EMPTY'
+        if i:
+            dock_html = f"""<div style="color: {color}; font-size: 20px; text-shadow: 0 0 5px #000;"><i class="fa fa-home"></i></div>"""
+            folium.Marker(pos, icon=DivIcon(html=dock_html, icon_anchor=(9,9)), tooltip=f"DOCK {i + 1}: {stock}").add_to(fg)
+        folium.map.Marker([pos[0] - float(miles_to_degrees(pos[0], 0.3)[0]), pos[1]], icon=DivIcon(icon_size=(100,20), icon_anchor=(50,10), html=f'<div style="font-family: \'Manrope\', sans-serif; font-size:10px; font-weight:600; color:{color}; text-shadow: 0 0 5px #000; text-align:center;">DOCK {i + 1}</div>')).add_to(fg)
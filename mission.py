@@ -0,0 +1,80 @@
+import numpy as np
+
+from fleet import fleet_arrays
+from spatial import bearing_deg, distance_miles
+
+# --- Mission Model Constants ---
+RESERVE_SEC = 5 * 60
+
+# --- Wind ---
+# Wind is (speed_mph, from_deg): the compass direction it blows FROM. The
+# drone crabs into the crosswind to hold its track, so ground speed along the
+# leg is sqrt(airspeed^2 - crosswind^2) + tailwind; a crosswind at or above
+# airspeed (or a headwind that cancels it) leaves the leg unflyable.
+def ground_speed_mph(airspeed_mph, track_deg, wind_mph, wind_from_deg):
+    rel = np.radians(np.asarray(wind_from_deg) + 180.0 - np.asarray(track_deg))
+    tail = wind_mph * np.cos(rel)
+    cross = wind_mph * np.sin(rel)
+    still = airspeed_mph ** 2 - cross ** 2
+    return np.where(still > 0, np.sqrt(np.maximum(still, 0.0)) + tail, 0.0)
+
+# --- Vectorized Mission Kernel ---
+# Every output is shaped (fleet, targets); row i is the i-th model of the fleet
+# table and column j the j-th target, so a single target is just column 0.
+# wind is None (still air) or (speed_mph, from_deg), each a scalar or one
+# value per target, so a sweep of wind conditions is just more columns.
+# base may also be a (bases, 2) array of docks: the outputs then gain a
+# leading bases axis, (bases, fleet, targets), and 'dist' is (bases, targets).
+def compute_fleet_missions(fleet, base, targets, wind=None):
+    fleet = fleet_arrays(fleet)
+    if np.ndim(base) == 2:
+        base = np.asarray(base, dtype=float)
+        base = (base[:, 0, None], base[:, 1, None])
+
+    dist = distance_miles(base, targets)
+    batt_sec = fleet['flight_time_min'][:, None] * 60
+    airspeed = fleet['speed_mph'][:, None]
+    d = dist[..., None, :]
+
+    if wind is None:
+        t_out = d / (airspeed / 3600)
+        t_back = t_out
+        fail_wind = np.zeros(t_out.shape, dtype=bool)
+    else:
+        wind_mph, wind_from = (np.broadcast_to(np.asarray(v, dtype=float), dist.shape)[..., None, :] for v in wind)
+        track = bearing_deg(base, targets)[..., None, :]
+        gs_out = ground_speed_mph(airspeed, track, wind_mph, wind_from)
+        gs_back = ground_speed_mph(airspeed, (track + 180) % 360, wind_mph, wind_from)
+        fail_wind = (wind_mph > fleet['max_wind_mph'][:, None]) | (gs_out <= 0) | (gs_back <= 0)
+        with np.errstate(divide='ignore'):
+            t_out = np.where(gs_out > 0, d / (np.maximum(gs_out, 1e-9) / 3600), np.inf)
+            t_back = np.where(gs_back > 0, d / (np.maximum(gs_back, 1e-9) / 3600), np.inf)
+
+    hover_sec = (batt_sec - RESERVE_SEC) - (t_out + t_back)
+    possible = (hover_sec >= 0) & (d <= fleet['range_miles'][:, None]) & ~fail_wind
+
+    t_hov = np.where(possible, hover_sec, 0.0)
+    t_total = (t_out + t_back) + t_hov
+    batt_used_pct = t_total / batt_sec
+
+    # Swap docks turn around in a flat recharge_min; chargers scale it by the
+    # share of the battery used.
+    turnaround_min = np.where(
+        fleet['battery_swap'][:, None],
+        fleet['recharge_min'][:, None],
+        fleet['recharge_min'][:, None] * batt_used_pct
+    )
+
+    return {
+        'dist': dist,
+        't_out': t_out,
+        't_back': t_back,
+        'hover_sec': hover_sec,
+        't_hov': t_hov,
+        't_total': t_total,
+        'batt_cap': np.broadcast_to(batt_sec, t_out.shape),
+        'possible': possible,
+        'turnaround_min': turnaround_min,
+        'fail_fuel': hover_sec < 0,
+        'fail_wind': fail_wind,
+    }
@@ -0,0 +1,158 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fleet import FLEET_PATH, fleet_arrays, load_fleet
+from mission import compute_fleet_missions
+from zipindex import lookup_zip
+from scenario import (INCIDENT_RADIUS_MI, OFFICER_DISPATCH_SEC, SEVERITIES, incident_severity_codes,
+                      nearest_patrol_miles, officer_travel_sec, sample_incidents, sample_patrols)
+
+# --- Monte Carlo Settings ---
+# Results are accumulated into fixed 1-second histograms so chunks merge by
+# addition: memory stays flat and the output only depends on the seed and
+# chunk size, never on how many worker processes ran the chunks.
+DEFAULT_CHUNK = 25_000
+ARRIVAL_BINS = np.arange(0, 2 * 3600 + 1, 1.0)
+SAVED_BINS = np.arange(-2 * 3600, 2 * 3600 + 1, 1.0)
+
+def _hist(values, bins):
+    return np.histogram(np.clip(values, bins[0], bins[-1] - 1e-9), bins=bins)[0].astype(np.int64)
+
+def run_chunk(task):
+    seed, fleet, base, n, radius_miles = task
+    rng = np.random.default_rng(seed)
+
+    incidents = sample_incidents(rng, base, n, radius_miles)
+    patrols = sample_patrols(rng, base, n)
+    severity = incident_severity_codes()[incidents['incident']]
+    officer_miles = nearest_patrol_miles(patrols, incidents['lat'], incidents['lon'])
+    return score_incidents(fleet, base, incidents['lat'], incidents['lon'], incidents['launch_delay'], officer_miles, severity)
+
+# Shared with replay.py: histograms for one batch of incidents. Severity codes
+# index SEVERITIES; anything else (e.g. -1) only counts toward the totals. With
+# hour-of-day codes (-1 for unknown) calls and coverage are also counted by hour.
+def score_incidents(fleet, base, lat, lon, launch_delay, officer_miles, severity, hour=None):
+    targets = np.column_stack([lat, lon])
+    missions = compute_fleet_missions(fleet, base, targets)
+    model_arrival = launch_delay[None, :] + np.where(missions['possible'], missions['t_out'], np.inf)
+    drone_arrival = model_arrival.min(axis=0)
+    covered = np.isfinite(drone_arrival)
+
+    officer_arrival = OFFICER_DISPATCH_SEC + officer_travel_sec(officer_miles)
+    saved = officer_arrival - drone_arrival
+
+    part = {
+        'n': len(lat),
+        'uncovered': int((~covered).sum()),
+        'drone_hist': _hist(drone_arrival[covered], ARRIVAL_BINS),
+        'officer_hist': _hist(officer_arrival, ARRIVAL_BINS),
+        'saved_hist': _hist(saved[covered], SAVED_BINS),
+        'saved_by_severity': np.stack([_hist(saved[covered & (severity == s)], SAVED_BINS) for s in range(len(SEVERITIES))]),
+        'model_hist': np.stack([_hist(row[np.isfinite(row)], ARRIVAL_BINS) for row in model_arrival]),
+        'model_infeasible': (~missions['possible']).sum(axis=1),
+    }
+    if hour is not None:
+        known = hour >= 0
+        part['hour_calls'] = np.bincount(hour[known], minlength=24)
+        part['hour_covered'] = np.bincount(hour[known & covered], minlength=24)
+    return part
+
+def merge_histograms(total, part):
+    if total is None:
+        return {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in part.items()}
+    for key, val in part.items():
+        total[key] = total[key] + val
+    return total
+
+def hist_percentile(hist, bins, q):
+    total = hist.sum()
+    if total == 0:
+        return float('nan')
+    idx = np.searchsorted(np.cumsum(hist), q * total)
+    return float(bins[min(idx, len(bins) - 2)] + 0.5)
+
+def summarize(hist, bins):
+    return {'p50': hist_percentile(hist, bins, 0.5), 'p90': hist_percentile(hist, bins, 0.9), 'n': int(hist.sum())}
+
+# --- Runner ---
+def run_monte_carlo(fleet, base, samples, seed=0, workers=None, chunk_size=DEFAULT_CHUNK, radius_miles=INCIDENT_RADIUS_MI):
+    fleet = fleet_arrays(fleet)
+
+    sizes = [chunk_size] * (samples // chunk_size)
+    if samples % chunk_size:
+        sizes.append(samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, fleet, tuple(base), n, radius_miles) for s, n in zip(seeds, sizes)]
+
+    workers = workers or os.cpu_count() or 1
+    total = None
+    if workers == 1:
+        for task in tasks:
+            total = merge_histograms(total, run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(run_chunk, tasks):
+                total = merge_histograms(total, part)
+
+    return {
+        'samples': samples,
+        'seed': seed,
+        'fraction_uncovered': total['uncovered'] / samples,
+        'drone_arrival': summarize(total['drone_hist'], ARRIVAL_BINS),
+        'officer_arrival': summarize(total['officer_hist'], ARRIVAL_BINS),
+        'time_saved': summarize(total['saved_hist'], SAVED_BINS),
+        'time_saved_by_severity': {sev: summarize(total['saved_by_severity'][i], SAVED_BINS) for i, sev in enumerate(SEVERITIES)},
+        'models': {
+            str(model): dict(summarize(total['model_hist'][i], ARRIVAL_BINS), fraction_infeasible=float(total['model_infeasible'][i] / samples))
+            for i, model in enumerate(fleet['model'])
+        },
+    }
+
+# --- CLI ---
+def resolve_base(args):
+    if args.base:
+        return [float(v) for v in args.base.split(',')]
+    coords = lookup_zip(args.zip)
+    if coords is None:
+        raise SystemExit(f"Unknown ZIP: {args.zip}")
+    return coords
+
+def format_clock(sec):
+    if not np.isfinite(sec):
+        return "--:--"
+    sign = "-" if sec < 0 else ""
+    sec = abs(sec)
+    return f"{sign}{int(sec // 60):02d}:{int(sec % 60):02d}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo drone-vs-officer arrival statistics")
+    parser.add_argument('zip', nargs='?', help="5-digit ZIP for the drone base")
+    parser.add_argument('--base', help="LAT,LON for the drone base (overrides ZIP)")
+    parser.add_argument('--samples', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK)
+    parser.add_argument('--radius', type=float, default=INCIDENT_RADIUS_MI, help="incident radius around the base (miles)")
+    parser.add_argument('--fleet', default=FLEET_PATH)
+    args = parser.parse_args(argv)
+    if not args.zip and not args.base:
+        parser.error("give a ZIP or --base LAT,LON")
+
+    start = time.perf_counter()
+    res = run_monte_carlo(load_fleet(args.fleet), resolve_base(args), args.samples, args.seed, args.workers, args.chunk, args.radius)
+    elapsed = time.perf_counter() - start
+
+    print(f"{res['samples']:,} incidents  seed={res['seed']}  {elapsed:.2f}s")
+    for key in ('drone_arrival', 'officer_arrival', 'time_saved'):
+        print(f"  {key.upper():<18} p50 {format_clock(res[key]['p50'])}  p90 {format_clock(res[key]['p90'])}")
+    print(f"  NO DRONE COVERAGE  {res['fraction_uncovered']:.1%}")
+    # per-model times are conditional on that model being able to fly the call
+    for model, stats in res['models'].items():
+        print(f"  {model:<18} p50 {format_clock(stats['p50'])}  p90 {format_clock(stats['p90'])}  infeasible {stats['fraction_infeasible']:.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+import streamlit.components.v1 as components
+from branca.element import MacroElement
+from jinja2 import Template
+
+from engine import fastest_t_out, log_events
+
+COMPONENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components', 'playback.html')
+
+LOG_HEIGHT = 150
+DRONE_HEIGHT = 112
+MAX_HEIGHT = 900
+
+# --- Keyframe Payload ---
+# Everything the browser needs to animate the whole playback, computed once.
+# Times are shipped as whole seconds so the client's mm:ss formatting matches
+# the server-side int() truncation exactly. Per-drone fields are diff-encoded
+# (see delta_encode), so the payload and the client's per-tick work scale with
+# what changes rather than with fleet size x ticks.
+def delta_encode(arr):
+    arr = np.asarray(arr)
+    tick, drone = np.nonzero(arr[1:] != arr[:-1])
+    pairs = np.empty(2 * len(tick), dtype=object)
+    pairs[0::2] = drone.tolist()
+    pairs[1::2] = arr[tick + 1, drone].tolist()
+    bounds = 2 * np.searchsorted(tick, np.arange(len(arr)))
+    pairs = pairs.tolist()
+    return {'init': arr[0].tolist(), 'delta': [pairs[a:b] for a, b in zip(bounds[:-1], bounds[1:])]}
+
+def playback_payload(models, mission, frames, log_labels, t_call, t_launch, t_officers, duration_sec, start_at_end=False):
+    sim_end = float(frames['curr_time'][-1])
+    events = log_events(sim_end, mission, t_call, t_launch, t_officers)
+    reveal = {
+        'call': 0.0,
+        'launch': 0.0,
+        'drone_on_scene': fastest_t_out(mission),
+        'officers_arrive': (t_officers - t_launch).total_seconds(),
+    }
+
+    return {
+        'ticks': len(frames['curr_time']),
+        'duration_ms': int(duration_sec * 1000),
+        'start_at_end': start_at_end,
+        'log': [{'time': dt.strftime("%H:%M:%S"), 'html': log_labels[kind], 'at': reveal[kind]} for dt, kind in events],
+        'drones': [{'model': str(m), 'fail': "WIND" if wind else "FUEL" if fuel else "RANGE"}
+                   for m, fuel, wind in zip(models, mission['fail_fuel'], mission['fail_wind'])],
+        'frames': {
+            'curr_time': np.round(frames['curr_time'], 3).tolist(),
+            'phase': delta_encode(frames['phase']),
+            # float32 frames: round in float64 or tolist() ships 0.10000000149011612
+            'progress': delta_encode(np.round(frames['progress'].astype(float), 3)),
+            'eta': delta_encode(frames['eta'].astype(np.int64)),
+            'site': delta_encode(frames['site_time'].astype(np.int64)),
+            'battery': delta_encode(frames['battery_pct'].astype(np.int64)),
+            'recharge': delta_encode((np.trunc(frames['recharge_min']) * 60 + np.trunc((frames['recharge_min'] * 60) % 60)).astype(np.int64)),
+        },
+    }
+
+@lru_cache(maxsize=1)
+def _component_template():
+    with open(COMPONENT_PATH, encoding='utf-8') as fh:
+        return fh.read()
+
+def render_playback(payload):
+    html = _component_template().replace('__PAYLOAD__', json.dumps(payload, separators=(',', ':')))
+    height = min(LOG_HEIGHT + DRONE_HEIGHT * len(payload['drones']), MAX_HEIGHT)
+    components.html(html, height=height, scrolling=height == MAX_HEIGHT)
+    return len(html)
+
+# --- Map Drone Marker ---
+# Flies a marker base -> target -> base on the same wall-clock schedule as the
+# fleet panel, for the first drone on scene.
+class DroneTrack(MacroElement):
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var layer = {{ this._parent.get_name() }};
+            var base = {{ this.base|tojson }}, target = {{ this.target|tojson }};
+            var t = {{ this.timing|tojson }};
+            var marker = L.marker(base, {icon: L.divIcon({className: '', iconAnchor: [9, 9],
+                html: '<div style="color: #ffffff; font-size: 18px; text-shadow: 0 0 8px #00D2FF;"><i class="fa fa-plane"></i></div>'})}).addTo(layer);
+            function lerp(f) { return [base[0] + (target[0] - base[0]) * f, base[1] + (target[1] - base[1]) * f]; }
+            var start = null;
+            function step(now) {
+                if (start === null) start = now;
+                var sim = Math.min(1, (now - start) / t.duration_ms) * t.sim_dur;
+                var f;
+                if (sim < t.t_out) f = sim / t.t_out;
+                else if (sim < t.t_out + t.t_hov) f = 1;
+                else f = Math.max(0, 1 - (sim - t.t_out - t.t_hov) / t.t_back);
+                marker.setLatLng(lerp(f));
+                if (sim < t.sim_dur) requestAnimationFrame(step);
+            }
+            requestAnimationFrame(step);
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, base, target, mission, sim_dur, duration_sec):
+        super().__init__()
+        self._name = 'DroneTrack'
+        self.base = list(base)
+        self.target = list(target)
+        t_out = np.where(mission['possible'], mission['t_out'], np.inf)
+        lead = int(np.argmin(t_out))
+        self.timing = {
+            't_out': float(mission['t_out'][lead]),
+            't_back': float(mission['t_back'][lead]),
+            't_hov': float(mission['t_hov'][lead]),
+            'sim_dur': float(sim_dur),
+            'duration_ms': int(duration_sec * 1000),
+        }
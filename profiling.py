@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# --- Rerun Profiling ---
+# Optional wall-clock timings for each phase of a script rerun, plus counters
+# for placeholder updates and their payload size. DRONE_SIM_PROFILE=1 profiles
+# every session; DRONE_SIM_PROFILE=debug only the sessions opened with
+# ?debug=1, so a public deployment without the variable ignores the query
+# parameter. Each finished run is appended as one JSON line to
+# DRONE_SIM_PROFILE_LOG, once, with how the run ended ('done', or 'rerun' /
+# 'stop' when the script cut itself short). When off, phase() hands back a
+# shared no-op context manager and nothing else runs.
+PROFILE_ENV = 'DRONE_SIM_PROFILE'
+PROFILE_LOG_ENV = 'DRONE_SIM_PROFILE_LOG'
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'profile.jsonl')
+
+_NOOP = nullcontext()
+_log_lock = threading.Lock()
+
+def profiling_enabled(debug_requested=False):
+    mode = os.environ.get(PROFILE_ENV, '').strip().lower()
+    return mode in ('1', 'true', 'yes', 'on') or (debug_requested and mode == 'debug')
+
+class RunProfile:
+    def __init__(self, session_id, run_no):
+        self.session_id = session_id
+        self.run_no = run_no
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self.counters = {}
+        self.finished = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def count(self, name, n=1, nbytes=0):
+        c = self.counters.setdefault(name, {'n': 0, 'bytes': 0})
+        c['n'] += n
+        c['bytes'] += nbytes
+
+    def record(self, end='done'):
+        return {
+            'ts': round(self.started, 3),
+            'session': self.session_id,
+            'run': self.run_no,
+            'end': end,
+            'total_ms': round((time.perf_counter() - self.t0) * 1000, 3),
+            'phases': [{'name': name, 'ms': round(ms, 3)} for name, ms in self.phases],
+            'counters': self.counters,
+        }
+
+def start_run(session_id, run_no, enabled=None):
+    if enabled is None:
+        enabled = profiling_enabled()
+    return RunProfile(session_id, run_no) if enabled else None
+
+def phase(profile, name):
+    return _NOOP if profile is None else profile.phase(name)
+
+def count(profile, name, n=1, nbytes=0):
+    if profile is not None:
+        profile.count(name, n, nbytes)
+
+def finish_run(profile, path=None, end='done'):
+    if profile is None:
+        return None
+    if profile.finished is not None:
+        return profile.finished
+    rec = profile.finished = profile.record(end)
+    path = path or os.environ.get(PROFILE_LOG_ENV) or DEFAULT_LOG_PATH
+    line = json.dumps(rec, separators=(',', ':')) + '\n'
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as fh:
+                fh.write(line)
+    except OSError:
+        pass
+    return rec
@@ -0,0 +1,278 @@
+import argparse
+import os
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fleet import FLEET_PATH, fleet_arrays, load_fleet
+from montecarlo import (ARRIVAL_BINS, SAVED_BINS, format_clock, merge_histograms, nearest_patrol_miles, resolve_base,
+                        sample_patrols, score_incidents, summarize)
+from scenario import INCIDENTS, LAUNCH_DELAY_SEC, SEVERITIES
+from spatial import haversine_miles
+
+# --- CAD Replay ---
+# Streams a computer-aided-dispatch export (CSV or Parquet) through the same
+# mission and officer models as the Monte Carlo runner, a chunk at a time, so
+# memory stays flat however many years of calls the file holds. Exports don't
+# record where patrol cars were or how long launch took, so those are sampled
+# per chunk from a seed derived from the chunk number: a rerun reproduces the
+# same numbers.
+DEFAULT_CHUNK = 100_000
+
+LAT_COLUMNS = ('lat', 'latitude', 'y')
+LON_COLUMNS = ('lon', 'lng', 'long', 'longitude', 'x')
+TYPE_COLUMNS = ('call_type', 'calltype', 'type', 'nature', 'incident_type', 'problem', 'description')
+TIME_COLUMNS = ('timestamp', 'call_time', 'received', 'datetime', 'created', 'time', 'date')
+
+# Call types are matched on their upper-cased text: exact incident names from
+# the simulator first, then these keywords in order. Anything else is
+# "unmapped" and only counts toward the overall totals.
+SEVERITY_KEYWORDS = [
+    (r'SHOT|SHOOT|GUN|ARMED|ROBBER|HOLDUP|STAB|HOSTAGE|HOMICIDE|OFFICER (IN DISTRESS|DOWN|NEEDS)|10-?33', 'critical'),
+    (r'BURGL|B&E|BREAK(ING)? IN|PURSUIT|CHASE|CARJACK|ASSAULT|FIGHT|DOMESTIC|PROWLER|IN PROGRESS|STOLEN VEH', 'action'),
+    (r'MISSING|SUSPICIOUS|SUSP |WELFARE|ALARM|NOISE|DISTURB|TRESPASS|FOLLOW ?UP|INFO', 'info'),
+]
+
+def severity_mapper(overrides=None):
+    exact = {name: SEVERITIES.index(sev) for name, sev in INCIDENTS}
+    exact.update({k.strip().upper(): SEVERITIES.index(v) for k, v in (overrides or {}).items()})
+    patterns = [(re.compile(rx), SEVERITIES.index(sev)) for rx, sev in SEVERITY_KEYWORDS]
+    cache = {}
+
+    def lookup(call_type):
+        if call_type not in cache:
+            cache[call_type] = exact.get(call_type, next((code for rx, code in patterns if rx.search(call_type)), -1))
+        return cache[call_type]
+    return lookup
+
+def load_type_map(path):
+    df = pd.read_csv(path, dtype=str)
+    df.columns = df.columns.str.strip().str.lower()
+    bad = set(df['severity'].str.strip().str.lower()) - set(SEVERITIES)
+    if bad:
+        raise SystemExit(f"Unknown severities in {path}: {', '.join(sorted(bad))} (use {', '.join(SEVERITIES)})")
+    return dict(zip(df['call_type'], df['severity'].str.strip().str.lower()))
+
+# --- Reading ---
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+def _parquet_file(path):
+    # pyarrow is only needed for Parquet exports, so it isn't a hard requirement
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Reading Parquet needs pyarrow: pip install pyarrow")
+    return pq.ParquetFile(path)
+
+def source_columns(path):
+    if _is_parquet(path):
+        return list(_parquet_file(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def pick_columns(available, lat=None, lon=None, call_type=None, when=None):
+    lower = {c.strip().lower(): c for c in available}
+
+    def find(given, names, required):
+        if given:
+            if given not in available:
+                raise SystemExit(f"Column not found: {given}")
+            return given
+        col = next((lower[n] for n in names if n in lower), None)
+        if col is None and required:
+            raise SystemExit(f"No column like {'/'.join(names)}; pass it explicitly")
+        return col
+
+    return {
+        'lat': find(lat, LAT_COLUMNS, True),
+        'lon': find(lon, LON_COLUMNS, True),
+        'type': find(call_type, TYPE_COLUMNS, False),
+        'time': find(when, TIME_COLUMNS, False),
+    }
+
+def iter_chunks(path, columns, chunk_size=DEFAULT_CHUNK):
+    wanted = [c for c in columns.values() if c]
+    if _is_parquet(path):
+        for batch in _parquet_file(path).iter_batches(batch_size=chunk_size, columns=wanted):
+            yield batch.to_pandas()
+    else:
+        text = {c: str for c in (columns['type'], columns['time']) if c}
+        yield from pd.read_csv(path, usecols=wanted, dtype=text, chunksize=chunk_size)
+
+def prepare_chunk(df, columns, severity_of, time_format=None, base=None, radius_miles=None):
+    # DataFrame -> plain arrays for score_chunk; rows without a usable
+    # location, or farther than radius_miles from the base, are dropped here
+    # and counted, so every tally below covers exactly the rows scored.
+    lat = pd.to_numeric(df[columns['lat']], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(df[columns['lon']], errors='coerce').to_numpy(dtype=float)
+    keep = np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180) & ((lat != 0) | (lon != 0))
+    dropped = int((~keep).sum())
+    outside = 0
+    if radius_miles:
+        with np.errstate(invalid='ignore'):
+            near = haversine_miles(base[0], base[1], lat, lon) <= radius_miles
+        outside = int((keep & ~near).sum())
+        keep &= near
+
+    unmapped = Counter()
+    if columns['type']:
+        codes, uniques = pd.factorize(df[columns['type']].fillna('').astype(str).str.strip().str.upper())
+        sev = np.array([severity_of(u) for u in uniques] + [-1], dtype=np.int64)
+        severity = sev[codes]
+        kept = codes[keep]
+        for u, n in zip(uniques, np.bincount(kept[kept >= 0], minlength=len(uniques))):
+            if severity_of(u) < 0 and n:
+                unmapped[u] += int(n)
+    else:
+        severity = np.full(len(df), -1, dtype=np.int64)
+
+    hour = np.full(len(df), -1, dtype=np.int64)
+    span = None
+    if columns['time']:
+        when = pd.to_datetime(df[columns['time']], errors='coerce', format=time_format)
+        valid = when.notna().to_numpy()
+        hour[valid] = when.dt.hour.to_numpy()[valid]
+        if valid.any():
+            span = (when.min(), when.max())
+
+    return {
+        'lat': lat[keep], 'lon': lon[keep], 'severity': severity[keep], 'hour': hour[keep],
+        'dropped': dropped, 'outside': outside, 'unmapped': unmapped, 'span': span,
+    }
+
+# --- Scoring ---
+def score_chunk(task):
+    seed, fleet, base, chunk = task
+    rng = np.random.default_rng(seed)
+    lat, lon, severity, hour = chunk['lat'], chunk['lon'], chunk['severity'], chunk['hour']
+
+    n = len(lat)
+    launch_delay = rng.uniform(LAUNCH_DELAY_SEC[0], LAUNCH_DELAY_SEC[1], n)
+    officer_miles = nearest_patrol_miles(sample_patrols(rng, base, n), lat, lon)
+    part = score_incidents(fleet, base, lat, lon, launch_delay, officer_miles, severity, hour)
+    part['severity_calls'] = np.bincount(severity + 1, minlength=len(SEVERITIES) + 1)
+    return part
+
+# --- Runner ---
+# Chunks are read and parsed in this process and scored either inline or in a
+# worker pool; at most `workers` chunks are in flight, so memory is bounded by
+# chunk size whatever the file size.
+def run_replay(path, fleet, base, columns=None, chunk_size=DEFAULT_CHUNK, seed=0, workers=1,
+               radius_miles=None, type_map=None, time_format=None):
+    fleet = fleet_arrays(fleet)
+    base = tuple(base)
+    columns = columns or pick_columns(source_columns(path))
+    severity_of = severity_mapper(type_map)
+
+    total, dropped, outside, unmapped, span = None, 0, 0, Counter(), None
+
+    def absorb(part):
+        nonlocal total
+        total = merge_histograms(total, part)
+
+    def tasks():
+        nonlocal dropped, outside, span
+        for i, df in enumerate(iter_chunks(path, columns, chunk_size)):
+            chunk = prepare_chunk(df, columns, severity_of, time_format, base, radius_miles)
+            dropped += chunk.pop('dropped')
+            outside += chunk.pop('outside')
+            unmapped.update(chunk.pop('unmapped'))
+            first_last = chunk.pop('span')
+            if first_last:
+                span = first_last if span is None else (min(span[0], first_last[0]), max(span[1], first_last[1]))
+            yield ([seed, i], fleet, base, chunk)
+
+    if workers == 1:
+        for task in tasks():
+            absorb(score_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for task in tasks():
+                pending.append(pool.submit(score_chunk, task))
+                if len(pending) >= workers:
+                    absorb(pending.popleft().result())
+            while pending:
+                absorb(pending.popleft().result())
+
+    if total is None:
+        raise SystemExit(f"No rows in {path}")
+    scored = total['n']
+    return {
+        'rows': scored + outside + dropped,
+        'scored': scored,
+        'dropped': dropped,
+        'outside': outside,
+        'span': span,
+        'fraction_uncovered': total['uncovered'] / scored if scored else float('nan'),
+        'drone_arrival': summarize(total['drone_hist'], ARRIVAL_BINS),
+        'officer_arrival': summarize(total['officer_hist'], ARRIVAL_BINS),
+        'time_saved': summarize(total['saved_hist'], SAVED_BINS),
+        'severity': {
+            sev: dict(summarize(total['saved_by_severity'][i], SAVED_BINS), calls=int(total['severity_calls'][i + 1]))
+            for i, sev in enumerate(SEVERITIES)
+        },
+        'unmapped_calls': int(total['severity_calls'][0]),
+        'top_unmapped': unmapped.most_common(10),
+        'hour_calls': total['hour_calls'],
+        'hour_covered': total['hour_covered'],
+        'models': {
+            str(model): dict(summarize(total['model_hist'][i], ARRIVAL_BINS), fraction_infeasible=float(total['model_infeasible'][i] / scored) if scored else float('nan'))
+            for i, model in enumerate(fleet['model'])
+        },
+    }
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a CAD call export through the drone and officer models")
+    parser.add_argument('path', help="CSV or Parquet export with lat/lon (and optionally call type and time) columns")
+    parser.add_argument('zip', nargs='?', help="5-digit ZIP for the drone base")
+    parser.add_argument('--base', help="LAT,LON for the drone base (overrides ZIP)")
+    parser.add_argument('--lat-col')
+    parser.add_argument('--lon-col')
+    parser.add_argument('--type-col')
+    parser.add_argument('--time-col')
+    parser.add_argument('--time-format', help="strftime format of the time column (much faster than inferring)")
+    parser.add_argument('--type-map', help="CSV of call_type,severity overriding the built-in keyword mapping")
+    parser.add_argument('--radius', type=float, help="ignore calls farther than this from the base (miles)")
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--fleet', default=FLEET_PATH)
+    args = parser.parse_args(argv)
+    if not args.zip and not args.base:
+        parser.error("give a ZIP or --base LAT,LON")
+
+    columns = pick_columns(source_columns(args.path), args.lat_col, args.lon_col, args.type_col, args.time_col)
+    type_map = load_type_map(args.type_map) if args.type_map else None
+    start = time.perf_counter()
+    res = run_replay(args.path, load_fleet(args.fleet), resolve_base(args), columns, args.chunk, args.seed,
+                     args.workers, args.radius, type_map, args.time_format)
+    elapsed = time.perf_counter() - start
+
+    print(f"{res['rows']:,} rows  {res['scored']:,} scored  {elapsed:.1f}s ({res['rows'] / max(elapsed, 1e-9):,.0f} rows/s)")
+    if res['span']:
+        print(f"  {res['span'][0]:%Y-%m-%d} .. {res['span'][1]:%Y-%m-%d}")
+    if res['dropped'] or res['outside']:
+        print(f"  skipped {res['dropped']:,} without a location, {res['outside']:,} outside the radius")
+    for key in ('drone_arrival', 'officer_arrival', 'time_saved'):
+        print(f"  {key.upper():<18} p50 {format_clock(res[key]['p50'])}  p90 {format_clock(res[key]['p90'])}")
+    print(f"  NO DRONE COVERAGE  {res['fraction_uncovered']:.1%}")
+    for sev, stats in res['severity'].items():
+        print(f"  SAVED {sev.upper():<12} p50 {format_clock(stats['p50'])}  p90 {format_clock(stats['p90'])}  calls {stats['calls']:,}")
+    if res['unmapped_calls']:
+        top = ', '.join(f"{name or '(blank)'} ({n:,})" for name, n in res['top_unmapped'][:5])
+        print(f"  UNMAPPED TYPES     {res['unmapped_calls']:,} calls; most common: {top}")
+    if res['hour_calls'].sum():
+        busiest = np.argsort(-res['hour_calls'])[:3]
+        print("  BUSIEST HOURS      " + "  ".join(f"{h:02d}:00 {res['hour_covered'][h] / res['hour_calls'][h]:.0%} covered" for h in busiest))
+    # per-model times are conditional on that model being able to fly the call
+    for model, stats in res['models'].items():
+        print(f"  {model:<18} p50 {format_clock(stats['p50'])}  p90 {format_clock(stats['p90'])}  infeasible {stats['fraction_infeasible']:.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+import atexit
+import csv
+import importlib.util
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+# --- Run Results ---
+# Every completed simulation becomes one run row plus one row per model.
+# submit() only drops the record on an in-memory queue; a daemon thread
+# batches whatever has arrived into each sink, so the script thread never
+# waits on disk or network. If the queue is full (a sink stuck far behind)
+# records are dropped and counted rather than blocking a rerun.
+RESULTS_DB_ENV = 'DRONE_SIM_RESULTS_DB'
+SHEET_STANDIN_ENV = 'DRONE_SIM_SHEET_STANDIN'
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'runs.sqlite')
+
+QUEUE_MAX = 10_000
+BATCH_MAX = 500
+SQLITE_FLUSH_SEC = 1.0
+SHEET_FLUSH_SEC = 30.0
+RETRY_SEC = (5.0, 300.0)
+SINK_BUFFER_MAX = 50_000
+
+RUN_COLUMNS = ('run_id', 'recorded_at', 'session', 'incident', 'severity', 'base_lat', 'base_lon', 'target_lat', 'target_lon',
+               'distance_mi', 'wind_mph', 'wind_from_deg', 'officer_eta_sec', 'first_model', 'first_t_out_sec')
+MODEL_COLUMNS = ('run_id', 'model', 'possible', 't_out_sec', 't_back_sec', 'hover_sec', 'turnaround_min', 'fail')
+SHEET_COLUMNS = RUN_COLUMNS[1:] + MODEL_COLUMNS[1:]
+
+def _num(v, digits=1):
+    v = float(v)
+    return round(v, digits) if v == v and abs(v) != float('inf') else None
+
+def model_rows(models, mission):
+    # mission is one column from engine.mission_column / simulate; also
+    # returns the first model on scene and its one-way time
+    rows = []
+    first_model, first_t = None, None
+    for i, model in enumerate(models):
+        possible = bool(mission['possible'][i])
+        fail = '' if possible else 'WIND' if mission['fail_wind'][i] else 'FUEL' if mission['fail_fuel'][i] else 'RANGE'
+        t_out = _num(mission['t_out'][i])
+        rows.append({
+            'model': str(model), 'possible': int(possible), 't_out_sec': t_out, 't_back_sec': _num(mission['t_back'][i]),
+            'hover_sec': _num(mission['t_hov'][i]), 'turnaround_min': _num(mission['turnaround_min'][i], 2), 'fail': fail,
+        })
+        if possible and (first_t is None or t_out < first_t):
+            first_model, first_t = str(model), t_out
+    return rows, first_model, first_t
+
+def run_record(models, mission, base, target, incident, severity, officer_eta_sec, distance_mi, wind=None, session=''):
+    rows, first_model, first_t = model_rows(models, mission)
+
+    return {
+        'run_id': uuid.uuid4().hex,
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'session': session,
+        'incident': incident,
+        'severity': severity,
+        'base_lat': float(base[0]), 'base_lon': float(base[1]),
+        'target_lat': float(target[0]), 'target_lon': float(target[1]),
+        'distance_mi': _num(distance_mi, 3),
+        'wind_mph': float(wind[0]) if wind else 0.0,
+        'wind_from_deg': float(wind[1]) if wind else None,
+        'officer_eta_sec': _num(officer_eta_sec),
+        'first_model': first_model,
+        'first_t_out_sec': first_t,
+        'models': rows,
+    }
+
+# --- Sinks ---
+# A sink buffers records handed to it by the writer thread and decides when to
+# flush: SQLite every second, the sheet in bulk every SHEET_FLUSH_SEC. A failed
+# flush keeps its buffer and is retried with backoff.
+class SQLiteSink:
+    name = 'sqlite'
+    flush_sec = SQLITE_FLUSH_SEC
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = None
+
+    def _connect(self):
+        # opened on the writer thread, which is the only thread that uses it
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f"CREATE TABLE IF NOT EXISTS runs ({', '.join(RUN_COLUMNS)}, PRIMARY KEY (run_id))")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS run_models ({', '.join(MODEL_COLUMNS)}, PRIMARY KEY (run_id, model))")
+        return conn
+
+    def write(self, records):
+        if self.conn is None:
+            self.conn = self._connect()
+        with self.conn:
+            self.conn.executemany(f"INSERT OR REPLACE INTO runs VALUES ({', '.join('?' * len(RUN_COLUMNS))})",
+                                  [tuple(r[c] for c in RUN_COLUMNS) for r in records])
+            self.conn.executemany(f"INSERT OR REPLACE INTO run_models VALUES ({', '.join('?' * len(MODEL_COLUMNS))})",
+                                  [(r['run_id'],) + tuple(m[c] for c in MODEL_COLUMNS[1:]) for r in records for m in r['models']])
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+class SheetSink:
+    # One row per (run, model) so the sheet is a flat, filterable log.
+    # `open_worksheet` returns anything with gspread's append_rows/row_values
+    # (a gspread Worksheet or LocalSheet); it is called on the writer thread so
+    # authenticating never holds up a rerun.
+    name = 'sheet'
+    flush_sec = SHEET_FLUSH_SEC
+
+    def __init__(self, open_worksheet):
+        self.open_worksheet = open_worksheet
+        self.worksheet = None
+        self.has_header = None
+
+    def write(self, records):
+        if self.worksheet is None:
+            self.worksheet = self.open_worksheet()
+        rows = []
+        if self.has_header is None:
+            self.has_header = bool(self.worksheet.row_values(1))
+        if not self.has_header:
+            rows.append(list(SHEET_COLUMNS))
+        for r in records:
+            head = ['' if r[c] is None else r[c] for c in RUN_COLUMNS[1:]]
+            rows.extend(head + ['' if m[c] is None else m[c] for c in MODEL_COLUMNS[1:]] for m in r['models'])
+        self.worksheet.append_rows(rows, value_input_option='RAW')
+        self.has_header = True
+
+    def close(self):
+        pass
+
+class LocalSheet:
+    # Stand-in for a gspread Worksheet backed by a CSV file: point
+    # DRONE_SIM_SHEET_STANDIN at a path to exercise the sheet sink offline.
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def get_all_values(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, newline='', encoding='utf-8') as fh:
+            return list(csv.reader(fh))
+
+    def row_values(self, row):
+        values = self.get_all_values()
+        return values[row - 1] if len(values) >= row else []
+
+    def append_rows(self, values, value_input_option='RAW'):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, 'a', newline='', encoding='utf-8') as fh:
+            csv.writer(fh).writerows(values)
+        self.calls += 1
+
+def sheet_configured(secrets):
+    # gspread is optional: without it (or with the template secrets) runs only
+    # go to SQLite.
+    sheet_id = secrets.get('GOOGLE_SHEET_ID', '')
+    if not sheet_id or sheet_id.startswith('your_') or not secrets.get('gcp_service_account'):
+        return False
+    return importlib.util.find_spec('gspread') is not None
+
+def open_google_sheet(secrets):
+    import gspread
+    client = gspread.service_account_from_dict(dict(secrets['gcp_service_account']))
+    return client.open_by_key(secrets['GOOGLE_SHEET_ID']).worksheet(secrets.get('GOOGLE_SHEET_TAB', 'Sheet1'))
+
+# --- Writer ---
+class ResultsWriter:
+    def __init__(self, sinks, queue_max=QUEUE_MAX, clock=time.monotonic):
+        self.sinks = list(sinks)
+        self.clock = clock
+        self.queue = queue.Queue(maxsize=queue_max)
+        self.dropped = 0
+        self.written = {s.name: 0 for s in self.sinks}
+        self.errors = {s.name: 0 for s in self.sinks}
+        self.last_error = {}
+        self._buffers = {s.name: [] for s in self.sinks}
+        self._due = {s.name: 0.0 for s in self.sinks}
+        self._retry = {s.name: RETRY_SEC[0] for s in self.sinks}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='results-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _drain(self, timeout):
+        batch = []
+        try:
+            batch.append(self.queue.get(timeout=timeout))
+            while len(batch) < BATCH_MAX:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _flush(self, force=False):
+        now = self.clock()
+        for sink in self.sinks:
+            buf = self._buffers[sink.name]
+            if not buf or (not force and now < self._due[sink.name]):
+                continue
+            try:
+                sink.write(buf)
+            except Exception as exc:
+                self.errors[sink.name] += 1
+                self.last_error[sink.name] = repr(exc)
+                self._due[sink.name] = now + self._retry[sink.name]
+                self._retry[sink.name] = min(self._retry[sink.name] * 2, RETRY_SEC[1])
+                # keep the newest records if a sink stays down
+                del buf[:-SINK_BUFFER_MAX]
+                continue
+            self.written[sink.name] += len(buf)
+            buf.clear()
+            self._due[sink.name] = now + sink.flush_sec
+            self._retry[sink.name] = RETRY_SEC[0]
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(timeout=min(s.flush_sec for s in self.sinks) if self.sinks else 1.0)
+            for buf in self._buffers.values():
+                buf.extend(batch)
+            self._flush()
+        # _drain hands back at most BATCH_MAX records, so keep going until the
+        # queue is empty or a backlog left at shutdown is lost
+        while True:
+            batch = self._drain(timeout=0)
+            if not batch:
+                break
+            for buf in self._buffers.values():
+                buf.extend(batch)
+        self._flush(force=True)
+        for sink in self.sinks:
+            sink.close()
+
+    def close(self, timeout=10.0):
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'dropped': self.dropped,
+            'written': dict(self.written),
+            'pending': {name: len(buf) for name, buf in self._buffers.items()},
+            'errors': dict(self.errors),
+        }
+
+def default_sinks(secrets=None):
+    sinks = [SQLiteSink(os.environ.get(RESULTS_DB_ENV) or DEFAULT_DB_PATH)]
+    secrets = secrets or {}
+    standin = os.environ.get(SHEET_STANDIN_ENV)
+    if standin:
+        sinks.append(SheetSink(lambda: LocalSheet(standin)))
+    elif sheet_configured(secrets):
+        sinks.append(SheetSink(lambda: open_google_sheet(secrets)))
+    return sinks
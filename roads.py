@@ -0,0 +1,181 @@
+import glob
+import heapq
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from scenario import OFFICER_ROAD_FACTOR, OFFICER_SPEED_MPH
+from spatial import MILES_PER_DEG_LAT, build_unit_index, nearest_units
+
+# --- Road Graph ---
+# Officer travel times over a road network stored in compressed sparse row
+# form: node i's outgoing edges are indices[indptr[i]:indptr[i+1]], each with
+# a travel time in seconds. One .npz per region lives in data/roads (built by
+# tools/build_road_graph.py from an OSM extract, or a synthetic grid
+# stand-in). Areas without a graph keep the straight-line x1.4 estimate.
+ROAD_GRAPH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'roads')
+
+# Getting from a point to the nearest graph node (and from the last node to
+# the target) is costed like the straight-line fallback.
+SNAP_SEC_PER_MILE = OFFICER_ROAD_FACTOR * 3600.0 / OFFICER_SPEED_MPH
+
+GRAPH_KEYS = ('name', 'lat', 'lon', 'indptr', 'indices', 'travel_sec', 'bbox', 'max_mph')
+
+def build_csr(lat, lon, src, dst, travel_sec, name=''):
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    travel_sec = np.asarray(travel_sec, dtype=np.float32)
+
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(len(lat) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(lat)), out=indptr[1:])
+    edge_miles = np.hypot((lat[dst] - lat[src]) * MILES_PER_DEG_LAT,
+                          (lon[dst] - lon[src]) * MILES_PER_DEG_LAT * np.cos(np.radians(lat[src])))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        max_mph = float(np.nanmax(np.where(travel_sec > 0, edge_miles / (travel_sec / 3600.0), np.nan))) if len(src) else OFFICER_SPEED_MPH
+
+    return _prepare({
+        'name': name,
+        'lat': lat,
+        'lon': lon,
+        'indptr': indptr,
+        'indices': dst[order].astype(np.int32),
+        'travel_sec': travel_sec[order],
+        'bbox': np.array([lat.min(), lon.min(), lat.max(), lon.max()]),
+        'max_mph': max_mph,
+    })
+
+def save_graph(path, graph):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(path, **{k: np.asarray(graph[k]) for k in GRAPH_KEYS})
+
+@lru_cache(maxsize=4)
+def _load_graph(path, mtime_ns):
+    with np.load(path) as npz:
+        graph = {k: npz[k] for k in npz.files}
+    graph['name'] = str(graph['name'])
+    graph['max_mph'] = float(graph['max_mph'])
+    return _prepare(graph)
+
+def _prepare(graph):
+    # Plain lists make the per-edge loop in the search several times faster
+    # than indexing numpy arrays element by element.
+    lat0 = float(graph['lat'].mean())
+    graph['search'] = {
+        'indptr': graph['indptr'].tolist(),
+        'indices': graph['indices'].tolist(),
+        'travel_sec': graph['travel_sec'].tolist(),
+        'x': (graph['lon'] * MILES_PER_DEG_LAT * math.cos(math.radians(lat0))).tolist(),
+        'y': (graph['lat'] * MILES_PER_DEG_LAT).tolist(),
+        # seconds per straight-line mile at the fastest speed on the graph,
+        # less 1% for the flat projection: an admissible A* heuristic
+        'h_sec_per_mile': 0.99 * 3600.0 / max(graph['max_mph'], 1e-6),
+    }
+    graph['node_index'] = build_unit_index(np.column_stack([graph['lat'], graph['lon']]))
+    return graph
+
+def load_graph(path):
+    return _load_graph(os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+@lru_cache(maxsize=4)
+def _region_bboxes(graph_dir, dir_mtime_ns):
+    regions = []
+    for path in sorted(glob.glob(os.path.join(graph_dir, '*.npz'))):
+        with np.load(path) as npz:
+            regions.append((path, npz['bbox']))
+    return regions
+
+def find_graph_path(point, graph_dir=ROAD_GRAPH_DIR):
+    if not os.path.isdir(graph_dir):
+        return None
+    for path, (lat_min, lon_min, lat_max, lon_max) in _region_bboxes(graph_dir, os.stat(graph_dir).st_mtime_ns):
+        if lat_min <= point[0] <= lat_max and lon_min <= point[1] <= lon_max:
+            return path
+    return None
+
+def find_graph(point, graph_dir=ROAD_GRAPH_DIR):
+    path = find_graph_path(point, graph_dir)
+    return load_graph(path) if path else None
+
+def graph_version(point, graph_dir=ROAD_GRAPH_DIR):
+    # (path, mtime) of the graph covering point, or None: part of any cache key
+    # for times computed over it, so replacing a region's .npz invalidates them
+    path = find_graph_path(point, graph_dir)
+    return (path, os.stat(path).st_mtime_ns) if path else None
+
+def snap_to_graph(graph, point):
+    idx, dist = nearest_units(graph['node_index'], point, k=1)
+    return int(idx[0]), float(dist[0])
+
+# --- Multi-Source Search ---
+# One A* run seeded with every unit at once: each unit starts at its snapped
+# node with the cost of getting there, and the first time the target's node is
+# settled we know both the winning unit and its travel time. The heuristic is
+# straight-line distance at the graph's top speed, so it never overestimates
+# and the early exit is exact.
+def fastest_unit(graph, units, target):
+    s = graph['search']
+    indptr, indices, travel_sec, xs, ys = s['indptr'], s['indices'], s['travel_sec'], s['x'], s['y']
+    h_scale = s['h_sec_per_mile']
+
+    goal, goal_miles = snap_to_graph(graph, target)
+    gx, gy = xs[goal], ys[goal]
+    goal_sec = goal_miles * SNAP_SEC_PER_MILE
+
+    best = {}
+    heap = []
+    for u, pos in enumerate(units):
+        node, miles = snap_to_graph(graph, pos)
+        g = miles * SNAP_SEC_PER_MILE
+        if g < best.get(node, (math.inf,))[0]:
+            best[node] = (g, u)
+            heapq.heappush(heap, (g + math.hypot(xs[node] - gx, ys[node] - gy) * h_scale, g, node, u))
+
+    done = set()
+    while heap:
+        _, g, node, u = heapq.heappop(heap)
+        if node in done:
+            continue
+        if node == goal:
+            return u, g + goal_sec
+        done.add(node)
+        for e in range(indptr[node], indptr[node + 1]):
+            nxt = indices[e]
+            ng = g + travel_sec[e]
+            if nxt not in done and ng < best.get(nxt, (math.inf,))[0]:
+                best[nxt] = (ng, u)
+                heapq.heappush(heap, (ng + math.hypot(xs[nxt] - gx, ys[nxt] - gy) * h_scale, ng, nxt, u))
+    return None
+
+# --- Synthetic Stand-In ---
+# A street grid around a center point: local streets every spacing_miles,
+# faster arterials every `arterial_every` blocks, and a few local blocks
+# removed so routes are not pure Manhattan distance.
+def synthetic_grid_graph(center, radius_miles=10.0, spacing_miles=0.1, local_mph=25.0, arterial_mph=45.0,
+                         arterial_every=8, drop_frac=0.05, seed=0, name='synthetic'):
+    rng = np.random.default_rng(seed)
+    n = int(round(2 * radius_miles / spacing_miles)) + 1
+    steps = np.linspace(-radius_miles, radius_miles, n)
+    lat_row = center[0] + steps / MILES_PER_DEG_LAT
+    lon_col = center[1] + steps / (MILES_PER_DEG_LAT * math.cos(math.radians(center[0])))
+    lat, lon = np.meshgrid(lat_row, lon_col, indexing='ij')
+    node = np.arange(n * n).reshape(n, n)
+
+    src, dst, arterial = [], [], []
+    rows = np.arange(n)
+    # east-west segments along row i, north-south segments along column j
+    src.append(node[:, :-1].ravel()); dst.append(node[:, 1:].ravel())
+    arterial.append(np.repeat(rows % arterial_every == 0, n - 1))
+    src.append(node[:-1, :].ravel()); dst.append(node[1:, :].ravel())
+    arterial.append(np.tile(rows % arterial_every == 0, n - 1))
+    src, dst, arterial = np.concatenate(src), np.concatenate(dst), np.concatenate(arterial)
+
+    keep = arterial | (rng.random(len(src)) >= drop_frac)
+    src, dst, arterial = src[keep], dst[keep], arterial[keep]
+    sec = spacing_miles / np.where(arterial, arterial_mph, local_mph) * 3600.0
+
+    return build_csr(lat.ravel(), lon.ravel(), np.r_[src, dst], np.r_[dst, src], np.r_[sec, sec], name=name)
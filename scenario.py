@@ -0,0 +1,59 @@
+import numpy as np
+
+from spatial import haversine_miles, miles_to_degrees
+
+# --- Incident Model ---
+INCIDENTS = [
+    ("SHOTS FIRED", "critical"),
+    ("ARMED ROBBERY", "critical"),
+    ("OFFICER IN DISTRESS", "critical"),
+    ("BURGLARY IN PROGRESS", "action"),
+    ("VEHICLE PURSUIT", "action"),
+    ("MISSING PERSON", "info"),
+    ("SUSPICIOUS ACTIVITY", "info")
+]
+SEVERITIES = ("critical", "action", "info")
+
+LAUNCH_DELAY_SEC = (45, 120)
+INCIDENT_RADIUS_MI = 8.0
+
+# --- Patrol / Officer Model ---
+SQUAD_COUNT = (3, 5)
+SQUAD_RADIUS_MI = (0.5, 9.0)
+OFFICER_DISPATCH_SEC = 60
+OFFICER_ROAD_FACTOR = 1.4
+OFFICER_SPEED_MPH = 35.0
+
+def officer_travel_sec(dist_miles):
+    return (np.asarray(dist_miles) * OFFICER_ROAD_FACTOR) / (OFFICER_SPEED_MPH / 3600.0)
+
+# --- Batch Sampling ---
+def _polar_offsets(rng, base, r_mi, size):
+    angle = rng.uniform(0, 2 * np.pi, size)
+    d_lat, d_lon = miles_to_degrees(base[0], r_mi)
+    return base[0] + d_lat * np.sin(angle), base[1] + d_lon * np.cos(angle)
+
+def sample_incidents(rng, base, n, radius_miles=INCIDENT_RADIUS_MI):
+    # sqrt keeps the points uniform over the disk rather than bunched at the base
+    r_mi = radius_miles * np.sqrt(rng.uniform(0, 1, n))
+    lat, lon = _polar_offsets(rng, base, r_mi, n)
+    return {
+        'lat': lat,
+        'lon': lon,
+        'incident': rng.integers(0, len(INCIDENTS), n),
+        'launch_delay': rng.uniform(LAUNCH_DELAY_SEC[0], LAUNCH_DELAY_SEC[1], n),
+    }
+
+def sample_patrols(rng, base, n):
+    max_cars = SQUAD_COUNT[1]
+    counts = rng.integers(SQUAD_COUNT[0], max_cars + 1, n)
+    r_mi = rng.uniform(SQUAD_RADIUS_MI[0], SQUAD_RADIUS_MI[1], (n, max_cars))
+    lat, lon = _polar_offsets(rng, base, r_mi, (n, max_cars))
+    return {'lat': lat, 'lon': lon, 'active': np.arange(max_cars)[None, :] < counts[:, None]}
+
+def nearest_patrol_miles(patrols, lat, lon):
+    dist = haversine_miles(patrols['lat'], patrols['lon'], np.asarray(lat)[:, None], np.asarray(lon)[:, None])
+    return np.where(patrols['active'], dist, np.inf).min(axis=1)
+
+def incident_severity_codes():
+    return np.array([SEVERITIES.index(sev) for _, sev in INCIDENTS])
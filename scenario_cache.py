@@ -0,0 +1,154 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# --- Shared Scenario Cache ---
+# One process-wide LRU cache, shared by every Streamlit session, for results
+# that only depend on where the base and target are and which fleet is loaded:
+# mission numbers, playback frames and the responding-officer pick. Points are
+# snapped to COORD_DIGITS decimals (~11 m) before they are used, so repeat
+# clicks on the same spot hit and the cached result is exactly what a fresh
+# compute would give. Entries expire after TTL_SEC and the cache is bounded by
+# both entry count and approximate size. Cached arrays are made read-only
+# because every session shares them. Keys are frozen into hashable, canonical
+# form (dicts by sorted items, lists as tuples, arrays by dtype, shape and
+# bytes), so equal keys built different ways find the same entry.
+COORD_DIGITS = 4
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024
+TTL_SEC = 30 * 60
+
+def quantize_point(point, digits=COORD_DIGITS):
+    return (round(float(point[0]), digits), round(float(point[1]), digits))
+
+def points_hash(points, digits=COORD_DIGITS):
+    arr = np.round(np.asarray(points, dtype=float).reshape(-1, 2), digits)
+    return hashlib.sha1(arr.tobytes()).hexdigest()[:16]
+
+def _freeze(key):
+    if isinstance(key, np.ndarray):
+        return ('ndarray', key.dtype.str, key.shape, np.ascontiguousarray(key).tobytes())
+    if isinstance(key, np.generic):
+        return key.item()
+    if isinstance(key, dict):
+        return ('dict', tuple(sorted((_freeze(k), _freeze(v)) for k, v in key.items())))
+    if isinstance(key, (list, tuple)):
+        return tuple(_freeze(v) for v in key)
+    return key
+
+def _read_only(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for v in value.values():
+            _read_only(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _read_only(v)
+    return value
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+class ScenarioCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, ttl_sec=TTL_SEC, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, nbytes, value)
+        self._pending = {}  # key -> Event, while one caller computes it
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = self._expired = 0
+
+    def get(self, key):
+        key = _freeze(key)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._drop(key)
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[2]
+
+    def put(self, key, value):
+        key = _freeze(key)
+        value = _read_only(value)
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (self._clock() + self.ttl_sec, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        # compute() runs outside the lock, so a slow miss never blocks lookups
+        # of other keys; sessions missing on a key another one is computing
+        # wait for that result instead of computing it again. If the computing
+        # caller fails (or the result is too big to keep), the next waiter
+        # computes.
+        key = _freeze(key)
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return value
+            with self._lock:
+                event = self._pending.get(key)
+                if event is None:
+                    if key in self._entries:
+                        continue  # stored between our get and here
+                    event = self._pending[key] = threading.Event()
+                    break
+            event.wait()
+        try:
+            return self.put(key, compute())
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expired': self._expired,
+            }
+
+SCENARIO_CACHE = ScenarioCache()
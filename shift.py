@@ -0,0 +1,198 @@
+import argparse
+import heapq
+import time
+from collections import deque
+
+import numpy as np
+
+from fleet import FLEET_PATH, fleet_arrays, load_fleet
+from mission import compute_fleet_missions
+from scenario import INCIDENT_RADIUS_MI, sample_incidents
+from zipindex import lookup_zip
+
+# --- Shift Simulator ---
+# Discrete-event replay of a shift's calls against individual airframes. Every
+# call's mission numbers come from one vectorized kernel pass up front; the
+# event loop then only tracks who is flying, waiting for a charger, charging
+# or swapping, and hands each call to the fastest airframe that is free.
+EV_CALL = 0
+EV_LANDED = 1
+EV_READY = 2
+
+IDLE, FLYING, CHARGE_WAIT, CHARGING, SWAPPING = range(5)
+
+def sample_shift_calls(rng, base, n_calls, hours=24.0, radius_miles=INCIDENT_RADIUS_MI):
+    calls = sample_incidents(rng, base, n_calls, radius_miles)
+    calls['time'] = np.sort(rng.uniform(0, hours * 3600, n_calls))
+    return calls
+
+def expand_inventory(fleet, inventory=None):
+    # inventory: {model: airframe count}; models left out get one airframe
+    inventory = inventory or {}
+    return np.array([i for i, m in enumerate(fleet['model']) for _ in range(int(inventory.get(m, 1)))], dtype=np.int64)
+
+def run_shift(fleet, base, calls, inventory=None, chargers=None, max_wait_sec=300.0, hours=24.0):
+    fleet = fleet_arrays(fleet)
+    airframe_model = expand_inventory(fleet, inventory)
+    n_air = len(airframe_model)
+    n_calls = len(calls['time'])
+    if chargers is None:
+        chargers = int((~fleet['battery_swap'][airframe_model]).sum())
+
+    missions = compute_fleet_missions(fleet, base, np.column_stack([calls['lat'], calls['lon']]))
+    possible = missions['possible'][airframe_model]
+    t_out = np.where(possible, missions['t_out'][airframe_model], np.inf)
+    t_total = missions['t_total'][airframe_model]
+    turnaround_sec = missions['turnaround_min'][airframe_model] * 60
+    swap = fleet['battery_swap'][airframe_model]
+    covered = possible.any(axis=0)
+    launch_delay = calls.get('launch_delay', np.zeros(n_calls))
+
+    state = np.full(n_air, IDLE, dtype=np.int8)
+    flight_sec = np.zeros(n_air)
+    sorties = np.zeros(n_air, dtype=np.int64)
+    response = np.full(n_calls, np.nan)
+    wait = np.full(n_calls, np.nan)
+    outcome = np.zeros(n_calls, dtype=np.int8)  # 0 uncovered, 1 served, 2 missed
+
+    events = [(float(t), i, EV_CALL, i) for i, t in enumerate(calls['time'])]
+    heapq.heapify(events)
+    seq = n_calls
+    pending = deque()
+    charge_queue = deque()
+    free_chargers = chargers
+    charge_wait = []
+    peak_pending = 0
+
+    def launch(now, air, call):
+        nonlocal seq
+        state[air] = FLYING
+        sorties[air] += 1
+        flight_sec[air] += t_total[air, call]
+        wait[call] = now - calls['time'][call]
+        response[call] = wait[call] + launch_delay[call] + t_out[air, call]
+        outcome[call] = 1
+        seq += 1
+        heapq.heappush(events, (now + launch_delay[call] + t_total[air, call], seq, EV_LANDED, (air, call)))
+
+    def start_recharge(now, air, call):
+        nonlocal seq
+        seq += 1
+        heapq.heappush(events, (now + turnaround_sec[air, call], seq, EV_READY, air))
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+
+        if kind == EV_CALL:
+            call = payload
+            if not covered[call]:
+                continue
+            idle = state == IDLE
+            if (idle & possible[:, call]).any():
+                launch(now, int(np.argmin(np.where(idle, t_out[:, call], np.inf))), call)
+            else:
+                pending.append(call)
+                peak_pending = max(peak_pending, len(pending))
+
+        elif kind == EV_LANDED:
+            air, call = payload
+            if swap[air]:
+                state[air] = SWAPPING
+                start_recharge(now, air, call)
+            elif free_chargers > 0:
+                free_chargers -= 1
+                state[air] = CHARGING
+                charge_wait.append(0.0)
+                start_recharge(now, air, call)
+            else:
+                state[air] = CHARGE_WAIT
+                charge_queue.append((now, air, call))
+
+        else:
+            air = payload
+            if state[air] == CHARGING:
+                free_chargers += 1
+                if charge_queue:
+                    queued_at, nxt, nxt_call = charge_queue.popleft()
+                    free_chargers -= 1
+                    state[nxt] = CHARGING
+                    charge_wait.append(now - queued_at)
+                    start_recharge(now, nxt, nxt_call)
+            state[air] = IDLE
+
+            # Oldest pending call this airframe can fly; expired ones are missed.
+            while pending and now - calls['time'][pending[0]] > max_wait_sec:
+                outcome[pending.popleft()] = 2
+            for call in pending:
+                if possible[air, call]:
+                    pending.remove(call)
+                    launch(now, air, call)
+                    break
+
+    for call in pending:
+        outcome[call] = 2
+
+    served = outcome == 1
+    resp = response[served]
+    return {
+        'calls': n_calls,
+        'served': int(served.sum()),
+        'missed': int((outcome == 2).sum()),
+        'uncovered': int((~covered).sum()),
+        'served_per_hour': float(served.sum() / hours),
+        'response_p50': float(np.percentile(resp, 50)) if len(resp) else float('nan'),
+        'response_p90': float(np.percentile(resp, 90)) if len(resp) else float('nan'),
+        'queue_wait_mean': float(wait[served].mean()) if served.any() else float('nan'),
+        'peak_pending': peak_pending,
+        'charger_wait_mean': float(np.mean(charge_wait)) if charge_wait else 0.0,
+        'airframes': [
+            {'model': str(fleet['model'][m]), 'sorties': int(sorties[a]), 'utilization': float(flight_sec[a] / (hours * 3600))}
+            for a, m in enumerate(airframe_model)
+        ],
+        'response': response,
+        'outcome': outcome,
+    }
+
+# --- CLI ---
+def _parse_inventory(text):
+    inventory = {}
+    for item in filter(None, (text or '').split(',')):
+        model, _, count = item.rpartition('=')
+        inventory[model.strip()] = int(count)
+    return inventory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a shift of calls against the fleet")
+    parser.add_argument('zip', nargs='?', help="5-digit ZIP for the drone base")
+    parser.add_argument('--base', help="LAT,LON for the drone base (overrides ZIP)")
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--hours', type=float, default=24.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--inventory', help="airframes per model, e.g. 'GUARDIAN=2,RESPONDER=3' (default 1 each)")
+    parser.add_argument('--chargers', type=int, default=None, help="charging pads at the base (default one per charger airframe)")
+    parser.add_argument('--max-wait', type=float, default=300.0, help="seconds a call may queue for a drone")
+    parser.add_argument('--fleet', default=FLEET_PATH)
+    args = parser.parse_args(argv)
+    if not args.zip and not args.base:
+        parser.error("give a ZIP or --base LAT,LON")
+
+    base = [float(v) for v in args.base.split(',')] if args.base else lookup_zip(args.zip)
+    if base is None:
+        raise SystemExit(f"Unknown ZIP: {args.zip}")
+
+    fleet = load_fleet(args.fleet)
+    calls = sample_shift_calls(np.random.default_rng(args.seed), base, args.calls, args.hours)
+
+    start = time.perf_counter()
+    res = run_shift(fleet, base, calls, _parse_inventory(args.inventory), args.chargers, args.max_wait, args.hours)
+    elapsed = time.perf_counter() - start
+
+    print(f"{res['calls']:,} calls over {args.hours:g} h  ({elapsed * 1000:.0f} ms)")
+    print(f"  SERVED {res['served']:,}  MISSED {res['missed']:,}  NO COVERAGE {res['uncovered']:,}  ({res['served_per_hour']:.1f}/h)")
+    print(f"  RESPONSE p50 {res['response_p50'] / 60:.1f} min  p90 {res['response_p90'] / 60:.1f} min  "
+          f"queue wait {res['queue_wait_mean']:.0f}s  peak queue {res['peak_pending']}  charger wait {res['charger_wait_mean']:.0f}s")
+    for air in res['airframes']:
+        print(f"  {air['model']:<18} sorties {air['sorties']:>4}  utilization {air['utilization']:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from coverage_map import max_radius_miles
+from fleet import FLEET_PATH, fleet_arrays, load_fleet
+from scenario import INCIDENT_RADIUS_MI, sample_incidents
+from spatial import MILES_PER_DEG_LAT
+from zipindex import lookup_zip
+
+# --- Base Siting ---
+# Proposes k dock locations from a candidate grid that minimize drone arrival
+# time over a set of incident points. In still air a model reaches a point iff
+# it lies within the model's max radius (range and endurance), so the best
+# arrival from a site is just distance / speed of the fastest model that
+# reaches it, and only models not beaten on both speed and radius matter.
+# Incidents stream through in chunks of (candidates x chunk) matrices; each
+# pass scores every candidate against the current best arrival per incident
+# with exact sums and 1-second histograms for the p90. Distances use a flat
+# projection around the incidents' centroid (well under 0.1% off great-circle
+# at city scale) because the trig of haversine dominated each pass.
+UNCOVERED_PENALTY_SEC = 30 * 60
+HIST_MAX_SEC = 3600
+DEFAULT_CHUNK = 8192
+DEFAULT_GRID = 20
+
+def frontier_models(fleet):
+    fleet = fleet_arrays(fleet)
+    speed = fleet['speed_mph'].astype(float)
+    radius = max_radius_miles(fleet)
+    keep = []
+    for i in np.argsort(-speed, kind='stable'):
+        if radius[i] > 0 and (not keep or radius[i] > radius[keep[-1]]):
+            keep.append(i)
+    return speed[keep], radius[keep]
+
+def project_miles(points, lat0):
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return np.column_stack([points[:, 1] * MILES_PER_DEG_LAT * np.cos(np.radians(lat0)),
+                            points[:, 0] * MILES_PER_DEG_LAT]).astype(np.float32)
+
+def arrival_matrix(sites_xy, points_xy, speeds, radii):
+    dx = sites_xy[:, 0, None] - points_xy[None, :, 0]
+    dy = sites_xy[:, 1, None] - points_xy[None, :, 1]
+    dist = np.sqrt(dx * dx + dy * dy)
+    best = np.full(dist.shape, np.inf, dtype=np.float32)
+    reached = np.zeros(dist.shape, dtype=bool)
+    # fastest first: a slower model only fills points the faster ones can't reach
+    for speed, radius in zip(speeds, radii):
+        fill = dist <= radius
+        fill &= ~reached
+        np.multiply(dist, np.float32(3600.0 / speed), out=best, where=fill)
+        reached |= fill
+    return best
+
+def candidate_grid(points, n=DEFAULT_GRID):
+    points = np.asarray(points, dtype=float)
+    lat = np.linspace(points[:, 0].min(), points[:, 0].max(), n)
+    lon = np.linspace(points[:, 1].min(), points[:, 1].max(), n)
+    lat_g, lon_g = np.meshgrid(lat, lon, indexing='ij')
+    return np.column_stack([lat_g.ravel(), lon_g.ravel()])
+
+def _score(times):
+    # times: (rows, chunk) -> per-row penalized sums, covered counts, histograms
+    covered = np.isfinite(times)
+    penalized = np.where(covered, times, np.float32(UNCOVERED_PENALTY_SEC))
+    bins = np.minimum(times, np.float32(HIST_MAX_SEC))
+    bins[~covered] = HIST_MAX_SEC + 1
+    bins = bins.astype(np.int32)
+    n_bins = HIST_MAX_SEC + 2
+    bins += (np.arange(len(times), dtype=np.int32) * n_bins)[:, None]
+    hist = np.bincount(bins.ravel(), minlength=len(times) * n_bins).reshape(len(times), n_bins)
+    return penalized.sum(axis=1, dtype=np.float64), covered.sum(axis=1), hist
+
+def _summaries(total, covered, hist, n):
+    cum = np.cumsum(hist, axis=1)
+    p90_bin = np.argmax(cum >= np.ceil(0.9 * n), axis=1)
+    p90 = np.where(p90_bin > HIST_MAX_SEC, np.inf, p90_bin + 1.0)
+    return {'mean': total / n, 'p90': p90, 'coverage': covered / n}
+
+def _pass(candidates, points, speeds, radii, current, chunk_size):
+    # Scores "current best arrival, plus one more base at candidate m" for every m.
+    m = len(candidates)
+    total = np.zeros(m)
+    covered = np.zeros(m, dtype=np.int64)
+    hist = np.zeros((m, HIST_MAX_SEC + 2), dtype=np.int64)
+    for start in range(0, len(points), chunk_size):
+        sl = slice(start, start + chunk_size)
+        times = np.minimum(arrival_matrix(candidates, points[sl], speeds, radii), current[None, sl])
+        t, c, h = _score(times)
+        total += t
+        covered += c
+        hist += h
+    return _summaries(total, covered, hist, len(points))
+
+def _objective(summary, objective):
+    if objective == 'p90':
+        # ties on p90 are broken by mean
+        return summary['p90'] + summary['mean'] * 1e-6
+    return summary['mean']
+
+# Existing docks may stock only part of the fleet: stock is a (sites, models)
+# mask as from dispatch.stock_mask (None = every dock has every model). Each
+# dock flies only the frontier of its own models, so one with nothing stocked
+# covers nothing.
+def evaluate_sites(sites, points, fleet, chunk_size=DEFAULT_CHUNK, stock=None):
+    fleet = fleet_arrays(fleet)
+    sites = np.asarray(sites, dtype=float).reshape(-1, 2)
+    stock = np.ones((len(sites), len(fleet['model'])), dtype=bool) if stock is None else np.asarray(stock, dtype=bool)
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    lat0 = float(points[:, 0].mean())
+    sites_xy, points_xy = project_miles(sites, lat0), project_miles(points, lat0)
+    current = np.full(len(points), np.inf, dtype=np.float32)
+    # docks with the same stock share one frontier
+    for row in np.unique(stock, axis=0):
+        if not row.any():
+            continue
+        speeds, radii = frontier_models({k: v[row] for k, v in fleet.items()})
+        group = sites_xy[(stock == row).all(axis=1)]
+        for start in range(0, len(points), chunk_size):
+            sl = slice(start, start + chunk_size)
+            current[sl] = np.minimum(current[sl], arrival_matrix(group, points_xy[sl], speeds, radii).min(axis=0))
+    summary = _summaries(*_score(current[None, :]), len(points))
+    return {k: float(v[0]) for k, v in summary.items()}
+
+def optimize_sites(points, fleet, k=2, candidates=None, objective='mean', chunk_size=DEFAULT_CHUNK, max_swap_rounds=3):
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    candidates = candidate_grid(points) if candidates is None else np.asarray(candidates, dtype=float).reshape(-1, 2)
+    speeds, radii = frontier_models(fleet)
+    lat0 = float(points[:, 0].mean())
+    cand_xy, points_xy = project_miles(candidates, lat0), project_miles(points, lat0)
+
+    def site_times(idx):
+        out = np.empty(len(points), dtype=np.float32)
+        for start in range(0, len(points), chunk_size):
+            sl = slice(start, start + chunk_size)
+            out[sl] = arrival_matrix(cand_xy[idx:idx + 1], points_xy[sl], speeds, radii)[0]
+        return out
+
+    # Greedy: add the candidate that helps most, k times.
+    chosen, per_site = [], []
+    current = np.full(len(points), np.inf, dtype=np.float32)
+    for _ in range(k):
+        scores = _objective(_pass(cand_xy, points_xy, speeds, radii, current, chunk_size), objective)
+        scores[chosen] = np.inf
+        best = int(np.argmin(scores))
+        chosen.append(best)
+        per_site.append(site_times(best))
+        current = np.minimum(current, per_site[-1])
+
+    # Swap: move one base at a time to the best candidate given the others.
+    best_score = _objective(_summaries(*_score(current[None, :]), len(points)), objective)[0]
+    for _ in range(max_swap_rounds if k > 1 else 0):
+        improved = False
+        for j in range(k):
+            others = np.min([t for i, t in enumerate(per_site) if i != j], axis=0)
+            scores = _objective(_pass(cand_xy, points_xy, speeds, radii, others, chunk_size), objective)
+            scores[[c for i, c in enumerate(chosen) if i != j]] = np.inf
+            cand = int(np.argmin(scores))
+            if cand != chosen[j] and scores[cand] < best_score - 1e-9:
+                chosen[j] = cand
+                per_site[j] = site_times(cand)
+                best_score = scores[cand]
+                improved = True
+        if not improved:
+            break
+
+    current = np.min(per_site, axis=0)
+    summary = _summaries(*_score(current[None, :]), len(points))
+    served = np.argmin(np.vstack(per_site), axis=0)
+    return {
+        'sites': candidates[chosen],
+        'mean': float(summary['mean'][0]),
+        'p90': float(summary['p90'][0]),
+        'coverage': float(summary['coverage'][0]),
+        'share': np.bincount(served[np.isfinite(current)], minlength=k) / len(points),
+        'max_radius': float(radii.max()) if len(radii) else 0.0,
+    }
+
+# --- Incident Sources ---
+def load_points(path):
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip().str.lower()
+    lat = next((c for c in ('lat', 'latitude') if c in df.columns), None)
+    lon = next((c for c in ('lon', 'lng', 'long', 'longitude') if c in df.columns), None)
+    if lat is None or lon is None:
+        return np.empty((0, 2))
+    return df[[lat, lon]].apply(pd.to_numeric, errors='coerce').dropna().to_numpy()
+
+def synthetic_points(center, n, radius_miles=INCIDENT_RADIUS_MI * 1.5, seed=0):
+    # a citywide uniform background plus a few denser hot spots
+    rng = np.random.default_rng(seed)
+    background = sample_incidents(rng, center, n // 2, radius_miles)
+    hubs = sample_incidents(rng, center, 4, radius_miles * 0.7)
+    pick = rng.integers(0, 4, n - n // 2)
+    hot = [sample_incidents(rng, (hubs['lat'][h], hubs['lon'][h]), int((pick == h).sum()), radius_miles * 0.2) for h in range(4)]
+    lat = np.concatenate([background['lat']] + [h['lat'] for h in hot])
+    lon = np.concatenate([background['lon']] + [h['lon'] for h in hot])
+    return np.column_stack([lat, lon])
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Propose drone base locations for a set of incidents")
+    parser.add_argument('--points', help="CSV of incidents with lat/lon columns")
+    parser.add_argument('--synthetic', help="ZIP or LAT,LON to generate synthetic incidents around")
+    parser.add_argument('-n', type=int, default=100_000, help="synthetic incident count")
+    parser.add_argument('-k', type=int, default=2, help="number of bases")
+    parser.add_argument('--grid', type=int, default=DEFAULT_GRID, help="candidate grid is GRID x GRID over the incidents")
+    parser.add_argument('--objective', choices=('mean', 'p90'), default='mean')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fleet', default=FLEET_PATH)
+    args = parser.parse_args(argv)
+
+    if args.points:
+        points = load_points(args.points)
+    elif args.synthetic:
+        center = [float(v) for v in args.synthetic.split(',')] if ',' in args.synthetic else lookup_zip(args.synthetic)
+        if center is None:
+            raise SystemExit(f"Unknown ZIP: {args.synthetic}")
+        points = synthetic_points(center, args.n, seed=args.seed)
+    else:
+        parser.error("give --points CSV or --synthetic ZIP|LAT,LON")
+
+    fleet = load_fleet(args.fleet)
+    start = time.perf_counter()
+    res = optimize_sites(points, fleet, args.k, candidate_grid(points, args.grid), args.objective)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(points):,} incidents, {args.grid ** 2} candidates, k={args.k} ({elapsed:.1f}s)")
+    print(f"  MEAN ARRIVAL {res['mean'] / 60:.1f} min  P90 {res['p90'] / 60:.1f} min  COVERED {res['coverage']:.1%}")
+    for (lat, lon), share in zip(res['sites'], res['share']):
+        print(f"  BASE {lat:.5f},{lon:.5f}  first on scene for {share:.1%}")
+
+if __name__ == '__main__':
+    main()
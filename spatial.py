@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+
+# --- Geodesic Distance ---
+EARTH_RADIUS_MI = 3958.8
+MILES_PER_DEG_LAT = EARTH_RADIUS_MI * math.pi / 180
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MI * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def distance_miles(origin, points):
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    return haversine_miles(origin[0], origin[1], points[:, 0], points[:, 1])
+
+def bearing_deg(origin, points):
+    # Initial great-circle bearing from origin to each point, degrees clockwise from north.
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    lat1, lon1 = np.radians(origin[0]), np.radians(origin[1])
+    lat2, lon2 = np.radians(points[:, 0]), np.radians(points[:, 1])
+    y = np.sin(lon2 - lon1) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+def miles_to_degrees(lat, miles):
+    miles = np.asarray(miles, dtype=float)
+    return miles / MILES_PER_DEG_LAT, miles / (MILES_PER_DEG_LAT * math.cos(math.radians(lat)))
+
+# --- Unit Index (grid buckets) ---
+# Units are projected onto a local equirectangular plane (miles) and bucketed
+# into square cells. A k-nearest query walks rings of cells outward from the
+# query cell until the ring is farther than the k-th candidate, then ranks
+# the candidates by true geodesic distance.
+def _project(index, lat, lon):
+    y = (np.asarray(lat, dtype=float) - index['origin'][0]) * MILES_PER_DEG_LAT
+    x = (np.asarray(lon, dtype=float) - index['origin'][1]) * MILES_PER_DEG_LAT * index['lon_scale']
+    return x, y
+
+def build_unit_index(positions, cell_miles=None):
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+    origin = positions.mean(axis=0) if len(positions) else np.zeros(2)
+    index = {
+        'positions': positions,
+        'origin': origin,
+        'lon_scale': math.cos(math.radians(origin[0])),
+        'cells': {},
+    }
+
+    x, y = _project(index, positions[:, 0], positions[:, 1])
+    if cell_miles is None:
+        span = max(np.ptp(x) if len(x) else 0, np.ptp(y) if len(y) else 0, 1.0)
+        cell_miles = max(span / math.sqrt(max(len(positions), 1)) * 1.5, 0.05)
+    index['cell_miles'] = cell_miles
+
+    ix = np.floor(x / cell_miles).astype(np.int64)
+    iy = np.floor(y / cell_miles).astype(np.int64)
+    order = np.lexsort((iy, ix))
+    if len(order):
+        keys = np.column_stack([ix[order], iy[order]])
+        starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+        for start, end in zip(starts, np.r_[starts[1:], len(order)]):
+            index['cells'][(int(keys[start, 0]), int(keys[start, 1]))] = order[start:end]
+        index['extent'] = (int(ix.min()), int(ix.max()), int(iy.min()), int(iy.max()))
+    return index
+
+def _ring_cells(cx, cy, r):
+    if r == 0:
+        yield (cx, cy)
+        return
+    for dx in range(-r, r + 1):
+        yield (cx + dx, cy - r)
+        yield (cx + dx, cy + r)
+    for dy in range(-r + 1, r):
+        yield (cx - r, cy + dy)
+        yield (cx + r, cy + dy)
+
+def nearest_units(index, point, k=1):
+    n = len(index['positions'])
+    k = min(k, n)
+    if k == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    cell = index['cell_miles']
+    x, y = _project(index, point[0], point[1])
+    cx, cy = int(math.floor(x / cell)), int(math.floor(y / cell))
+    x_min, x_max, y_min, y_max = index['extent']
+    max_ring = max(abs(cx - x_min), abs(cx - x_max), abs(cy - y_min), abs(cy - y_max))
+
+    found = []
+    count = 0
+    for r in range(max_ring + 1):
+        for key in _ring_cells(cx, cy, r):
+            members = index['cells'].get(key)
+            if members is not None:
+                found.append(members)
+                count += len(members)
+        # Every unit outside ring r is more than r cells away; stopping one
+        # ring later absorbs the planar-vs-geodesic error of the projection.
+        if count >= k:
+            cand = np.concatenate(found)
+            px, py = _project(index, index['positions'][cand, 0], index['positions'][cand, 1])
+            kth = np.partition(np.hypot(px - x, py - y), k - 1)[k - 1]
+            if kth <= (r - 1) * cell:
+                break
+
+    cand = np.concatenate(found)
+    dist = distance_miles(point, index['positions'][cand])
+    top = np.argsort(dist, kind='stable')[:k]
+    return cand[top], dist[top]
@@ -0,0 +1,195 @@
+import argparse
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from fleet import FLEET_PATH, load_fleet
+from mission import compute_fleet_missions
+from scenario import INCIDENT_RADIUS_MI, sample_incidents
+from siting import UNCOVERED_PENALTY_SEC, load_points
+from zipindex import lookup_zip
+
+# --- Spec Sweep ---
+# "What airframe should we buy?": every combination of speed, endurance,
+# range and recharge time is one row of a synthetic fleet, so the whole grid
+# goes through the same mission kernel as the catalog, a chunk of specs x all
+# incidents at a time (chunks are sized so a chunk stays under MAX_CELLS
+# mission cells). Each spec is scored by its arrival over the incidents
+# (launch delay + flight out; an incident it can't reach counts as
+# UNCOVERED_PENALTY_SEC) and its on-scene time (hover left after the round
+# trip). The frontier is the specs no other spec beats on both. On a full
+# grid every axis helps both scores, so the frontier is its best corner;
+# --specs scores a CSV of real candidates (drones.csv columns), where speed is
+# bought with endurance and the frontier is the shortlist.
+MAX_CELLS = 2_000_000
+SPEC_COLUMNS = ('speed_mph', 'flight_time_min', 'range_miles', 'recharge_min')
+DEFAULT_RANGES = {'speed_mph': '20:80:100', 'flight_time_min': '10:70:100', 'range_miles': '99', 'recharge_min': '30'}
+DEFAULT_WIND_LIMIT = 30.0
+P90 = 0.9
+
+def parse_range(text):
+    # "LO:HI:N" (N evenly spaced values), "A,B,C" or a single value
+    if ':' in text:
+        lo, hi, n = text.split(':')
+        return np.linspace(float(lo), float(hi), int(n))
+    return np.array([float(v) for v in text.split(',')])
+
+def spec_grid(values, max_wind_mph=DEFAULT_WIND_LIMIT, battery_swap=False):
+    # values: column -> 1-D array; every combination, as fleet arrays
+    grid = np.array(list(itertools.product(*(values[c] for c in SPEC_COLUMNS))), dtype=float).reshape(-1, len(SPEC_COLUMNS))
+    fleet = {c: grid[:, i] for i, c in enumerate(SPEC_COLUMNS)}
+    fleet['model'] = np.array([f"S{s:g} F{f:g} R{r:g} C{c:g}" for s, f, r, c in grid.round(1)], dtype=object)
+    fleet['max_wind_mph'] = np.full(len(grid), float(max_wind_mph))
+    fleet['battery_swap'] = np.full(len(grid), bool(battery_swap))
+    return fleet
+
+def _score_chunk(fleet, base, targets, launch_delay, wind):
+    m = compute_fleet_missions(fleet, base, targets, wind)
+    covered = m['possible']
+    n_covered = covered.sum(axis=1)
+    arrival = np.where(covered, launch_delay[None, :] + m['t_out'], UNCOVERED_PENALTY_SEC)
+    k = int(np.ceil(P90 * arrival.shape[1])) - 1
+    with np.errstate(invalid='ignore'):
+        return {
+            'coverage': n_covered / arrival.shape[1],
+            'mean_arrival_sec': arrival.mean(axis=1),
+            # copied: a column view would keep the whole partitioned chunk alive
+            'p90_arrival_sec': np.partition(arrival, k, axis=1)[:, k].copy(),
+            'on_scene_sec': np.where(covered, m['t_hov'], 0.0).sum(axis=1) / np.maximum(n_covered, 1),
+            'turnaround_min': np.where(covered, m['turnaround_min'], 0.0).sum(axis=1) / np.maximum(n_covered, 1),
+        }
+
+def evaluate_specs(fleet, base, targets, launch_delay, wind=None, max_cells=MAX_CELLS):
+    targets = np.asarray(targets, dtype=float).reshape(-1, 2)
+    n = len(fleet['model'])
+    chunk = max(1, max_cells // max(len(targets), 1))
+    parts = []
+    for start in range(0, n, chunk):
+        sl = slice(start, start + chunk)
+        parts.append(_score_chunk({k: v[sl] for k, v in fleet.items()}, base, targets, launch_delay, wind))
+    out = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+    out['frontier'] = pareto_front(out['mean_arrival_sec'], out['on_scene_sec'])
+    return out
+
+def pareto_front(arrival, on_scene):
+    # specs not beaten on both (lower arrival, longer on scene), fastest first
+    order = np.lexsort((-on_scene, arrival))
+    best = np.maximum.accumulate(on_scene[order])
+    keep = np.r_[True, on_scene[order][1:] > best[:-1]]
+    return order[keep]
+
+def results_frame(fleet, scores):
+    df = pd.DataFrame({'spec': fleet['model'], **{c: fleet[c] for c in SPEC_COLUMNS}})
+    for k, v in scores.items():
+        if k != 'frontier':
+            df[k] = v
+    df['frontier'] = False
+    df.loc[scores['frontier'], 'frontier'] = True
+    return df
+
+# --- Plot ---
+def frontier_figure(df, catalog_df=None, title=None):
+    import plotly.graph_objects as go
+
+    hover = "%{text}<br>arrival %{x:.1f} min · on scene %{y:.1f} min<br>covered %{marker.color:.0%}<extra></extra>"
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=df['mean_arrival_sec'] / 60, y=df['on_scene_sec'] / 60, mode='markers', name='specs', text=df['spec'],
+        marker=dict(size=4, color=df['coverage'], colorscale='Viridis', cmin=0, cmax=1, opacity=0.5,
+                    colorbar=dict(title='covered', tickformat='.0%')),
+        hovertemplate=hover))
+    front = df[df['frontier']].sort_values('mean_arrival_sec')
+    fig.add_trace(go.Scatter(
+        x=front['mean_arrival_sec'] / 60, y=front['on_scene_sec'] / 60, mode='lines+markers', name='frontier',
+        text=front['spec'], line=dict(color='#00D2FF', width=2), marker=dict(size=6, color='#00D2FF'),
+        hovertemplate="%{text}<br>arrival %{x:.1f} min · on scene %{y:.1f} min<extra>frontier</extra>"))
+    if catalog_df is not None and len(catalog_df):
+        fig.add_trace(go.Scatter(
+            x=catalog_df['mean_arrival_sec'] / 60, y=catalog_df['on_scene_sec'] / 60, mode='markers+text', name='catalog',
+            text=catalog_df['spec'], textposition='top center', marker=dict(symbol='star', size=12, color='#FF3B3B'),
+            hovertemplate="%{text}<br>arrival %{x:.1f} min · on scene %{y:.1f} min<extra>catalog</extra>"))
+    fig.update_layout(template='plotly_dark', title=title, xaxis_title='mean arrival (min, uncovered = 30)',
+                      yaxis_title='mean on-scene time (min)', legend=dict(orientation='h', y=-0.15))
+    return fig
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep airframe specs against a set of incidents and plot the frontier")
+    parser.add_argument('zip', nargs='?', help="5-digit ZIP for the drone base")
+    parser.add_argument('--base', help="LAT,LON for the drone base (overrides ZIP)")
+    parser.add_argument('--points', help="CSV of incidents with lat/lon columns (default: synthetic around the base)")
+    parser.add_argument('-n', type=int, default=10_000, help="synthetic incident count")
+    parser.add_argument('--radius', type=float, default=INCIDENT_RADIUS_MI, help="synthetic incident radius (miles)")
+    for col in SPEC_COLUMNS:
+        parser.add_argument(f"--{col.rsplit('_', 1)[0].replace('_', '-')}", dest=col, default=DEFAULT_RANGES[col],
+                            help=f"{col}: LO:HI:N, A,B,C or one value (default {DEFAULT_RANGES[col]})")
+    parser.add_argument('--specs', help="score the candidate airframes in this CSV (drones.csv columns) instead of a grid")
+    parser.add_argument('--like', help="take max_wind_mph and battery_swap from this catalog model")
+    parser.add_argument('--wind', help="SPEED_MPH,FROM_DEG")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-cells', type=int, default=MAX_CELLS, help="mission cells (specs x incidents) per chunk")
+    parser.add_argument('--fleet', default=FLEET_PATH)
+    parser.add_argument('--csv', help="write every spec's scores here")
+    parser.add_argument('--plot', help="write the frontier plot (HTML) here")
+    parser.add_argument('--top', type=int, default=10, help="frontier rows to print")
+    args = parser.parse_args(argv)
+
+    if args.base:
+        base = [float(v) for v in args.base.split(',')]
+    elif args.zip:
+        base = lookup_zip(args.zip)
+        if base is None:
+            raise SystemExit(f"Unknown ZIP: {args.zip}")
+    else:
+        parser.error("give a ZIP or --base LAT,LON")
+
+    rng = np.random.default_rng(args.seed)
+    if args.points:
+        targets = load_points(args.points)
+        launch_delay = sample_incidents(rng, base, len(targets))['launch_delay']
+    else:
+        inc = sample_incidents(rng, base, args.n, args.radius)
+        targets, launch_delay = np.column_stack([inc['lat'], inc['lon']]), inc['launch_delay']
+    if not len(targets):
+        raise SystemExit("no incidents with lat/lon")
+
+    catalog = load_fleet(args.fleet)
+    max_wind, swap = DEFAULT_WIND_LIMIT, False
+    if args.like:
+        hit = np.flatnonzero(catalog.models == args.like)
+        if not len(hit):
+            raise SystemExit(f"Unknown model: {args.like}")
+        max_wind, swap = float(catalog.arrays['max_wind_mph'][hit[0]]), bool(catalog.arrays['battery_swap'][hit[0]])
+    wind = tuple(float(v) for v in args.wind.split(',')) if args.wind else None
+
+    if args.specs:
+        fleet = load_fleet(args.specs).arrays
+    else:
+        fleet = spec_grid({c: parse_range(getattr(args, c)) for c in SPEC_COLUMNS}, max_wind, swap)
+    start = time.perf_counter()
+    scores = evaluate_specs(fleet, base, targets, launch_delay, wind, args.max_cells)
+    elapsed = time.perf_counter() - start
+    df = results_frame(fleet, scores)
+    catalog_df = results_frame(catalog.arrays, evaluate_specs(catalog.arrays, base, targets, launch_delay, wind, args.max_cells))
+
+    print(f"{len(df):,} specs x {len(targets):,} incidents ({elapsed:.1f}s); {int(df['frontier'].sum())} on the frontier")
+    print(f"  {'SPEC':<28} {'ARRIVAL':>8} {'P90':>7} {'ON SCENE':>9} {'COVERED':>8} {'TURN':>6}")
+    front = df[df['frontier']].sort_values('mean_arrival_sec')
+    picks = front.iloc[np.unique(np.linspace(0, len(front) - 1, min(args.top, len(front))).round().astype(int))]
+    for label, rows in (('', picks), ('catalog: ', catalog_df)):
+        for r in rows.itertuples():
+            print(f"  {label + r.spec:<28} {r.mean_arrival_sec / 60:7.1f}m {r.p90_arrival_sec / 60:6.1f}m "
+                  f"{r.on_scene_sec / 60:8.1f}m {r.coverage:8.0%} {r.turnaround_min:5.0f}m")
+    if len(front) == 1 and not args.specs:
+        print("  (one spec wins on both scores: every axis of a grid helps both; use --specs for candidates that trade off)")
+
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+    if args.plot:
+        frontier_figure(df, catalog_df, f"{len(df):,} specs x {len(targets):,} incidents").write_html(args.plot)
+        print(f"plot: {args.plot}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pytest
+from starlette.requests import Request
+
+import api
+
+BODY = {'base': [40.75, -73.99], 'target': [40.77, -73.96], 'squads': [[40.76, -73.98], [40.70, -73.90]]}
+
+def post(handler, body):
+    payload = json.dumps(body).encode()
+
+    async def receive():
+        return {'type': 'http.request', 'body': payload, 'more_body': False}
+
+    async def call():
+        return await handler(Request({'type': 'http', 'method': 'POST', 'headers': [], 'query_string': b''}, receive))
+
+    resp = asyncio.run(call())
+    return resp.status_code, json.loads(resp.body)
+
+@pytest.mark.parametrize('value', [[[1, 2, 3, 4]], [1, 2, 3, 4], [[[40.7, -73.9]]], [[40.7, -73.9], [40.8]], 'abc', [['a', 'b']]])
+def test_points_rejects_anything_but_lat_lon_pairs(value):
+    with pytest.raises(api.BadRequest):
+        api._points(value, 'targets')
+
+def test_points_accepts_pairs_and_empty():
+    assert api._points([[40.7, -73.9], [40.8, -74.0]], 'targets').shape == (2, 2)
+    assert api._points([], 'targets').shape == (0, 2)
+
+@pytest.mark.parametrize('handler, key', [(api.mission, 'squads'), (api.mission_batch_endpoint, 'targets'), (api.mission_batch_endpoint, 'squads')])
+def test_malformed_rows_are_a_400(handler, key):
+    body = dict(BODY, targets=[[40.77, -73.96]])
+    body[key] = [[40.77, -73.96, 40.78, -73.95]]
+    status, reply = post(handler, body)
+    assert status == 400 and key in reply['error']
+
+def test_single_mission_looks_up_the_officer_off_the_event_loop(monkeypatch):
+    seen = []
+    real = api.officer_one
+
+    def officer_one(base, squads, target):
+        seen.append(threading.current_thread() is threading.main_thread())
+        return real(base, squads, target)
+
+    monkeypatch.setattr(api, 'officer_one', officer_one)
+    status, reply = post(api.mission, BODY)
+    assert status == 200 and seen == [False]
+    assert reply['officer']['unit'] == 0 and len(reply['models']) == len(api.load_fleet().models)
+
+def test_single_mission_without_squads_has_no_officer():
+    status, reply = post(api.mission, {'base': BODY['base'], 'target': BODY['target']})
+    assert status == 200 and reply['officer'] is None
+    assert reply['distance_mi'] == pytest.approx(float(api.distance_miles(BODY['base'], np.array([BODY['target']]))[0]), abs=1e-3)
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+from profiling import PROFILE_ENV, PROFILE_LOG_ENV
+from results_store import RESULTS_DB_ENV
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'drone_sim.py')
+BASE = {'lat': 40.7506, 'lng': -73.9972}
+TARGET = {'lat': 40.7606, 'lng': -73.9872}
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    import streamlit as st
+    import streamlit_folium
+    import zipindex
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setenv(PROFILE_ENV, '1')
+    monkeypatch.setenv(PROFILE_LOG_ENV, str(tmp_path / 'profile.jsonl'))
+    monkeypatch.setenv(RESULTS_DB_ENV, str(tmp_path / 'runs.sqlite'))
+    monkeypatch.setattr(zipindex, 'lookup_zip', lambda zip_code, index=None: [40.75065, -73.99718])
+    # no browser: the map's click comes from session state
+    monkeypatch.setattr(streamlit_folium, 'st_folium', lambda *a, **k: {'last_clicked': st.session_state.get('_test_click')})
+    return AppTest.from_file(APP, default_timeout=120)
+
+def read_log(tmp_path):
+    with open(tmp_path / 'profile.jsonl', encoding='utf-8') as fh:
+        return [json.loads(line) for line in fh]
+
+def test_runs_ended_by_a_rerun_are_profiled(app, tmp_path):
+    app.run()
+    app.text_input(key='zip_input').input('10001').run()
+    app.session_state['_test_click'] = BASE
+    app.run()
+    app.session_state['_test_click'] = TARGET
+    app.run()
+    assert not app.exception
+
+    recs = read_log(tmp_path)
+    assert [r['run'] for r in recs] == list(range(1, len(recs) + 1))
+    assert [r['run'] for r in recs] == list(range(1, app.session_state['profile_runs'] + 1))
+    ends = [r['end'] for r in recs]
+    # ZIP, base click and target click each end in a rerun
+    assert ends.count('rerun') == 3 and ends.count('done') == len(recs) - 3
+    zip_run = next(r for r in recs if any(p['name'] == 'zip_lookup' for p in r['phases']))
+    assert zip_run['end'] == 'rerun'
+    clicks = [r for r in recs if r['end'] == 'rerun' and any(p['name'] == 'st_folium' for p in r['phases'])]
+    assert len(clicks) == 2
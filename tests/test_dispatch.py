@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from dispatch import add_target, add_targets, best_launch, dispatch, launch_times, new_board, stock_mask
+from fleet import load_fleet
+from mission import compute_fleet_missions
+
+BASES = [(40.75, -73.99), (40.80, -73.95), (40.70, -73.90)]
+
+@pytest.fixture(scope='module')
+def fleet():
+    return load_fleet()
+
+def random_targets(n, seed):
+    return np.array(BASES[0]) + np.random.default_rng(seed).uniform(-0.12, 0.12, (n, 2))
+
+def brute_force(fleet, stock, target, wind):
+    # fastest stocked (base, model) by trying every pair
+    best = (-1, -1, np.inf)
+    for b, base in enumerate(BASES):
+        m = compute_fleet_missions(fleet, base, [target], wind)
+        for i in range(len(fleet.models)):
+            if stock[b, i] and m['possible'][i, 0] and m['t_out'][i, 0] < best[2]:
+                best = (b, i, float(m['t_out'][i, 0]))
+    return best
+
+def test_stock_mask_reads_inventories(fleet):
+    models = fleet.models
+    stock = stock_mask(models, [None, [models[1]], []])
+    assert stock[0].all()
+    assert stock[1].tolist() == [i == 1 for i in range(len(models))]
+    assert not stock[2].any()
+
+@pytest.mark.parametrize('wind', [None, (15.0, 250.0)])
+def test_dispatch_matches_every_base_model_pair(fleet, wind):
+    models = fleet.models
+    stock = stock_mask(models, [None, models[::2], [models[-1]]])
+    board = new_board(fleet, BASES, stock, wind)
+    for target in random_targets(60, seed=4):
+        assert dispatch(board, target) == pytest.approx(brute_force(fleet, stock, target, wind))
+
+def test_chunked_launch_times_match_one_block(fleet):
+    targets = random_targets(50, seed=5)
+    wind = (np.linspace(0, 30, 50), np.linspace(0, 350, 50))
+    whole = launch_times(fleet, BASES, targets, wind=wind)
+    np.testing.assert_array_equal(launch_times(fleet, BASES, targets, wind=wind, max_cells=7), whole)
+
+def test_board_grows_and_keeps_its_rows(fleet):
+    board = new_board(fleet, BASES, rows=2)
+    targets = random_targets(40, seed=6)
+    first = add_targets(board, targets[:3])
+    assert first.tolist() == [0, 1, 2] and len(board['targets']) == 4
+    rows = add_targets(board, np.vstack([targets, targets[:5]]))
+    assert board['n'] == 40 and len(board['targets']) == 64
+    assert rows[:3].tolist() == first.tolist() and rows[40:].tolist() == rows[:5].tolist()
+    # every row still holds its own target's times after the copies
+    np.testing.assert_array_equal(board['targets'][:40], targets)
+    np.testing.assert_array_equal(board['t_out'][:40], launch_times(fleet, BASES, targets).transpose(2, 0, 1))
+
+def test_a_known_target_costs_no_new_row(fleet):
+    board = new_board(fleet, BASES)
+    target = random_targets(1, seed=7)[0]
+    row = add_target(board, target)
+    assert dispatch(board, target) == dispatch(board, tuple(target))
+    assert board['n'] == 1 and add_target(board, target) == row
+
+def test_nothing_can_fly_a_far_target(fleet):
+    board = new_board(fleet, BASES)
+    add_target(board, (45.0, -70.0))
+    base, model, sec = best_launch(board)
+    assert base.tolist() == [-1] and model.tolist() == [-1] and sec[0] == np.inf
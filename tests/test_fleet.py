@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from fleet import FleetCatalogError, load_fleet
+
+HEADER = 'model,flight_time_min,speed_mph,range_miles,max_wind_mph,recharge_min,battery_swap\n'
+GOOD = HEADER + 'ALPHA,26,32,99,28,25,false\nBRAVO,55,48,99,42,1,true\n'
+
+def write(tmp_path, text, name='drones.csv'):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+def test_loads_a_valid_catalog(tmp_path):
+    fleet = load_fleet(write(tmp_path, GOOD))
+    assert list(fleet.models) == ['ALPHA', 'BRAVO']
+    assert list(fleet.arrays['battery_swap']) == [False, True]
+    assert fleet.arrays['speed_mph'].tolist() == [32.0, 48.0]
+
+def test_missing_column(tmp_path):
+    text = GOOD.replace(',max_wind_mph', '').replace(',28,', ',').replace(',42,', ',')
+    with pytest.raises(FleetCatalogError, match='missing column.*max_wind_mph'):
+        load_fleet(write(tmp_path, text))
+
+def test_non_numeric_value(tmp_path):
+    with pytest.raises(FleetCatalogError, match=r'speed_mph must be numeric \(rows 3\)'):
+        load_fleet(write(tmp_path, GOOD.replace('BRAVO,55,48', 'BRAVO,55,fast')))
+
+def test_negative_recharge(tmp_path):
+    with pytest.raises(FleetCatalogError, match=r'recharge_min must be >= 0 \(rows 2\)'):
+        load_fleet(write(tmp_path, GOOD.replace(',25,false', ',-5,false')))
+
+def test_bad_battery_swap(tmp_path):
+    with pytest.raises(FleetCatalogError, match=r'battery_swap must be true/false \(rows 3\)'):
+        load_fleet(write(tmp_path, GOOD.replace(',1,true', ',1,maybe')))
+
+def test_errors_are_reported_together(tmp_path):
+    text = GOOD.replace('ALPHA,26', 'ALPHA,0').replace(',1,true', ',1,maybe')
+    with pytest.raises(FleetCatalogError) as err:
+        load_fleet(write(tmp_path, text))
+    assert 'flight_time_min must be > 0' in str(err.value)
+    assert 'battery_swap must be true/false' in str(err.value)
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FleetCatalogError, match='could not read'):
+        load_fleet(str(tmp_path / 'nope.csv'))
+
+def test_rewritten_file_is_reloaded(tmp_path):
+    path = write(tmp_path, GOOD)
+    first = load_fleet(path)
+    assert load_fleet(path) is first  # cached on (path, mtime_ns)
+
+    with open(path, 'w') as fh:
+        fh.write(GOOD.replace('BRAVO,55,48', 'BRAVO,55,50'))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, first.mtime_ns + 1_000_000))
+    second = load_fleet(path)
+    assert second is not first
+    assert second.arrays['speed_mph'].tolist() == [32.0, 50.0]
+    assert second.spec_hash != first.spec_hash
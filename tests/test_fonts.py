@@ -0,0 +1,15 @@
+import os
+import re
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'fonts')
+
+def test_stylesheet_serves_only_bundled_files():
+    with open(os.path.join(FONTS_DIR, 'fonts.css'), encoding='utf-8') as fh:
+        css = fh.read()
+    assert '@import' not in css and '//' not in css
+    urls = re.findall(r"url\('([^']+)'\)", css)
+    assert len(urls) == 5
+    for name in urls:
+        path = os.path.join(FONTS_DIR, name)
+        with open(path, 'rb') as fh:
+            assert fh.read(4) == b'wOF2', name
@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+import pytest
+
+from mission import RESERVE_SEC, compute_fleet_missions, ground_speed_mph
+from spatial import EARTH_RADIUS_MI
+
+BASE = (40.75, -73.99)
+
+def random_fleet(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'model': np.array([f"M{i}" for i in range(n)], dtype=object),
+        'flight_time_min': rng.uniform(10, 60, n),
+        'speed_mph': rng.uniform(20, 70, n),
+        'range_miles': rng.uniform(2, 20, n),
+        'max_wind_mph': rng.uniform(15, 45, n),
+        'recharge_min': rng.uniform(1, 60, n),
+        'battery_swap': rng.random(n) < 0.5,
+    }
+
+def random_targets(n, seed=1, span_deg=0.15):
+    return np.asarray(BASE) + np.random.default_rng(seed).uniform(-span_deg, span_deg, (n, 2))
+
+def miles(a, b):
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MI * math.asin(math.sqrt(h))
+
+def test_still_air_matches_a_per_model_per_target_loop():
+    fleet, targets = random_fleet(7), random_targets(40)
+    m = compute_fleet_missions(fleet, BASE, targets)
+    assert m['t_out'].shape == (7, 40)
+    for i in range(7):
+        batt = fleet['flight_time_min'][i] * 60
+        for j, target in enumerate(targets):
+            d = miles(BASE, target)
+            t_out = d / fleet['speed_mph'][i] * 3600
+            hover = batt - RESERVE_SEC - 2 * t_out
+            possible = hover >= 0 and d <= fleet['range_miles'][i]
+            t_total = 2 * t_out + (hover if possible else 0.0)
+            turnaround = fleet['recharge_min'][i] * (1.0 if fleet['battery_swap'][i] else t_total / batt)
+            assert m['dist'][j] == pytest.approx(d, rel=1e-9)
+            assert m['t_out'][i, j] == pytest.approx(t_out, rel=1e-9)
+            assert m['possible'][i, j] == possible
+            assert m['t_total'][i, j] == pytest.approx(t_total, rel=1e-9)
+            assert m['turnaround_min'][i, j] == pytest.approx(turnaround, rel=1e-9)
+
+def test_swap_turnaround_is_flat_and_recharge_scales_with_battery_used():
+    fleet = random_fleet(2)
+    fleet['battery_swap'] = np.array([True, False])
+    fleet['recharge_min'] = np.array([3.0, 40.0])
+    fleet['range_miles'] = np.array([50.0, 50.0])
+    m = compute_fleet_missions(fleet, BASE, random_targets(10, span_deg=0.02))
+    assert np.all(m['turnaround_min'][0] == 3.0)
+    used = m['t_total'][1] / (fleet['flight_time_min'][1] * 60)
+    assert np.allclose(m['turnaround_min'][1], 40.0 * used)
+    # a flyable mission hovers until the reserve, so it always uses all but the reserve
+    ok = m['possible'][1]
+    assert ok.any()
+    assert np.allclose(used[ok], 1 - RESERVE_SEC / (fleet['flight_time_min'][1] * 60))
+
+@pytest.mark.parametrize('track, wind_from, expected', [
+    (0.0, 0.0, 40.0),     # headwind
+    (0.0, 180.0, 60.0),   # tailwind
+    (90.0, 0.0, math.sqrt(50 ** 2 - 10 ** 2)),  # pure crosswind
+])
+def test_ground_speed_known_cases(track, wind_from, expected):
+    assert ground_speed_mph(50.0, track, 10.0, wind_from) == pytest.approx(expected)
+
+def test_ground_speed_holds_airspeed_through_the_air():
+    # the air velocity (ground velocity minus wind) must have the airspeed's length
+    rng = np.random.default_rng(3)
+    track, wind_from = rng.uniform(0, 360, 500), rng.uniform(0, 360, 500)
+    wind, air = rng.uniform(0, 40, 500), 45.0
+    gs = ground_speed_mph(air, track, wind, wind_from)
+    flyable = gs > 0
+    t, w = np.radians(track), np.radians(wind_from + 180)
+    vx = gs * np.sin(t) - wind * np.sin(w)
+    vy = gs * np.cos(t) - wind * np.cos(w)
+    assert np.allclose(np.hypot(vx, vy)[flyable], air)
+
+def test_crosswind_at_airspeed_or_a_stronger_headwind_is_unflyable():
+    assert ground_speed_mph(30.0, 90.0, 30.0, 0.0) <= 0
+    assert ground_speed_mph(30.0, 0.0, 35.0, 0.0) <= 0
+    fleet = random_fleet(1)
+    fleet['speed_mph'], fleet['max_wind_mph'] = np.array([30.0]), np.array([60.0])
+    target = np.array([[BASE[0] + 0.01, BASE[1]]])  # due north
+    m = compute_fleet_missions(fleet, BASE, target, wind=(35.0, 0.0))
+    assert m['fail_wind'][0, 0] and not m['possible'][0, 0] and m['t_out'][0, 0] == np.inf
+
+def test_wind_over_the_model_limit_grounds_it():
+    fleet = random_fleet(3)
+    fleet['max_wind_mph'] = np.array([10.0, 30.0, 50.0])
+    fleet['range_miles'] = np.full(3, 50.0)
+    fleet['flight_time_min'] = np.full(3, 60.0)
+    m = compute_fleet_missions(fleet, BASE, random_targets(5, span_deg=0.01), wind=(20.0, 90.0))
+    assert m['fail_wind'][0].all() and not m['possible'][0].any()
+    assert not m['fail_wind'][1:].any()
+
+def test_several_bases_stack_the_single_base_results():
+    fleet, targets = random_fleet(5), random_targets(30)
+    bases = np.asarray(BASE) + np.array([[0.0, 0.0], [0.05, -0.03], [-0.04, 0.06]])
+    wind = (np.linspace(0, 30, 30), np.linspace(0, 359, 30))
+    multi = compute_fleet_missions(fleet, bases, targets, wind=wind)
+    assert multi['t_out'].shape == (3, 5, 30) and multi['dist'].shape == (3, 30)
+    for b, base in enumerate(bases):
+        one = compute_fleet_missions(fleet, base, targets, wind=wind)
+        for key in ('dist', 't_out', 't_back', 't_total', 'possible', 'turnaround_min', 'fail_wind'):
+            np.testing.assert_array_equal(multi[key][b], one[key], err_msg=key)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from fleet import load_fleet
+from montecarlo import ARRIVAL_BINS, _hist, hist_percentile, merge_histograms, run_monte_carlo, score_incidents, summarize
+from scenario import SEVERITIES
+
+BASE = (40.75, -73.99)
+
+def random_calls(n, seed):
+    rng = np.random.default_rng(seed)
+    return (BASE[0] + rng.uniform(-0.05, 0.05, n), BASE[1] + rng.uniform(-0.05, 0.05, n), rng.uniform(0, 120, n),
+            rng.uniform(0, 3, n), rng.integers(-1, len(SEVERITIES), n), rng.integers(-1, 24, n))
+
+def assert_same(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        np.testing.assert_array_equal(a[key], b[key], err_msg=key)
+
+def test_seeded_runs_do_not_depend_on_the_worker_count():
+    fleet = load_fleet()
+    serial = run_monte_carlo(fleet, BASE, 3000, seed=7, workers=1, chunk_size=1000)
+    pooled = run_monte_carlo(fleet, BASE, 3000, seed=7, workers=2, chunk_size=1000)
+    assert serial == pooled
+    assert run_monte_carlo(fleet, BASE, 3000, seed=8, workers=1, chunk_size=1000) != serial
+
+def test_merged_chunks_equal_one_big_chunk():
+    fleet = load_fleet()
+    lat, lon, delay, miles, severity, hour = random_calls(900, seed=1)
+    whole = score_incidents(fleet, BASE, lat, lon, delay, miles, severity, hour)
+    total = None
+    for part in np.array_split(np.arange(900), 4):
+        total = merge_histograms(total, score_incidents(fleet, BASE, lat[part], lon[part], delay[part], miles[part], severity[part], hour[part]))
+    assert_same(total, whole)
+
+def test_merging_leaves_the_parts_untouched():
+    first = {'n': 2, 'drone_hist': np.array([1, 1])}
+    second = {'n': 3, 'drone_hist': np.array([0, 3])}
+    total = merge_histograms(merge_histograms(None, first), second)
+    assert total['n'] == 5 and total['drone_hist'].tolist() == [1, 4]
+    assert first['drone_hist'].tolist() == [1, 1] and first['n'] == 2
+
+@pytest.mark.parametrize('q', [0.1, 0.5, 0.9, 0.99])
+def test_hist_percentile_is_within_a_bin_of_numpy(q):
+    values = np.random.default_rng(2).gamma(3.0, 200.0, 5000)
+    values = values[values < ARRIVAL_BINS[-1]]
+    got = hist_percentile(_hist(values, ARRIVAL_BINS), ARRIVAL_BINS, q)
+    assert abs(got - np.percentile(values, q * 100)) <= 1.0
+
+def test_summarize_an_empty_histogram():
+    stats = summarize(np.zeros(len(ARRIVAL_BINS) - 1, dtype=np.int64), ARRIVAL_BINS)
+    assert stats['n'] == 0 and np.isnan(stats['p50']) and np.isnan(stats['p90'])
@@ -0,0 +1,62 @@
+import json
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from engine import simulate
+from fleet import load_fleet
+from playback import delta_encode, playback_payload
+
+def delta_decode(enc):
+    # what the playback component does: start from init, apply tick i's
+    # [drone, value, ...] pairs to get tick i + 1
+    cur = list(enc['init'])
+    frames = [list(cur)]
+    for pairs in enc['delta']:
+        for j in range(0, len(pairs), 2):
+            cur[pairs[j]] = pairs[j + 1]
+        frames.append(list(cur))
+    return np.array(frames)
+
+def test_round_trip_with_unchanged_frames():
+    rng = np.random.default_rng(0)
+    arr = rng.integers(0, 4, (60, 5))
+    arr[10:20] = arr[9]  # a run of ticks where nothing moves
+    arr[30:, 2] = 7      # one drone frozen from tick 30 on
+    enc = json.loads(json.dumps(delta_encode(arr)))
+    assert enc['init'] == arr[0].tolist()
+    assert len(enc['delta']) == len(arr) - 1
+    assert all(enc['delta'][t] == [] for t in range(9, 19))
+    assert np.array_equal(delta_decode(enc), arr)
+
+def test_round_trip_floats():
+    progress = np.round(np.cumsum(np.random.default_rng(1).random((40, 3)) * (np.arange(40) % 3 == 0)[:, None], axis=0), 3)
+    assert np.array_equal(delta_decode(delta_encode(progress)), progress)
+
+def test_only_changes_are_shipped():
+    arr = np.array([[0, 0, 0], [0, 1, 0], [0, 1, 0], [2, 1, 3]])
+    enc = delta_encode(arr)
+    assert enc == {'init': [0, 0, 0], 'delta': [[1, 1], [], [0, 2, 2, 3]]}
+
+def test_single_frame_and_no_changes():
+    one = np.array([[5, 6]])
+    assert delta_encode(one) == {'init': [5, 6], 'delta': []}
+    still = np.tile([1, 2, 3], (4, 1))
+    enc = delta_encode(still)
+    assert enc['delta'] == [[], [], []]
+    assert np.array_equal(delta_decode(enc), still)
+
+def test_payload_progress_ships_three_decimals():
+    fleet = load_fleet()
+    mission, frames = simulate(fleet, (40.75, -73.99), (40.77, -73.96))
+    assert frames['progress'].dtype == np.float32
+    t_call = datetime(2026, 1, 1, 12)
+    labels = {kind: kind for kind in ('call', 'launch', 'drone_on_scene', 'officers_arrive')}
+    payload = playback_payload(fleet.models, mission, frames, labels, t_call, t_call, t_call + timedelta(minutes=9), 20)
+    progress = delta_decode(json.loads(json.dumps(payload['frames']['progress'])))
+    assert progress.shape == frames['progress'].shape
+    assert np.array_equal(progress, np.round(progress, 3))
+    assert np.abs(progress - frames['progress']).max() <= 5e-4 + 1e-7
+    # no float32 noise in the JSON text either
+    assert not re.search(r"\.\d{4}", json.dumps(payload['frames']['progress']))
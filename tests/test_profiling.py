@@ -0,0 +1,31 @@
+import pytest
+
+from profiling import PROFILE_ENV, profiling_enabled
+
+@pytest.mark.parametrize('env, debug_requested, expected', [
+    (None, False, False),
+    (None, True, False),
+    ('0', True, False),
+    ('1', False, True),
+    ('on', False, True),
+    ('debug', False, False),
+    ('debug', True, True),
+])
+def test_debug_query_param_needs_the_env_var(monkeypatch, env, debug_requested, expected):
+    if env is None:
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(PROFILE_ENV, env)
+    assert profiling_enabled(debug_requested) is expected
+
+def test_a_run_is_written_once(tmp_path):
+    from profiling import finish_run, phase, start_run
+    prof = start_run('s', 1, enabled=True)
+    with phase(prof, 'zip_lookup'):
+        pass
+    path = str(tmp_path / 'p.jsonl')
+    first = finish_run(prof, path, end='rerun')
+    assert finish_run(prof, path) is first
+    with open(path) as fh:
+        lines = fh.readlines()
+    assert len(lines) == 1 and '"end":"rerun"' in lines[0]
@@ -0,0 +1,152 @@
+import csv
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from engine import mission_column
+from fleet import load_fleet
+from mission import compute_fleet_missions
+from results_store import (BATCH_MAX, MODEL_COLUMNS, RETRY_SEC, RUN_COLUMNS, SHEET_COLUMNS, LocalSheet, ResultsWriter,
+                           SheetSink, SQLiteSink, run_record)
+
+BASE = [40.75, -73.99]
+
+class BlockingSink:
+    # holds the writer thread in its first write until released
+    name = 'test'
+    flush_sec = 0.0
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.records = []
+        self.closed = False
+
+    def write(self, records):
+        self.entered.set()
+        self.release.wait(5)
+        self.records.extend(records)
+
+    def close(self):
+        self.closed = True
+
+def test_close_flushes_a_backlog_larger_than_one_batch():
+    sink = BlockingSink()
+    writer = ResultsWriter([sink])
+    writer.submit({'n': 0})
+    assert sink.entered.wait(5)
+    backlog = 2 * BATCH_MAX + 7
+    for n in range(1, backlog + 1):
+        assert writer.submit({'n': n})
+    writer._stop.set()
+    sink.release.set()
+    writer.close()
+    assert [r['n'] for r in sink.records] == list(range(backlog + 1))
+    assert writer.written['test'] == backlog + 1
+    assert sink.closed
+
+def sample_records(n=3):
+    fleet = load_fleet()
+    # far enough that the short-range model can't make it
+    targets = np.array([[40.76, -73.98], [40.80, -73.90], [40.84, -73.85]])[:n]
+    missions = compute_fleet_missions(fleet, BASE, targets, wind=(10.0, 270.0))
+    return fleet.models, [run_record(fleet.models, mission_column(missions, j), BASE, targets[j], 'Burglary', 'high',
+                                     420.0, float(missions['dist'][j]), wind=(10.0, 270.0), session='s1')
+                          for j in range(len(targets))]
+
+def test_writer_stores_runs_in_sqlite_and_the_sheet(tmp_path):
+    models, records = sample_records()
+    db, sheet = str(tmp_path / 'runs.sqlite'), str(tmp_path / 'sheet.csv')
+    writer = ResultsWriter([SQLiteSink(db), SheetSink(lambda: LocalSheet(sheet))])
+    for rec in records:
+        assert writer.submit(rec)
+    writer.close()
+    assert writer.written == {'sqlite': 3, 'sheet': 3}
+
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert [r[1] for r in conn.execute('PRAGMA table_info(runs)')] == list(RUN_COLUMNS)
+        assert [r[1] for r in conn.execute('PRAGMA table_info(run_models)')] == list(MODEL_COLUMNS)
+        runs = {r[0]: r for r in conn.execute('SELECT * FROM runs')}
+        rows = conn.execute('SELECT run_id, model, possible, t_out_sec, fail FROM run_models').fetchall()
+    finally:
+        conn.close()
+    assert set(runs) == {r['run_id'] for r in records}
+    for rec in records:
+        assert runs[rec['run_id']] == tuple(rec[c] for c in RUN_COLUMNS)
+    assert len(rows) == 3 * len(models)
+    expected = {(r['run_id'], m['model']): (m['possible'], m['t_out_sec'], m['fail']) for r in records for m in r['models']}
+    assert {(run_id, model): tuple(rest) for run_id, model, *rest in rows} == expected
+    assert any(f for _, _, _, _, f in rows)  # some model could not fly one of them
+
+    with open(sheet, newline='', encoding='utf-8') as fh:
+        table = list(csv.reader(fh))
+    assert table[0] == list(SHEET_COLUMNS)
+    assert len(table) == 1 + 3 * len(models)
+    first = dict(zip(SHEET_COLUMNS, table[1]))
+    assert first['model'] == models[0] and first['incident'] == 'Burglary' and first['session'] == 's1'
+
+def test_sheet_header_is_written_once(tmp_path):
+    sheet = str(tmp_path / 'sheet.csv')
+    _, records = sample_records(2)
+    for rec in records:  # two writers, as after a server restart
+        writer = ResultsWriter([SheetSink(lambda: LocalSheet(sheet))])
+        writer.submit(rec)
+        writer.close()
+    with open(sheet, newline='', encoding='utf-8') as fh:
+        table = list(csv.reader(fh))
+    assert sum(row == list(SHEET_COLUMNS) for row in table) == 1
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FlakySink:
+    name = 'flaky'
+    flush_sec = 0.01
+
+    def __init__(self, clock, failures):
+        self.clock = clock
+        self.failures = failures
+        self.attempts = []
+        self.records = []
+
+    def write(self, records):
+        self.attempts.append(self.clock())
+        if len(self.attempts) <= self.failures:
+            raise OSError('sheet unreachable')
+        self.records.extend(records)
+
+    def close(self):
+        pass
+
+def wait_for(cond, timeout=5.0):
+    deadline = time.time() + timeout
+    while not cond() and time.time() < deadline:
+        time.sleep(0.005)
+    assert cond()
+
+def test_failing_sink_is_retried_with_backoff_then_catches_up():
+    clock = FakeClock()
+    sink = FlakySink(clock, failures=3)
+    writer = ResultsWriter([sink], clock=clock)
+    writer.submit({'n': 1})
+    wait_for(lambda: len(sink.attempts) == 1)
+    writer.submit({'n': 2})  # buffered behind the failed flush
+    for t, attempts in ((RETRY_SEC[0] - 0.1, 1), (RETRY_SEC[0], 2), (3 * RETRY_SEC[0], 3), (7 * RETRY_SEC[0], 4)):
+        clock.now = t
+        time.sleep(0.05)
+        wait_for(lambda: len(sink.attempts) == attempts)
+    # waits of 5, 10 and 20 seconds between attempts
+    assert sink.attempts == [0.0, RETRY_SEC[0], 3 * RETRY_SEC[0], 7 * RETRY_SEC[0]]
+    assert [r['n'] for r in sink.records] == [1, 2]
+    assert writer.errors['flaky'] == 3 and 'sheet unreachable' in writer.last_error['flaky']
+    assert writer.written['flaky'] == 2
+    assert writer._retry['flaky'] == RETRY_SEC[0]  # reset after a success
+    writer.close()
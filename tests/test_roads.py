@@ -0,0 +1,85 @@
+import heapq
+import math
+import os
+
+import numpy as np
+import pytest
+
+from roads import (SNAP_SEC_PER_MILE, build_csr, fastest_unit, find_graph, graph_version, save_graph, snap_to_graph,
+                   synthetic_grid_graph)
+
+CENTER = (40.75, -73.99)
+
+def dijkstra_sec(graph, start, start_sec):
+    s = graph['search']
+    dist = [math.inf] * len(s['x'])
+    dist[start] = start_sec
+    heap = [(start_sec, start)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue
+        for e in range(s['indptr'][node], s['indptr'][node + 1]):
+            nxt, nd = s['indices'][e], d + s['travel_sec'][e]
+            if nd < dist[nxt]:
+                dist[nxt] = nd
+                heapq.heappush(heap, (nd, nxt))
+    return dist
+
+def per_unit_eta(graph, units, target):
+    goal, goal_miles = snap_to_graph(graph, target)
+    etas = []
+    for pos in units:
+        node, miles = snap_to_graph(graph, pos)
+        etas.append(dijkstra_sec(graph, node, miles * SNAP_SEC_PER_MILE)[goal] + goal_miles * SNAP_SEC_PER_MILE)
+    return np.array(etas)
+
+def test_multi_source_astar_matches_per_unit_dijkstra():
+    graph = synthetic_grid_graph(CENTER, radius_miles=1.5, spacing_miles=0.1, arterial_every=5, drop_frac=0.2, seed=3)
+    rng = np.random.default_rng(7)
+    span = 1.4 / 69.0
+    for _ in range(20):
+        units = np.asarray(CENTER) + rng.uniform(-span, span, (int(rng.integers(1, 8)), 2))
+        target = np.asarray(CENTER) + rng.uniform(-span, span, 2)
+        etas = per_unit_eta(graph, units, target)
+        u, sec = fastest_unit(graph, units, target)
+        assert sec == pytest.approx(etas.min(), rel=1e-9)
+        assert etas[u] == pytest.approx(etas.min(), rel=1e-9)
+
+def two_islands():
+    # nodes 0-1 and 2-3 are connected within, never across
+    lat = np.array([40.0, 40.0, 40.1, 40.1])
+    lon = np.array([-74.0, -73.99, -74.0, -73.99])
+    src, dst = np.array([0, 1, 2, 3]), np.array([1, 0, 3, 2])
+    return build_csr(lat, lon, src, dst, np.full(4, 60.0), name='islands')
+
+def test_unreachable_target_returns_none():
+    graph = two_islands()
+    assert fastest_unit(graph, [(40.0, -74.0)], (40.1, -73.99)) is None
+
+def test_reachable_unit_wins_over_stranded_one():
+    graph = two_islands()
+    u, sec = fastest_unit(graph, [(40.0, -74.0), (40.1, -74.0)], (40.1, -73.99))
+    assert u == 1
+    assert sec == pytest.approx(60.0)
+
+def test_find_graph_falls_back_outside_covered_areas(tmp_path):
+    assert find_graph(CENTER, graph_dir=str(tmp_path / 'missing')) is None
+    assert find_graph(CENTER, graph_dir=str(tmp_path)) is None
+    save_graph(str(tmp_path / 'grid.npz'), synthetic_grid_graph(CENTER, radius_miles=1.0, spacing_miles=0.25))
+    graph = find_graph(CENTER, graph_dir=str(tmp_path))
+    assert graph is not None and graph['name'] == 'synthetic'
+    assert find_graph((CENTER[0] + 1.0, CENTER[1]), graph_dir=str(tmp_path)) is None
+
+def test_replacing_a_graph_changes_its_version(tmp_path):
+    path = str(tmp_path / 'grid.npz')
+    assert graph_version(CENTER, graph_dir=str(tmp_path)) is None
+    save_graph(path, synthetic_grid_graph(CENTER, radius_miles=1.0, spacing_miles=0.25))
+    first = graph_version(CENTER, graph_dir=str(tmp_path))
+    assert first[0] == path and graph_version((CENTER[0] + 1.0, CENTER[1]), graph_dir=str(tmp_path)) is None
+    # rewritten in place: the folder listing is unchanged, the file is not
+    save_graph(path, synthetic_grid_graph(CENTER, radius_miles=1.0, spacing_miles=0.2))
+    os.utime(path, ns=(first[1] + 10**9, first[1] + 10**9))
+    second = graph_version(CENTER, graph_dir=str(tmp_path))
+    assert second[0] == path and second != first
+    assert len(find_graph(CENTER, graph_dir=str(tmp_path))['lat']) > len(synthetic_grid_graph(CENTER, radius_miles=1.0, spacing_miles=0.25)['lat'])
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import numpy as np
+
+from scenario_cache import ScenarioCache, _freeze
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_evicts_least_recently_used():
+    cache = ScenarioCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' is now the most recent
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_byte_bound_evicts_oldest():
+    arr = np.zeros(1000)
+    cache = ScenarioCache(max_bytes=int(arr.nbytes * 2.5))
+    for key in 'abc':
+        cache.put(key, arr.copy())
+    assert cache.get('a') is None
+    assert cache.get('b') is not None and cache.get('c') is not None
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ScenarioCache(ttl_sec=10, clock=clock)
+    cache.put('k', 'v')
+    clock.now = 9.9
+    assert cache.get('k') == 'v'
+    clock.now = 10.0
+    assert cache.get('k') is None
+    stats = cache.stats()
+    assert stats['expired'] == 1 and stats['entries'] == 0
+
+def test_get_or_compute_computes_once_for_concurrent_callers():
+    cache = ScenarioCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return np.arange(3)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(('k', 1), compute)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    assert started.wait(5)
+    time.sleep(0.05)  # let the other callers reach the wait
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(r is results[0] for r in results)
+
+def test_get_or_compute_retries_after_failure():
+    cache = ScenarioCache()
+
+    def fail():
+        raise ValueError('boom')
+
+    try:
+        cache.get_or_compute('k', fail)
+    except ValueError:
+        pass
+    assert cache.get_or_compute('k', lambda: 7) == 7
+
+def test_cached_arrays_are_read_only():
+    cache = ScenarioCache()
+    value = cache.put('k', {'frames': [np.zeros(3)], 'pos': np.ones(2)})
+    assert not value['pos'].flags.writeable
+    assert not value['frames'][0].flags.writeable
+
+def test_freeze_treats_equal_keys_as_equal():
+    assert _freeze({'a': 1, 'b': [1, 2]}) == _freeze({'b': [1, 2], 'a': 1})
+    assert _freeze(['x', [1, 2]]) == _freeze(('x', (1, 2)))
+    assert _freeze(np.array([1.0, 2.0])) == _freeze(np.array([1.0, 2.0]))
+    assert _freeze(np.arange(4).reshape(2, 2)) != _freeze(np.arange(4))
+    assert _freeze(np.array([1, 2])) != _freeze(np.array([1.0, 2.0]))
+    hash(_freeze({'spec': np.ones(3), 'wind': [5, 270]}))
+
+def test_equal_keys_share_an_entry():
+    cache = ScenarioCache()
+    cache.put(('siting', {'k': 3, 'pts': np.array([1.0, 2.0])}), 'sites')
+    assert cache.get(('siting', {'pts': np.array([1.0, 2.0]), 'k': 3})) == 'sites'
+    assert cache.get(['siting', {'pts': np.array([1.0, 2.5]), 'k': 3}]) is None
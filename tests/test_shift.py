@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from mission import compute_fleet_missions
+from shift import run_shift
+
+BASE = [40.75, -73.99]
+TARGET = [40.76, -73.99]
+
+def one_model(battery_swap=True, recharge_min=10.0):
+    return {
+        'model': np.array(['TEST'], dtype=object),
+        'flight_time_min': np.array([20.0]),
+        'speed_mph': np.array([60.0]),
+        'range_miles': np.array([10.0]),
+        'max_wind_mph': np.array([30.0]),
+        'recharge_min': np.array([recharge_min]),
+        'battery_swap': np.array([battery_swap]),
+    }
+
+def shift_calls(times):
+    n = len(times)
+    return {'lat': np.full(n, TARGET[0]), 'lon': np.full(n, TARGET[1]), 'time': np.asarray(times, dtype=float)}
+
+def mission(fleet):
+    m = compute_fleet_missions(fleet, BASE, np.array([TARGET]))
+    return float(m['t_out'][0, 0]), float(m['t_total'][0, 0]), float(m['turnaround_min'][0, 0]) * 60
+
+def test_single_call_is_served_at_flight_time():
+    fleet = one_model()
+    t_out, t_total, _ = mission(fleet)
+    res = run_shift(fleet, BASE, shift_calls([100.0]), hours=8.0)
+    assert (res['served'], res['missed'], res['uncovered']) == (1, 0, 0)
+    assert res['response'][0] == pytest.approx(t_out)
+    assert res['queue_wait_mean'] == 0.0
+    assert res['served_per_hour'] == pytest.approx(1 / 8.0)
+    assert res['airframes'][0]['sorties'] == 1
+    assert res['airframes'][0]['utilization'] == pytest.approx(t_total / (8 * 3600))
+
+def test_call_queues_until_the_only_airframe_is_ready():
+    fleet = one_model()
+    t_out, t_total, turnaround = mission(fleet)
+    ready = t_total + turnaround
+    res = run_shift(fleet, BASE, shift_calls([0.0, 100.0]), max_wait_sec=ready)
+    assert res['served'] == 2 and res['peak_pending'] == 1
+    assert res['response'][1] == pytest.approx(ready - 100.0 + t_out)
+    assert res['queue_wait_mean'] == pytest.approx((ready - 100.0) / 2)
+
+def test_queued_call_past_max_wait_is_missed():
+    res = run_shift(one_model(), BASE, shift_calls([0.0, 100.0]), max_wait_sec=300.0)
+    assert (res['served'], res['missed']) == (1, 1)
+    assert list(res['outcome']) == [1, 2]
+
+def test_landed_charger_waits_for_a_free_pad():
+    fleet = one_model(battery_swap=False)
+    res = run_shift(fleet, BASE, shift_calls([0.0, 10.0]), inventory={'TEST': 2}, chargers=1)
+    assert res['served'] == 2
+    assert res['charger_wait_mean'] > 0
+
+def test_zero_inventory_leaves_every_call_uncovered():
+    res = run_shift(one_model(), BASE, shift_calls([0.0, 60.0, 120.0]), inventory={'TEST': 0})
+    assert (res['served'], res['missed'], res['uncovered']) == (0, 0, 3)
+    assert res['airframes'] == []
+    assert math.isnan(res['response_p50'])
+
+def test_zero_calls():
+    res = run_shift(one_model(), BASE, shift_calls([]))
+    assert (res['calls'], res['served'], res['missed'], res['uncovered']) == (0, 0, 0, 0)
+    assert res['served_per_hour'] == 0.0
+    assert math.isnan(res['queue_wait_mean'])
+    assert res['airframes'][0]['utilization'] == 0.0
+
+def test_rate_uses_the_shift_length_not_the_last_call():
+    res = run_shift(one_model(), BASE, shift_calls([600.0]), hours=12.0)
+    assert res['served_per_hour'] == pytest.approx(1 / 12.0)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from fleet import load_fleet
+from siting import evaluate_sites, optimize_sites, synthetic_points
+
+CENTER = (40.75, -73.99)
+
+def test_evaluate_sites_scores_the_optimized_sites_the_same():
+    fleet = load_fleet()
+    points = synthetic_points(CENTER, 4000, seed=1)
+    res = optimize_sites(points, fleet, k=2)
+    score = evaluate_sites(res['sites'], points, fleet, chunk_size=1000)
+    assert score['mean'] == pytest.approx(res['mean'])
+    assert score['p90'] == res['p90']
+    assert score['coverage'] == res['coverage']
+
+def test_more_sites_never_score_worse():
+    fleet = load_fleet()
+    points = synthetic_points(CENTER, 2000, seed=2)
+    one = evaluate_sites([CENTER], points, fleet)
+    two = evaluate_sites(np.array([CENTER, points[0]]), points, fleet)
+    assert two['mean'] <= one['mean']
+    assert two['coverage'] >= one['coverage']
+
+def test_docks_only_fly_the_models_they_stock():
+    fleet = load_fleet()
+    arrays, n = fleet.arrays, len(fleet.models)
+    points = synthetic_points(CENTER, 2000, seed=3)
+    other = points[0]
+    full = evaluate_sites([CENTER], points, fleet)
+    # an empty dock adds nothing
+    empty = np.array([[True] * n, [False] * n])
+    assert evaluate_sites([CENTER, other], points, fleet, stock=empty) == full
+    # a dock with one model scores like a fleet of just that model
+    slowest = int(np.argmin(arrays['speed_mph']))
+    only = np.arange(n) == slowest
+    one = evaluate_sites([CENTER], points, fleet, stock=[only])
+    assert one == evaluate_sites([CENTER], points, {k: v[only] for k, v in arrays.items()})
+    assert one['mean'] >= full['mean']
+    assert evaluate_sites([CENTER], points, fleet, stock=[[False] * n])['coverage'] == 0
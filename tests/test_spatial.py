@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from spatial import build_unit_index, distance_miles, nearest_units
+
+CENTER = np.array([40.75, -73.99])
+
+def clustered_units(n, seed):
+    # a few dense precincts plus scattered units, like a real roster
+    rng = np.random.default_rng(seed)
+    hubs = CENTER + rng.uniform(-0.2, 0.2, (4, 2))
+    dense = hubs[rng.integers(0, 4, n - n // 4)] + rng.normal(0, 0.005, (n - n // 4, 2))
+    sparse = CENTER + rng.uniform(-0.3, 0.3, (n // 4, 2))
+    return np.vstack([dense, sparse])
+
+def brute_force(positions, point, k):
+    dist = distance_miles(point, positions)
+    order = np.argsort(dist, kind='stable')[:k]
+    return order, dist[order]
+
+@pytest.mark.parametrize('cell_miles', [None, 0.25, 1.0, 25.0])
+@pytest.mark.parametrize('k', [1, 3, 10])
+def test_nearest_units_matches_brute_force(cell_miles, k):
+    rng = np.random.default_rng(k)
+    positions = clustered_units(300, seed=k)
+    index = build_unit_index(positions, cell_miles=cell_miles)
+    # queries inside the roster and well outside its extent
+    queries = np.vstack([CENTER + rng.uniform(-0.3, 0.3, (40, 2)), CENTER + rng.uniform(-0.6, 0.6, (10, 2))])
+    for point in queries:
+        idx, dist = nearest_units(index, point, k=k)
+        want_idx, want_dist = brute_force(positions, point, k)
+        np.testing.assert_allclose(dist, want_dist, rtol=1e-12)
+        np.testing.assert_allclose(distance_miles(point, positions[idx]), dist, rtol=1e-12)
+        assert len(set(idx.tolist())) == k
+
+def test_k_beyond_the_roster_returns_every_unit():
+    positions = clustered_units(8, seed=0)
+    idx, dist = nearest_units(build_unit_index(positions), CENTER, k=20)
+    assert sorted(idx.tolist()) == list(range(8))
+    assert np.all(np.diff(dist) >= 0)
+
+def test_empty_roster_returns_nothing():
+    idx, dist = nearest_units(build_unit_index(np.empty((0, 2))), CENTER, k=3)
+    assert len(idx) == 0 and len(dist) == 0
+
+def test_stacked_units_share_a_cell():
+    positions = np.vstack([np.tile(CENTER, (5, 1)), CENTER + 0.05])
+    idx, dist = nearest_units(build_unit_index(positions), CENTER + 0.049, k=1)
+    assert idx.tolist() == [5]
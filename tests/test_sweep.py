@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import pytest
+
+from mission import compute_fleet_missions
+from scenario import sample_incidents
+from siting import UNCOVERED_PENALTY_SEC
+from sweep import P90, evaluate_specs, parse_range, pareto_front, spec_grid
+
+BASE = (40.75, -73.99)
+
+def undominated(arrival, on_scene):
+    # distinct points no other point matches or beats on both scores
+    points = set(zip(arrival.tolist(), on_scene.tolist()))
+    return {p for p in points if not any(q != p and q[0] <= p[0] and q[1] >= p[1] for q in points)}
+
+@pytest.mark.parametrize('seed', range(6))
+def test_pareto_front_matches_pairwise_dominance(seed):
+    rng = np.random.default_rng(seed)
+    # small integer scores so ties and duplicates are common
+    arrival, on_scene = rng.integers(0, 12, 80).astype(float), rng.integers(0, 12, 80).astype(float)
+    front = pareto_front(arrival, on_scene)
+    got = list(zip(arrival[front].tolist(), on_scene[front].tolist()))
+    assert len(got) == len(set(got))
+    assert set(got) == undominated(arrival, on_scene)
+    assert np.all(np.diff(arrival[front]) > 0)
+
+def test_parse_range():
+    assert parse_range('20:80:4').tolist() == [20.0, 40.0, 60.0, 80.0]
+    assert parse_range('5,7.5').tolist() == [5.0, 7.5]
+    assert parse_range('99').tolist() == [99.0]
+
+def test_spec_grid_is_every_combination():
+    fleet = spec_grid({'speed_mph': [30, 60], 'flight_time_min': [20, 40, 50], 'range_miles': [9], 'recharge_min': [5, 10]}, 25, True)
+    combos = set(zip(fleet['speed_mph'], fleet['flight_time_min'], fleet['range_miles'], fleet['recharge_min']))
+    assert len(fleet['model']) == len(combos) == 12
+    assert fleet['max_wind_mph'].tolist() == [25.0] * 12 and fleet['battery_swap'].all()
+
+def test_scores_match_a_per_spec_loop():
+    rng = np.random.default_rng(3)
+    inc = sample_incidents(rng, BASE, 150)
+    targets = np.column_stack([inc['lat'], inc['lon']])
+    fleet = spec_grid({'speed_mph': parse_range('20:80:4'), 'flight_time_min': parse_range('10:40:3'),
+                       'range_miles': [3.0, 99.0], 'recharge_min': [30.0]})
+    wind = (12.0, 300.0)
+    scores = evaluate_specs(fleet, BASE, targets, inc['launch_delay'], wind)
+    np.testing.assert_array_equal(evaluate_specs(fleet, BASE, targets, inc['launch_delay'], wind, max_cells=400)['frontier'],
+                                  scores['frontier'])
+    m = compute_fleet_missions(fleet, BASE, targets, wind)
+    for i in range(len(fleet['model'])):
+        ok = m['possible'][i]
+        arrival = np.sort(np.where(ok, inc['launch_delay'] + m['t_out'][i], UNCOVERED_PENALTY_SEC))
+        assert scores['coverage'][i] == pytest.approx(ok.mean())
+        assert scores['mean_arrival_sec'][i] == pytest.approx(arrival.mean())
+        assert scores['p90_arrival_sec'][i] == arrival[math.ceil(P90 * len(arrival)) - 1]
+        assert scores['on_scene_sec'][i] == pytest.approx(m['t_hov'][i][ok].mean() if ok.any() else 0.0)
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from tiles import TileStore, serve, standin, standin_tile, tiles_around
+
+def start(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+@pytest.fixture
+def upstream():
+    server = standin(port=0)
+    url = start(server)
+    yield server, url + '/{z}/{x}/{y}.png'
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def tile_server(tmp_path, upstream):
+    server = serve(port=0, cache_dir=str(tmp_path / 'tiles'), upstream=upstream[1], warm=False)
+    url = start(server)
+    yield server, url
+    server.shutdown()
+    server.server_close()
+    server.prefetch_pool.shutdown(wait=True)
+
+def get(url):
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return resp.status, resp.headers['Content-Type'], resp.read()
+
+def test_tile_reads_through_once_then_serves_from_disk(tile_server, upstream):
+    server, url = tile_server
+    status, ctype, body = get(f"{url}/tiles/12/1205/1539.png")
+    assert (status, ctype, body) == (200, 'image/png', standin_tile(12))
+    assert upstream[0].served == 1
+    assert os.path.exists(os.path.join(server.store.root, '12', '1205', '1539.png'))
+    assert get(f"{url}/tiles/12/1205/1539.png")[2] == body
+    assert upstream[0].served == 1
+    stats = json.loads(get(f"{url}/stats")[2])
+    assert (stats['tiles'], stats['hits'], stats['misses']) == (1, 1, 1)
+
+def test_uncached_tile_without_upstream_is_404(tmp_path):
+    server = serve(port=0, cache_dir=str(tmp_path), upstream=None, warm=False)
+    url = start(server)
+    try:
+        with pytest.raises(urllib.error.HTTPError) as err:
+            get(f"{url}/tiles/12/1205/1539.png")
+        assert err.value.code == 404
+        with pytest.raises(urllib.error.HTTPError) as err:
+            get(f"{url}/tiles/3/9/0.png")  # x out of range at zoom 3
+        assert err.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_store_evicts_least_recently_used_past_byte_limit(tmp_path):
+    store = TileStore(str(tmp_path), max_bytes=250)
+    store.put(1, 0, 0, b'a' * 100)
+    store.put(1, 0, 1, b'b' * 100)
+    assert store.get(1, 0, 0) == b'a' * 100  # now the most recent
+    store.put(1, 1, 0, b'c' * 100)
+    assert not store.has(1, 0, 1)
+    assert not os.path.exists(tmp_path / '1' / '0' / '1.png')
+    assert store.has(1, 0, 0) and store.has(1, 1, 0)
+    stats = store.stats()
+    assert (stats['tiles'], stats['bytes'], stats['evictions']) == (2, 200, 1)
+
+def test_store_index_survives_a_restart(tmp_path):
+    store = TileStore(str(tmp_path), max_bytes=250)
+    store.put(1, 0, 0, b'a' * 100)
+    time.sleep(0.01)
+    store.put(1, 0, 1, b'b' * 100)
+    time.sleep(0.01)
+    store.get(1, 0, 0)  # touches the file's mtime
+    again = TileStore(str(tmp_path), max_bytes=250)
+    assert again.stats()['bytes'] == 200
+    again.put(1, 1, 0, b'c' * 100)
+    assert not again.has(1, 0, 1) and again.has(1, 0, 0)
+
+def post(url):
+    req = urllib.request.Request(url, data=b'', method='POST')
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return resp.status, json.loads(resp.read())
+
+def test_prefetch_fills_the_store_around_a_point(tile_server, upstream):
+    server, url = tile_server
+    center = (40.75, -73.99)
+    wanted = set(tiles_around(center, 1.0, 12) + tiles_around(center, 1.0, 13))
+    assert post(f"{url}/prefetch?lat={center[0]}&lon={center[1]}&radius=1&zooms=12,13") == (202, {'queued': True})
+    assert post(f"{url}/prefetch?lat={center[0]}&lon={center[1]}&radius=1&zooms=13,12") == (202, {'queued': False})
+    deadline = time.time() + 10
+    while server.store.stats()['tiles'] < len(wanted) and time.time() < deadline:
+        time.sleep(0.05)
+    assert all(server.store.has(*t) for t in wanted)
+    assert upstream[0].served == len(wanted)
+
+def test_prefetch_needs_a_point(tile_server):
+    _, url = tile_server
+    with pytest.raises(urllib.error.HTTPError) as err:
+        post(f"{url}/prefetch?lat=40.75")
+    assert err.value.code == 400
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from fleet import fleet_arrays, load_fleet
+from mission import compute_fleet_missions
+from wind import COMPASS, WIND_FROM_DEG, WIND_SPEEDS_MPH, sweep_column, sweep_mission, sweep_table, wind_sweep
+
+BASE = (40.75, -73.99)
+TARGET = (40.77, -73.95)
+KEYS = ('t_out', 't_back', 't_hov', 't_total', 'possible', 'turnaround_min', 'fail_fuel', 'fail_wind')
+
+@pytest.fixture(scope='module')
+def fleet():
+    return fleet_arrays(load_fleet())
+
+@pytest.fixture(scope='module')
+def sweep(fleet):
+    return wind_sweep(fleet, BASE, TARGET)
+
+def one_wind(fleet, speed, from_deg):
+    return compute_fleet_missions(fleet, BASE, [TARGET], wind=(speed, from_deg))
+
+def test_every_column_is_that_wind_on_its_own(fleet, sweep):
+    assert sweep['missions']['t_out'].shape == (len(fleet['model']), len(WIND_SPEEDS_MPH) * len(COMPASS))
+    for s, speed in enumerate(WIND_SPEEDS_MPH):
+        for d, from_deg in enumerate(WIND_FROM_DEG):
+            col = sweep_column(sweep, speed, from_deg)
+            assert col == s * len(WIND_FROM_DEG) + d
+            want = one_wind(fleet, speed, from_deg)
+            for key in KEYS:
+                np.testing.assert_array_equal(sweep['missions'][key][:, col], want[key][:, 0], err_msg=f"{key} {speed} {from_deg}")
+
+def test_controls_snap_to_the_nearest_grid_wind(fleet, sweep):
+    # 12 mph from 350 deg is nearest to 10 mph from N, across the 0/360 wrap
+    got = sweep_mission(sweep, 12.0, 350.0)
+    want = one_wind(fleet, 10.0, 0.0)
+    for key in KEYS:
+        np.testing.assert_array_equal(got[key], want[key][:, 0], err_msg=key)
+    assert sweep_column(sweep, 100.0, 191.0) == (len(WIND_SPEEDS_MPH) - 1) * len(WIND_FROM_DEG) + COMPASS.index('S')
+
+def test_sweep_table_counts_flyable_models_and_the_best_time(fleet, sweep):
+    table = sweep_table(sweep, fleet['model'])
+    assert table['flyable'].shape == table['best_t_out'].shape == (len(WIND_SPEEDS_MPH), len(WIND_FROM_DEG))
+    for s, speed in enumerate(WIND_SPEEDS_MPH):
+        for d, from_deg in enumerate(WIND_FROM_DEG):
+            m = one_wind(fleet, speed, from_deg)
+            ok = m['possible'][:, 0]
+            assert table['flyable'][s, d] == ok.sum()
+            assert table['best_t_out'][s, d] == (m['t_out'][ok, 0].min() if ok.any() else np.inf)
+    # still air is the easiest condition for every heading
+    assert np.all(table['flyable'] <= table['flyable'][0])
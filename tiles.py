@@ -0,0 +1,402 @@
+import argparse
+import json
+import math
+import os
+import struct
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from spatial import MILES_PER_DEG_LAT
+
+# --- Local Tile Cache ---
+# For slow field links and air-gapped ops centers the map can load its tiles
+# from a local server instead of CartoDB. The server keeps tiles on disk
+# (tile_cache/z/x/y.png, least recently used evicted past a size cap), reads
+# through to the upstream on a miss when it can reach one, and prefetches the
+# zooms the app uses: the country view (4) at startup, and the city zooms
+# (12, 13) around each ZIP and base the app reports.
+#
+#   python tiles.py serve --port 8602        # then run the app with
+#   DRONE_SIM_TILE_SERVER=http://localhost:8602 streamlit run drone_sim.py
+#
+# `python tiles.py standin` serves generated tiles in CartoDB's URL layout, so
+# the whole path can be exercised offline (serve --upstream http://...:8603).
+TILE_SERVER_ENV = 'DRONE_SIM_TILE_SERVER'
+TILE_CACHE_ENV = 'DRONE_SIM_TILE_CACHE'
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tile_cache')
+DEFAULT_PORT = 8602
+STANDIN_PORT = 8603
+
+UPSTREAM_URL = 'https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}.png'
+SUBDOMAINS = 'abcd'
+ATTRIBUTION = '&copy; OpenStreetMap contributors &copy; CARTO'
+USER_AGENT = 'drone-sim-tile-cache/1.0'
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+FETCH_TIMEOUT_SEC = 10.0
+PREFETCH_WORKERS = 4
+MAX_ZOOM = 19
+
+# The app's zoom levels: the step-1 country view, then the ZIP / base views.
+COUNTRY_VIEW = ((39.8283, -98.5795), 4, 1500.0)
+CITY_ZOOMS = (12, 13)
+CITY_RADIUS_MI = 12.0
+TILE_MAX_AGE_SEC = 7 * 24 * 3600
+
+# --- Tile Math (Web Mercator / slippy map) ---
+def tile_xy(lat, lon, z):
+    n = 1 << z
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def tiles_around(center, radius_mi, z):
+    # every tile of zoom z touching the box radius_mi around center
+    d_lat = radius_mi / MILES_PER_DEG_LAT
+    d_lon = radius_mi / (MILES_PER_DEG_LAT * max(math.cos(math.radians(center[0])), 0.01))
+    x0, y0 = tile_xy(center[0] + d_lat, max(center[1] - d_lon, -180.0), z)
+    x1, y1 = tile_xy(center[0] - d_lat, min(center[1] + d_lon, 179.999999), z)
+    return [(z, x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+def tile_url(template, z, x, y):
+    return template.format(s=SUBDOMAINS[(x + y) % len(SUBDOMAINS)], z=z, x=x, y=y, r='')
+
+def fetch_tile(template, z, x, y, timeout=FETCH_TIMEOUT_SEC):
+    req = urllib.request.Request(tile_url(template, z, x, y), headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+# --- Store ---
+class TileStore:
+    # The index (tile -> size, least recently used first) is built from the
+    # directory on first use, oldest mtime first; a hit moves the tile to the
+    # back and touches its mtime so the order survives a restart.
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, z, x, y):
+        return os.path.join(self.root, str(z), str(x), f"{y}.png")
+
+    def _load(self):
+        entries = []
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if not name.endswith('.png'):
+                    continue
+                path = os.path.join(dirpath, name)
+                parts = os.path.relpath(path, self.root).split(os.sep)
+                try:
+                    key = (int(parts[0]), int(parts[1]), int(parts[2][:-4]))
+                    st = os.stat(path)
+                except (ValueError, IndexError, OSError):
+                    continue
+                entries.append((st.st_mtime_ns, key, st.st_size))
+        self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self.bytes = sum(self._index.values())
+
+    def _ensure(self):
+        if self._index is None:
+            self._load()
+
+    def has(self, z, x, y):
+        with self._lock:
+            self._ensure()
+            return (z, x, y) in self._index
+
+    def get(self, z, x, y):
+        with self._lock:
+            self._ensure()
+            if (z, x, y) not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end((z, x, y))
+        path = self._path(z, x, y)
+        try:
+            with open(path, 'rb') as fh:
+                data = fh.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.bytes -= self._index.pop((z, x, y), 0)
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, z, x, y, data):
+        path = self._path(z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._ensure()
+            self.bytes += len(data) - self._index.pop((z, x, y), 0)
+            self._index[(z, x, y)] = len(data)
+            evict = []
+            while self.bytes > self.max_bytes and len(self._index) > 1:
+                key, size = self._index.popitem(last=False)
+                self.bytes -= size
+                evict.append(key)
+            self.evictions += len(evict)
+        for key in evict:
+            try:
+                os.remove(self._path(*key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            self._ensure()
+            return {'tiles': len(self._index), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+# --- Prefetch ---
+def prefetch(store, upstream, center, radius_mi, zooms, workers=PREFETCH_WORKERS):
+    wanted = [t for z in zooms for t in tiles_around(center, radius_mi, z) if not store.has(*t)]
+
+    def one(tile):
+        try:
+            store.put(*tile, fetch_tile(upstream, *tile))
+            return True
+        except OSError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = sum(pool.map(one, wanted))
+    return {'wanted': len(wanted), 'fetched': fetched, 'failed': len(wanted) - fetched}
+
+# --- Tile Server ---
+class TileServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store, upstream=UPSTREAM_URL):
+        super().__init__(address, TileHandler)
+        self.store = store
+        self.upstream = upstream
+        self.prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self.prefetched = set()
+
+    def request_prefetch(self, center, radius_mi=CITY_RADIUS_MI, zooms=CITY_ZOOMS):
+        # one job per (rounded center, zooms) per server run; jobs queue
+        # behind each other so they never outrun PREFETCH_WORKERS fetches
+        key = (round(center[0], 2), round(center[1], 2), radius_mi, tuple(zooms))
+        if not self.upstream or key in self.prefetched:
+            return False
+        self.prefetched.add(key)
+        self.prefetch_pool.submit(prefetch, self.store, self.upstream, center, radius_mi, zooms)
+        return True
+
+class TileHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json', max_age=0):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', f"public, max-age={max_age}" if max_age else 'no-store')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) == 4 and parts[0] == 'tiles' and parts[3].endswith('.png'):
+            try:
+                z, x, y = int(parts[1]), int(parts[2]), int(parts[3][:-4])
+            except ValueError:
+                return self._send(400, b'{"error": "bad tile"}')
+            if not (0 <= z <= MAX_ZOOM and 0 <= x < (1 << z) and 0 <= y < (1 << z)):
+                return self._send(404, b'{"error": "no such tile"}')
+            return self._tile(z, x, y)
+        if url.path == '/stats':
+            return self._send(200, json.dumps(self.server.store.stats()).encode())
+        if url.path == '/health':
+            return self._send(200, b'{"ok": true}')
+        self._send(404, b'{"error": "not found"}')
+
+    def do_POST(self):
+        # /prefetch?lat=..&lon=..[&radius=..][&zooms=12,13]
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != '/prefetch':
+            return self._send(404, b'{"error": "not found"}')
+        q = urllib.parse.parse_qs(url.query)
+        try:
+            center = (float(q['lat'][0]), float(q['lon'][0]))
+            radius = min(float(q.get('radius', [CITY_RADIUS_MI])[0]), 50.0)
+            zooms = tuple(sorted({min(max(int(z), 0), MAX_ZOOM) for z in q.get('zooms', [','.join(map(str, CITY_ZOOMS))])[0].split(',')}))
+        except (KeyError, ValueError):
+            return self._send(400, b'{"error": "need lat and lon"}')
+        queued = self.server.request_prefetch(center, radius, zooms)
+        self._send(202, json.dumps({'queued': queued}).encode())
+
+    def _tile(self, z, x, y):
+        store = self.server.store
+        data = store.get(z, x, y)
+        if data is None and self.server.upstream:
+            try:
+                data = fetch_tile(self.server.upstream, z, x, y)
+                store.put(z, x, y, data)
+            except OSError:
+                data = None
+        if data is None:
+            return self._send(404, b'{"error": "tile not cached and upstream unreachable"}')
+        self._send(200, data, 'image/png', TILE_MAX_AGE_SEC)
+
+def serve(port=DEFAULT_PORT, host='127.0.0.1', cache_dir=None, upstream=UPSTREAM_URL, max_bytes=MAX_CACHE_BYTES, warm=True):
+    store = TileStore(cache_dir or os.environ.get(TILE_CACHE_ENV) or DEFAULT_CACHE_DIR, max_bytes)
+    server = TileServer((host, port), store, upstream)
+    if warm:
+        center, zoom, radius = COUNTRY_VIEW
+        server.request_prefetch(center, radius, (zoom,))
+    return server
+
+# --- App Side ---
+# The map's tile layer and a fire-and-forget prefetch request; both are no-ops
+# unless DRONE_SIM_TILE_SERVER points at a running `tiles.py serve`.
+def tile_server_url():
+    return (os.environ.get(TILE_SERVER_ENV) or '').rstrip('/') or None
+
+def tile_layer(default):
+    server = tile_server_url()
+    if server is None:
+        return default, None
+    return f"{server}/tiles/{{z}}/{{x}}/{{y}}.png", ATTRIBUTION
+
+def request_prefetch(center, radius_mi=CITY_RADIUS_MI, zooms=CITY_ZOOMS):
+    server = tile_server_url()
+    if server is None or center is None:
+        return False
+    query = urllib.parse.urlencode({'lat': f"{center[0]:.5f}", 'lon': f"{center[1]:.5f}", 'radius': radius_mi,
+                                    'zooms': ','.join(map(str, zooms))})
+
+    def send():
+        try:
+            urllib.request.urlopen(urllib.request.Request(f"{server}/prefetch?{query}", data=b'', method='POST'), timeout=2).close()
+        except OSError:
+            pass  # the map still reads through the server tile by tile
+
+    threading.Thread(target=send, name='tile-prefetch', daemon=True).start()
+    return True
+
+# --- Stand-In Upstream ---
+# Flat dark PNGs with a lighter edge, one shade per zoom, in CartoDB's
+# {z}/{x}/{y}.png layout; --delay-ms imitates a slow link.
+def _png(width, height, rows):
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+    raw = b''.join(b'\x00' + row for row in rows)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
+
+def standin_tile(z, size=256):
+    shade = 24 + (z * 7) % 40
+    fill, edge = bytes((shade, shade, shade + 4)), bytes((shade + 40, shade + 40, shade + 48))
+    inner = edge + fill * (size - 2) + edge
+    return _png(size, size, [edge * size] + [inner] * (size - 2) + [edge * size])
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    tiles = {}
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path).path.strip('/').split('/')
+        try:
+            z, _, _ = (int(p.split('.')[0].split('@')[0]) for p in parts[-3:])
+        except ValueError:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.server.delay_sec:
+            time.sleep(self.server.delay_sec)
+        body = self.tiles.get(z) or self.tiles.setdefault(z, standin_tile(z))
+        self.server.served += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def standin(port=STANDIN_PORT, host='127.0.0.1', delay_ms=0):
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.delay_sec = delay_ms / 1000
+    server.served = 0
+    return server
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local map tile cache, server and prefetch")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+
+    p = sub.add_parser('serve', help="serve cached tiles, reading through to the upstream")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=DEFAULT_PORT)
+    p.add_argument('--cache-dir', help=f"tile store (default ${TILE_CACHE_ENV} or tile_cache/)")
+    p.add_argument('--max-mb', type=float, default=MAX_CACHE_BYTES / 2 ** 20, help="evict least recently used tiles past this size")
+    p.add_argument('--upstream', default=UPSTREAM_URL, help="tile URL template; 'none' to serve only what is cached")
+    p.add_argument('--no-warm', action='store_true', help="skip prefetching the country view at startup")
+
+    p = sub.add_parser('prefetch', help="fill the store around a point without running the server")
+    p.add_argument('center', help="ZIP or LAT,LON")
+    p.add_argument('--radius', type=float, default=CITY_RADIUS_MI, help="miles around the center")
+    p.add_argument('--zooms', default=','.join(map(str, CITY_ZOOMS)))
+    p.add_argument('--cache-dir')
+    p.add_argument('--max-mb', type=float, default=MAX_CACHE_BYTES / 2 ** 20)
+    p.add_argument('--upstream', default=UPSTREAM_URL)
+
+    p = sub.add_parser('standin', help="serve generated tiles as an offline upstream")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=STANDIN_PORT)
+    p.add_argument('--delay-ms', type=float, default=0, help="added latency per tile")
+    args = parser.parse_args(argv)
+
+    if args.cmd == 'standin':
+        server = standin(args.port, args.host, args.delay_ms)
+        print(f"stand-in tiles on http://{args.host}:{args.port}/{{z}}/{{x}}/{{y}}.png")
+        server.serve_forever()
+    elif args.cmd == 'serve':
+        upstream = None if args.upstream.lower() == 'none' else args.upstream
+        server = serve(args.port, args.host, args.cache_dir, upstream, int(args.max_mb * 2 ** 20), warm=not args.no_warm)
+        print(f"tiles on http://{args.host}:{args.port}/tiles/{{z}}/{{x}}/{{y}}.png  "
+              f"(store {server.store.root}, upstream {upstream or 'none'})")
+        print(f"run the app with {TILE_SERVER_ENV}=http://{args.host}:{args.port}")
+        server.serve_forever()
+    else:
+        from zipindex import lookup_zip
+        center = [float(v) for v in args.center.split(',')] if ',' in args.center else lookup_zip(args.center)
+        if center is None:
+            raise SystemExit(f"Unknown ZIP: {args.center}")
+        store = TileStore(args.cache_dir or os.environ.get(TILE_CACHE_ENV) or DEFAULT_CACHE_DIR, int(args.max_mb * 2 ** 20))
+        start = time.perf_counter()
+        res = prefetch(store, args.upstream, center, args.radius, [int(z) for z in args.zooms.split(',')])
+        s = store.stats()
+        print(f"{res['fetched']} fetched, {res['failed']} failed of {res['wanted']} missing ({time.perf_counter() - start:.1f}s); "
+              f"store {s['tiles']} tiles, {s['bytes'] / 2 ** 20:.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roads import ROAD_GRAPH_DIR, build_csr, save_graph, synthetic_grid_graph
+from spatial import haversine_miles
+
+# --- Build data/roads/<region>.npz ---
+# Sources:
+#   --osm FILE              an OpenStreetMap XML extract (.osm), drivable ways only
+#   --synthetic LAT,LON     a street-grid stand-in centred on a point
+# Ways without a usable maxspeed get a default speed for their highway class.
+HIGHWAY_MPH = {
+    'motorway': 60, 'motorway_link': 40, 'trunk': 50, 'trunk_link': 35,
+    'primary': 40, 'primary_link': 30, 'secondary': 35, 'secondary_link': 30,
+    'tertiary': 30, 'tertiary_link': 25, 'unclassified': 25, 'residential': 25,
+    'living_street': 10, 'service': 15,
+}
+
+def _speed_mph(tags):
+    match = re.match(r'\s*(\d+(?:\.\d+)?)\s*(mph|km/h|kmh)?', tags.get('maxspeed', ''))
+    if match:
+        value = float(match.group(1))
+        return value if match.group(2) == 'mph' else value * 0.621371
+    return HIGHWAY_MPH[tags['highway']]
+
+def load_osm(path, name=''):
+    node_pos = {}
+    ways = []
+    for _, elem in ET.iterparse(path, events=('end',)):
+        if elem.tag == 'node':
+            node_pos[elem.get('id')] = (float(elem.get('lat')), float(elem.get('lon')))
+            elem.clear()
+        elif elem.tag == 'way':
+            tags = {t.get('k'): t.get('v') for t in elem.iter('tag')}
+            if tags.get('highway') in HIGHWAY_MPH and tags.get('access') not in ('no', 'private'):
+                ways.append(([nd.get('ref') for nd in elem.iter('nd')], tags))
+            elem.clear()
+
+    ids = {}
+    src, dst, sec = [], [], []
+    for refs, tags in ways:
+        refs = [r for r in refs if r in node_pos]
+        mph = _speed_mph(tags)
+        oneway = tags.get('oneway') in ('yes', 'true', '1') or tags.get('junction') == 'roundabout'
+        reverse = tags.get('oneway') == '-1'
+        for a, b in zip(refs[:-1], refs[1:]):
+            ia, ib = ids.setdefault(a, len(ids)), ids.setdefault(b, len(ids))
+            miles = float(haversine_miles(*node_pos[a], *node_pos[b]))
+            t = miles / mph * 3600.0
+            if not reverse:
+                src.append(ia); dst.append(ib); sec.append(t)
+            if not oneway or reverse:
+                src.append(ib); dst.append(ia); sec.append(t)
+
+    pos = np.zeros((len(ids), 2))
+    for ref, i in ids.items():
+        pos[i] = node_pos[ref]
+    return build_csr(pos[:, 0], pos[:, 1], src, dst, sec, name=name)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a road graph for officer travel times")
+    parser.add_argument('name', help="region name; written to data/roads/<name>.npz")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--osm', help="OpenStreetMap XML extract")
+    source.add_argument('--synthetic', help="LAT,LON center of a street-grid stand-in")
+    parser.add_argument('--radius', type=float, default=10.0, help="synthetic grid half-width in miles")
+    parser.add_argument('--spacing', type=float, default=0.1, help="synthetic block size in miles")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', default=ROAD_GRAPH_DIR)
+    args = parser.parse_args(argv)
+
+    if args.osm:
+        graph = load_osm(args.osm, args.name)
+    else:
+        center = [float(v) for v in args.synthetic.split(',')]
+        graph = synthetic_grid_graph(center, args.radius, args.spacing, seed=args.seed, name=args.name)
+
+    out = os.path.join(args.out_dir, f"{args.name}.npz")
+    save_graph(out, graph)
+    print(f"wrote {len(graph['lat']):,} nodes / {len(graph['indices']):,} edges to {out} ({os.path.getsize(out) / 1e6:.1f} MB)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zipindex import ZIP_DTYPE, ZIP_INDEX_PATH
+
+# --- Build data/us_zip_index.npy ---
+# Sources, in order of preference:
+#   --csv FILE    any table with zip / lat / lon columns (place / state optional)
+#   (default)     the GeoNames US table via pgeocode (needs network once)
+COLUMN_ALIASES = {
+    'zip': ('zip', 'zip_code', 'postal_code', 'zipcode'),
+    'lat': ('lat', 'latitude'),
+    'lon': ('lon', 'lng', 'long', 'longitude'),
+    'place': ('place', 'place_name', 'city'),
+    'state': ('state', 'state_code'),
+}
+
+def _pick(df, field):
+    for name in COLUMN_ALIASES[field]:
+        if name in df.columns:
+            return df[name]
+    return None
+
+def load_source(csv_path=None):
+    if csv_path:
+        df = pd.read_csv(csv_path, dtype=str)
+    else:
+        import pgeocode
+        df = pgeocode.Nominatim("us")._data.astype(str)
+    df.columns = df.columns.str.strip().str.lower()
+
+    out = pd.DataFrame({
+        'zip': pd.to_numeric(_pick(df, 'zip'), errors='coerce'),
+        'lat': pd.to_numeric(_pick(df, 'lat'), errors='coerce'),
+        'lon': pd.to_numeric(_pick(df, 'lon'), errors='coerce'),
+    })
+    place, state = _pick(df, 'place'), _pick(df, 'state')
+    out['place'] = place.fillna('').str.upper() if place is not None else ''
+    out['state'] = state.fillna('') if state is not None else ''
+    return out.dropna(subset=['zip', 'lat', 'lon'])
+
+def build_index(df):
+    df = df[(df['zip'] >= 0) & (df['zip'] <= 99999)].drop_duplicates('zip').sort_values('zip')
+    index = np.zeros(len(df), dtype=ZIP_DTYPE)
+    index['zip'] = df['zip'].astype(np.int32)
+    index['lat'] = df['lat'].astype(np.float32)
+    index['lon'] = df['lon'].astype(np.float32)
+    index['place'] = [p.encode('utf-8')[:24] for p in df['place']]
+    index['state'] = [s.encode('ascii', 'ignore')[:2] for s in df['state']]
+    return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the bundled ZIP -> lat/lon index")
+    parser.add_argument('--csv', help="source table with zip/lat/lon columns (default: pgeocode GeoNames)")
+    parser.add_argument('--out', default=ZIP_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    index = build_index(load_source(args.csv))
+    np.save(args.out, index)
+    print(f"wrote {len(index):,} ZIPs to {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+
+if __name__ == '__main__':
+    main()
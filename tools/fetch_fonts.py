@@ -0,0 +1,129 @@
+import argparse
+import glob
+import os
+import re
+import urllib.request
+
+# --- Bundle the theme fonts into static/fonts ---
+# Writes the latin .woff2 of each face in FACES into static/fonts, with
+# fonts.css serving them from app/static/fonts, so the app and the playback
+# component never reach out for fonts (air-gapped hosts included). The files
+# are committed; rerun this only to refresh them. By default it downloads
+# Google Fonts' latin subsets (needs network); --from DIR builds the same
+# subsets from the upstream .ttf/.otf/.woff2 files instead (needs fontTools
+# and brotli). An installed copy of a face is still preferred by the browser.
+FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'fonts')
+CSS_API = 'https://fonts.googleapis.com/css2?family=IBM+Plex+Mono:wght@400;700&family=Manrope:wght@400;600;700&display=swap'
+# a browser user agent, or the API answers with .ttf instead of .woff2
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+# Google Fonts' "latin" subset
+LATIN_RANGE = ('U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, U+0329, '
+               'U+2000-206F, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD')
+
+# (family, weight) -> (bundled file, upstream style name)
+FACES = {
+    ('Manrope', '400'): ('Manrope-400.woff2', 'Regular'),
+    ('Manrope', '600'): ('Manrope-600.woff2', 'SemiBold'),
+    ('Manrope', '700'): ('Manrope-700.woff2', 'Bold'),
+    ('IBM Plex Mono', '400'): ('IBMPlexMono-400.woff2', 'Regular'),
+    ('IBM Plex Mono', '700'): ('IBMPlexMono-700.woff2', 'Bold'),
+}
+
+CSS_HEADER = """/* The theme's fonts, imported by drone_sim.css and the playback component.
+   Latin subsets bundled in this folder (SIL Open Font License, see OFL-*.txt)
+   and served from app/static/fonts, so no page load fetches fonts from the
+   network. Written by tools/fetch_fonts.py. */
+"""
+
+FACE_RE = re.compile(r"/\*\s*([\w-]+)\s*\*/\s*@font-face\s*{([^}]*)}")
+FIELD_RE = re.compile(r"(font-family|font-weight|src)\s*:\s*([^;]+);")
+
+def _get(url):
+    req = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.read()
+
+def latin_sources(css):
+    # (family, weight) -> .woff2 URL of the latin subset
+    sources = {}
+    for subset, block in FACE_RE.findall(css):
+        if subset != 'latin':
+            continue
+        fields = dict(FIELD_RE.findall(block))
+        url = re.search(r"url\(([^)]+)\)", fields['src']).group(1).strip("'\"")
+        sources[(fields['font-family'].strip().strip("'\""), fields['font-weight'].strip())] = url
+    return sources
+
+def upstream_file(src_dir, family, style):
+    # the names the projects ship: Manrope-SemiBold.ttf, IBMPlexMono-Bold.woff2, ...
+    stem = f"{family.replace(' ', '')}-{style}"
+    for ext in ('woff2', 'ttf', 'otf'):
+        hits = glob.glob(os.path.join(src_dir, '**', f"{stem}.{ext}"), recursive=True)
+        if hits:
+            return hits[0]
+    return None
+
+def latin_woff2(src, dest):
+    from fontTools import subset
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    font = subset.load_font(src, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=subset.parse_unicodes(LATIN_RANGE.replace(' ', '')))
+    subsetter.subset(font)
+    subset.save_font(font, dest, options)
+
+def bundled_css():
+    blocks = []
+    for (family, weight), (name, style) in FACES.items():
+        blocks.append(
+            f"@font-face {{\n"
+            f"    font-family: '{family}';\n"
+            f"    font-style: normal;\n"
+            f"    font-weight: {weight};\n"
+            f"    font-display: swap;\n"
+            f"    src: local('{family} {style}'), local('{family.replace(' ', '')}-{style}'), url('{name}') format('woff2');\n"
+            f"    unicode-range: {LATIN_RANGE};\n"
+            f"}}\n")
+    return CSS_HEADER + ''.join(blocks)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle the theme fonts into static/fonts")
+    parser.add_argument('--out', default=FONTS_DIR)
+    parser.add_argument('--from', dest='src_dir', help="build from upstream font files under this folder instead of Google Fonts")
+    parser.add_argument('--force', action='store_true', help="rebuild files that already exist")
+    args = parser.parse_args(argv)
+
+    sources = {}
+    if args.src_dir:
+        sources = {key: upstream_file(args.src_dir, key[0], style) for key, (_, style) in FACES.items()}
+        missing = sorted(k for k, v in sources.items() if v is None)
+        if missing:
+            raise SystemExit(f"not under {args.src_dir}: {', '.join(f'{f} {FACES[(f, w)][1]}' for f, w in missing)}")
+    else:
+        sources = latin_sources(_get(CSS_API).decode('utf-8'))
+        missing = sorted(set(FACES) - set(sources))
+        if missing:
+            raise SystemExit(f"Google Fonts did not list: {', '.join(f'{f} {w}' for f, w in missing)}")
+
+    for key, (name, _) in sorted(FACES.items()):
+        path = os.path.join(args.out, name)
+        if os.path.exists(path) and not args.force:
+            print(f"  {name} (kept)")
+            continue
+        if args.src_dir:
+            latin_woff2(sources[key], path)
+        else:
+            with open(path, 'wb') as fh:
+                fh.write(_get(sources[key]))
+        print(f"  {name} {os.path.getsize(path) / 1024:.0f} KB")
+
+    # only once every file is on disk, so the stylesheet never points at a missing one
+    with open(os.path.join(args.out, 'fonts.css'), 'w', encoding='utf-8') as fh:
+        fh.write(bundled_css())
+    print("  fonts.css now serves the bundled files")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import numpy as np
+
+from engine import mission_column
+from fleet import fleet_arrays
+from mission import compute_fleet_missions
+
+# --- Wind Sweep ---
+# Every (wind speed, wind direction) pair on the grid for one base/target,
+# evaluated as one kernel call: each pair is one more target column. The app
+# caches the sweep per scenario, so moving the wind controls only picks a
+# column instead of recomputing.
+WIND_SPEEDS_MPH = np.arange(0, 55, 5, dtype=float)
+COMPASS = ('N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW')
+WIND_FROM_DEG = np.arange(len(COMPASS)) * 22.5
+
+def wind_sweep(fleet, base, target, speeds=WIND_SPEEDS_MPH, directions=WIND_FROM_DEG):
+    fleet = fleet_arrays(fleet)
+    speeds = np.asarray(speeds, dtype=float)
+    directions = np.asarray(directions, dtype=float)
+    wind_mph, wind_from = np.meshgrid(speeds, directions, indexing='ij')
+
+    targets = np.repeat(np.asarray([target], dtype=float), wind_mph.size, axis=0)
+    missions = compute_fleet_missions(fleet, base, targets, wind=(wind_mph.ravel(), wind_from.ravel()))
+    return {'speeds': speeds, 'directions': directions, 'missions': missions}
+
+def sweep_column(sweep, speed_mph, from_deg):
+    s = int(np.argmin(np.abs(sweep['speeds'] - speed_mph)))
+    d = int(np.argmin(np.abs((sweep['directions'] - from_deg + 180) % 360 - 180)))
+    return s * len(sweep['directions']) + d
+
+def sweep_mission(sweep, speed_mph, from_deg):
+    return mission_column(sweep['missions'], sweep_column(sweep, speed_mph, from_deg))
+
+def sweep_table(sweep, model_names):
+    # (speeds, directions) grids: how many models can fly, and the best time out.
+    shape = (len(model_names), len(sweep['speeds']), len(sweep['directions']))
+    possible = sweep['missions']['possible'].reshape(shape)
+    t_out = np.where(possible, sweep['missions']['t_out'].reshape(shape), np.inf)
+    return {'flyable': possible.sum(axis=0), 'best_t_out': t_out.min(axis=0)}
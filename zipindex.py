@@ -0,0 +1,65 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# --- ZIP Index ---
+# A sorted, fixed-width record array of every US ZIP centroid, memory-mapped
+# from data/us_zip_index.npy so the OS page cache shares it across processes
+# and nothing is downloaded at startup. Rebuild it with tools/build_zip_index.py.
+ZIP_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'us_zip_index.npy')
+
+ZIP_DTYPE = np.dtype([
+    ('zip', '<i4'),
+    ('lat', '<f4'),
+    ('lon', '<f4'),
+    ('place', 'S24'),
+    ('state', 'S2'),
+])
+
+@lru_cache(maxsize=4)
+def load_zip_index(path=ZIP_INDEX_PATH):
+    return np.load(path, mmap_mode='r')
+
+def _zip_int(zip_code):
+    zip_code = str(zip_code).strip()
+    if not zip_code.isdigit() or len(zip_code) != 5:
+        return None
+    return int(zip_code)
+
+def lookup_zip(zip_code, index=None):
+    code = _zip_int(zip_code)
+    if code is None:
+        return None
+    index = load_zip_index() if index is None else index
+
+    i = int(np.searchsorted(index['zip'], code))
+    if i == len(index) or index['zip'][i] != code:
+        return None
+    return [round(float(index['lat'][i]), 5), round(float(index['lon'][i]), 5)]
+
+def prefix_range(prefix, index=None):
+    prefix = str(prefix).strip()
+    if not prefix.isdigit() or not 0 < len(prefix) <= 5:
+        return 0, 0
+    index = load_zip_index() if index is None else index
+
+    scale = 10 ** (5 - len(prefix))
+    lo = int(prefix) * scale
+    zips = index['zip']
+    return int(np.searchsorted(zips, lo)), int(np.searchsorted(zips, lo + scale))
+
+def search_prefix(prefix, limit=8, index=None):
+    index = load_zip_index() if index is None else index
+    start, end = prefix_range(prefix, index)
+    rows = index[start:min(end, start + limit)]
+    return [
+        {
+            'zip': f"{int(r['zip']):05d}",
+            'place': r['place'].decode('utf-8', 'replace').strip(),
+            'state': r['state'].decode('ascii', 'replace'),
+            'lat': round(float(r['lat']), 5),
+            'lon': round(float(r['lon']), 5),
+        }
+        for r in rows
+    ]